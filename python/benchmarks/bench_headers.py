@@ -0,0 +1,40 @@
+"""
+Per-request header construction cost, with and without the Telemetry caches.
+
+    python benchmarks/bench_headers.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.paypal_client import PayPalClient
+from paypal_agent_toolkit.shared.telemetry import Telemetry
+
+
+def main(number: int = 2000):
+    client = PayPalClient("client-id", "secret", Context(sandbox=True))
+
+    def uncached():
+        # Reproduces the previous behaviour: version lookup and OS probing on every request.
+        Telemetry.clear_cache()
+        client.headers_for_token("token")
+
+    def cached():
+        client.headers_for_token("token")
+
+    cached()
+    before = timeit.timeit(uncached, number=number) / number
+    after = timeit.timeit(cached, number=number) / number
+    client.close()
+
+    print(f"build headers, uncached: {before * 1e6:9.2f} us/request")
+    print(f"build headers, cached:   {after * 1e6:9.2f} us/request")
+    print(f"speedup:                 {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
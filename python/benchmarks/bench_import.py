@@ -0,0 +1,104 @@
+"""
+Import cost of each framework entry point, measured with `python -X importtime`
+in a fresh interpreter, and of the toolkit's own modules within it.
+
+    python benchmarks/bench_import.py [--runs 5] [--budget-ms 60]
+
+"own" is the summed self time of the paypal_agent_toolkit.* modules; "total"
+also includes httpx, pydantic and the agent framework. With --budget-ms the
+script exits non-zero when the own time of any entry point exceeds the budget.
+
+An entry point that fails to import fails the run. The one exception is an
+entry point whose agent framework is not installed: it is reported as skipped,
+unless --strict is given (as in CI, where every framework is installed).
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+PYTHON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Entry point -> top-level packages of the agent framework it needs.
+ENTRY_POINTS = {
+    "paypal_agent_toolkit.shared.api": (),
+    "paypal_agent_toolkit.openai.toolkit": ("agents", "openai"),
+    "paypal_agent_toolkit.langchain.toolkit": ("langchain", "langchain_core"),
+    "paypal_agent_toolkit.crewai.toolkit": ("crewai", "crewai_tools"),
+    "paypal_agent_toolkit.bedrock.toolkit": (),
+}
+
+_MISSING_MODULE = re.compile(r"^ModuleNotFoundError: No module named '([\w.]+)'", re.MULTILINE)
+
+
+class ImportFailed(Exception):
+    def __init__(self, error: str, missing_framework: str = None):
+        super().__init__(error)
+        self.missing_framework = missing_framework
+
+
+def measure(module: str):
+    """(own_us, total_us) of one cold import; raises ImportFailed when the import fails."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PYTHON_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        missing = _MISSING_MODULE.search("\n".join(errors))
+        framework = missing.group(1).split(".")[0] if missing else None
+        raise ImportFailed(errors[-1] if errors else f"exit code {proc.returncode}", framework if framework in ENTRY_POINTS[module] else None)
+    own = total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        name = name.strip()
+        if name.startswith("paypal_agent_toolkit"):
+            own += int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+    return own, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--strict", action="store_true", help="fail when an agent framework is not installed")
+    args = parser.parse_args()
+
+    over_budget = []
+    failed = []
+    for module in ENTRY_POINTS:
+        try:
+            samples = [measure(module) for _ in range(args.runs)]
+        except ImportFailed as e:
+            if e.missing_framework and not args.strict:
+                print(f"{module:42} skipped: optional framework '{e.missing_framework}' is not installed")
+            else:
+                print(f"{module:42} FAILED to import: {e}")
+                failed.append(module)
+            continue
+        own = min(sample[0] for sample in samples) / 1e3
+        total = min(sample[1] for sample in samples) / 1e3
+        print(f"{module:42} own {own:7.1f} ms   total {total:8.1f} ms")
+        if args.budget_ms is not None and own > args.budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"over the {args.budget_ms:g} ms budget: {', '.join(over_budget)}")
+    if failed:
+        print(f"import failed: {', '.join(failed)}")
+    if over_budget or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
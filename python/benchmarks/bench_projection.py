@@ -0,0 +1,177 @@
+"""
+Bytes and approximate tokens handed to the LLM per tool, before and after the
+default projection (allowlists, link stripping and null pruning), plus the
+effect of max_items on a large transaction listing.
+
+    python benchmarks/bench_projection.py
+
+Tokens are counted with tiktoken's cl100k_base encoding when it is installed,
+otherwise estimated as bytes / 4. Payloads are synthetic but follow the shape
+of real PayPal responses.
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from paypal_agent_toolkit.shared.orders.tool_handlers import summarize_order
+from paypal_agent_toolkit.shared.projection import ContinuationStore, ProjectionOptions, project
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+except ImportError:
+    def count_tokens(text: str) -> int:
+        return len(text.encode("utf-8")) // 4
+
+
+def money(value="10.00"):
+    return {"currency_code": "USD", "value": value}
+
+
+def link(rel, method="GET"):
+    return {"href": f"https://api-m.sandbox.paypal.com/v1/resource/ABCDEFGHIJKLMN/{rel}", "rel": rel, "method": method}
+
+
+def transaction(i):
+    return {
+        "transaction_info": {
+            "paypal_account_id": "MZRT5GGJXV5L2",
+            "transaction_id": f"5TY05013RG{i:06d}",
+            "transaction_event_code": "T0006",
+            "transaction_initiation_date": "2024-07-01T10:00:00+0000",
+            "transaction_updated_date": "2024-07-01T10:00:00+0000",
+            "transaction_amount": money("45.00"),
+            "fee_amount": money("-1.62"),
+            "insurance_amount": money("0.00"),
+            "shipping_amount": money("0.00"),
+            "shipping_discount_amount": money("0.00"),
+            "transaction_status": "S",
+            "transaction_subject": "Premium subscription",
+            "ending_balance": money("1024.00"),
+            "available_balance": money("1024.00"),
+            "invoice_id": f"INV-{i}",
+            "custom_field": None,
+            "protection_eligibility": "01",
+        },
+        "payer_info": {
+            "account_id": "LCM2ZN7DGLQ3N",
+            "email_address": f"buyer{i}@example.com",
+            "address_status": "Y",
+            "payer_status": "Y",
+            "payer_name": {"given_name": "Jane", "surname": "Doe", "alternate_full_name": "Jane Doe"},
+            "country_code": "US",
+        },
+        "shipping_info": {"name": "Jane Doe", "address": {"line1": "1 Main St", "city": "San Jose", "state": "CA", "country_code": "US", "postal_code": "95131"}},
+        "cart_info": {"item_details": [{"item_code": "SKU-1", "item_name": "Premium", "item_description": "Monthly premium plan", "item_quantity": "1", "item_unit_price": money("45.00"), "item_amount": money("45.00"), "total_item_amount": money("45.00")}]},
+        "store_info": {},
+        "auction_info": {},
+        "incentive_info": {},
+    }
+
+
+def invoice(i):
+    return {
+        "id": f"INV2-ABCD-EFGH-IJKL-{i:04d}",
+        "status": "SENT",
+        "detail": {"invoice_number": f"{1000 + i}", "invoice_date": "2024-07-01", "currency_code": "USD", "payment_term": {"term_type": "NET_30", "due_date": "2024-07-31"}, "metadata": {"create_time": "2024-07-01T10:00:00Z", "recipient_view_url": "https://www.sandbox.paypal.com/invoice/p/#ABCDEFGHIJKLMN", "invoicer_view_url": "https://www.sandbox.paypal.com/invoice/details/ABCDEFGHIJKLMN"}},
+        "invoicer": {"email_address": "merchant@example.com"},
+        "primary_recipients": [{"billing_info": {"name": {"given_name": "Jane", "surname": "Doe", "full_name": "Jane Doe"}, "email_address": f"buyer{i}@example.com"}}],
+        "amount": money("120.00"),
+        "due_amount": money("120.00"),
+        "links": [link("self"), link("delete", "DELETE"), link("update", "PUT"), link("send", "POST"), link("record-payment", "POST"), link("qr-code", "POST")],
+    }
+
+
+def dispute():
+    return {
+        "dispute_id": "PP-D-12345",
+        "create_time": "2024-07-01T10:00:00.000Z",
+        "update_time": "2024-07-02T10:00:00.000Z",
+        "disputed_transactions": [{
+            "seller_transaction_id": "3BC38643YC807283D",
+            "buyer_transaction_id": "0SE43283BL6398429",
+            "create_time": "2024-06-20T10:00:00.000Z",
+            "transaction_status": "COMPLETED",
+            "gross_amount": money("120.00"),
+            "buyer": {"name": "Jane Doe"},
+            "seller": {"email": "merchant@example.com", "merchant_id": "ABCDEFGHIJKLM", "name": "Merchant Inc"},
+            "items": [{"item_id": "SKU-1", "item_description": "Premium", "item_quantity": "1", "partner_transaction_id": None, "reason": "MERCHANDISE_OR_SERVICE_NOT_RECEIVED", "dispute_amount": money("120.00"), "notes": "Item not received"}],
+            "seller_protection_eligible": True,
+        }],
+        "reason": "MERCHANDISE_OR_SERVICE_NOT_RECEIVED",
+        "status": "WAITING_FOR_SELLER_RESPONSE",
+        "dispute_amount": money("120.00"),
+        "dispute_life_cycle_stage": "CHARGEBACK",
+        "dispute_channel": "INTERNAL",
+        "messages": [{"posted_by": "BUYER", "time_posted": "2024-07-01T10:00:00.000Z", "content": "I never received the item, please refund. " * 3}],
+        "seller_response_due_date": "2024-07-15T10:00:00.000Z",
+        "evidences": [{"evidence_type": "PROOF_OF_FULFILLMENT", "evidence_info": {"tracking_info": [{"carrier_name": "UPS", "tracking_number": "1Z999"}]}, "documents": [{"name": "receipt.pdf", "url": "https://example.com/receipt.pdf"}]}],
+        "supporting_info": [{"notes": "Buyer provided notes " * 4, "source": "SUBMITTED_BY_BUYER", "provided_time": "2024-07-01T10:00:00.000Z"}],
+        "allowed_response_options": {"acknowledge_return_item": {"acknowledgement_types": ["ITEM_RECEIVED", "ITEM_NOT_RECEIVED", "DAMAGED", "EMPTY_PACKAGE_OR_DIFFERENT"]}, "accept_claim": {"accept_claim_types": ["REFUND", "REFUND_WITH_RETURN", "PARTIAL_REFUND"]}},
+        "links": [link("self"), link("accept_claim", "POST"), link("provide_evidence", "POST"), link("send_message", "POST"), link("escalate", "POST")],
+    }
+
+
+def captured_order():
+    capture = {
+        "id": "3C679366HH908993F",
+        "status": "COMPLETED",
+        "amount": money("100.00"),
+        "final_capture": True,
+        "seller_protection": {"status": "ELIGIBLE", "dispute_categories": ["ITEM_NOT_RECEIVED", "UNAUTHORIZED_TRANSACTION"]},
+        "seller_receivable_breakdown": {"gross_amount": money("100.00"), "paypal_fee": money("3.00"), "net_amount": money("97.00")},
+        "links": [link("self"), link("refund", "POST"), link("up")],
+        "create_time": "2024-07-01T10:00:00Z",
+        "update_time": "2024-07-01T10:00:00Z",
+    }
+    return summarize_order("5O190127TN364715T", {
+        "id": "5O190127TN364715T",
+        "status": "COMPLETED",
+        "payment_source": {"paypal": {"name": {"given_name": "Jane", "surname": "Doe"}, "email_address": "buyer@example.com", "account_id": "QYR5Z8XDVJNXQ", "account_status": "VERIFIED"}},
+        "purchase_units": [{
+            "reference_id": "default",
+            "shipping": {"name": {"full_name": "Jane Doe"}, "address": {"address_line_1": "1 Main St", "admin_area_2": "San Jose", "admin_area_1": "CA", "postal_code": "95131", "country_code": "US"}},
+            "payments": {"captures": [capture]},
+        }],
+        "payer": {"name": {"given_name": "Jane", "surname": "Doe"}, "email_address": "buyer@example.com", "payer_id": "QYR5Z8XDVJNXQ", "address": {"country_code": "US"}},
+        "links": [link("self")],
+    }).data
+
+
+PAYLOADS = {
+    "list_transactions": lambda: {"transaction_details": [transaction(i) for i in range(100)], "account_number": "MZRT5GGJXV5L2", "start_date": "2024-07-01T00:00:00+0000", "end_date": "2024-07-31T23:59:59+0000", "last_refreshed_datetime": "2024-08-01T00:00:00+0000", "page": 1, "total_items": 100, "total_pages": 1, "links": [link("self")]},
+    "list_invoices": lambda: {"total_items": 50, "total_pages": 1, "items": [invoice(i) for i in range(50)], "links": [link("self")]},
+    "get_dispute": dispute,
+    "pay_order": captured_order,
+}
+
+
+def report(label: str, method: str, data, options: ProjectionOptions, store: ContinuationStore):
+    before = json.dumps(data)
+    after = project(method, data, options, scope=None, store=store)
+    seconds = timeit.timeit(lambda: project(method, data, options, scope=None, store=store), number=20) / 20
+    before_tokens, after_tokens = count_tokens(before), count_tokens(after)
+    print(
+        f"{label:32} {len(before):9,d} B -> {len(after):8,d} B ({1 - len(after) / len(before):6.1%})"
+        f"   {before_tokens:7,d} tok -> {after_tokens:6,d} tok   {seconds * 1e3:6.2f} ms"
+    )
+
+
+def main():
+    store = ContinuationStore()
+    default = ProjectionOptions()
+    for method, payload in PAYLOADS.items():
+        report(method, method, payload(), default, store)
+    report("list_transactions, max_items=20", "list_transactions", PAYLOADS["list_transactions"](), ProjectionOptions(max_items=20), store)
+
+
+if __name__ == "__main__":
+    main()
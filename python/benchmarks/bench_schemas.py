@@ -0,0 +1,41 @@
+"""
+Cost of building the tool schemas a toolkit hands to its framework, for every
+tool, with and without the per-process schema cache.
+
+    python benchmarks/bench_schemas.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from paypal_agent_toolkit.shared.schemas import SCHEMA_DEFAULT, SCHEMA_OPENAI_AGENTS, clear_schema_cache, get_json_schema
+from paypal_agent_toolkit.shared.tools import tools
+
+
+def build_all():
+    # What the Bedrock / OpenAI chat and OpenAI Agents toolkits need at construction.
+    for tool in tools:
+        get_json_schema(tool["args_schema"], SCHEMA_DEFAULT)
+        get_json_schema(tool["args_schema"], SCHEMA_OPENAI_AGENTS)
+
+
+def main(number: int = 200):
+    def uncached():
+        clear_schema_cache()
+        build_all()
+
+    build_all()
+    before = timeit.timeit(uncached, number=number) / number
+    after = timeit.timeit(build_all, number=number) / number
+
+    print(f"{len(tools)} tools, 2 targets")
+    print(f"build schemas, uncached: {before * 1e3:9.2f} ms/toolkit")
+    print(f"build schemas, cached:   {after * 1e3:9.2f} ms/toolkit")
+    print(f"speedup:                 {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
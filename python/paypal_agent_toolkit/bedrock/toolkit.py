@@ -1,8 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 from pydantic import PrivateAttr
-from ..shared.api import PayPalAPI
-from ..shared.tools import tools
-from ..shared.configuration import Configuration, is_tool_allowed
+from ..shared.api import PayPalAPI, toolkit_api
+from ..shared.tools import get_allowed_tools
+from ..shared.configuration import Configuration
+from ..shared.schemas import get_json_schema
 
 class BedrockTool:
     def __init__(self, name: str, description: str, inputSchema: Dict[str, Any]):
@@ -21,9 +22,18 @@ class BedrockToolBlock:
         self.input = input
 
 class BedrockToolResult:
-    def __init__(self, toolUseId: str, content: List[Dict[str, Any]]):
+    def __init__(self, toolUseId: str, content: List[Dict[str, Any]], status: Optional[str] = None):
         self.toolUseId = toolUseId
         self.content = content
+        # "error" when the tool call failed, as expected by the Converse API toolResult block.
+        self.status = status
+
+    def to_content_block(self) -> Dict[str, Any]:
+        """The `toolResult` content block to send back to the model."""
+        tool_result = {"toolUseId": self.toolUseId, "content": self.content}
+        if self.status:
+            tool_result["status"] = self.status
+        return {"toolResult": tool_result}
 
 
 class PayPalToolkit:
@@ -33,23 +43,20 @@ class PayPalToolkit:
     _paypal_api: PayPalAPI = PrivateAttr(default=None)
     SOURCE = "BEDROCK"
 
-    def __init__(self, client_id, secret, configuration: Configuration):
+    def __init__(self, client_id=None, secret=None, configuration: Optional[Configuration] = None, paypal_api: Optional[PayPalAPI] = None):
         super().__init__()
         self.configuration = configuration
-        self.context = configuration.context if configuration and configuration.context else Configuration.Context.default()
-        self.context.source = self.SOURCE
-        self._paypal_api = PayPalAPI(client_id=client_id, secret=secret, context=self.context)
+        self._paypal_api = toolkit_api(client_id, secret, configuration, self.SOURCE, paypal_api)
+        self.context = self._paypal_api.context
 
-        filtered_tools = [
-            tool for tool in tools if is_tool_allowed(tool, configuration)
-        ]
+        filtered_tools = get_allowed_tools(configuration)
 
         self._tools = [{
                 "toolSpec": {
                     "name": tool["method"],
                     "description": tool["description"],
                     "inputSchema": {
-                        "json": tool["args_schema"].model_json_schema()
+                        "json": get_json_schema(tool["args_schema"])
                     }
                 }
             }
@@ -61,11 +68,35 @@ class PayPalToolkit:
 
     async def handle_tool_call(self, tool_call: BedrockToolBlock) -> BedrockToolResult:
         try: 
-            response = self._paypal_api.run(tool_call.name, tool_call.input)
+            response = await self._paypal_api.arun(tool_call.name, tool_call.input)
             return BedrockToolResult(
                 toolUseId=tool_call.toolUseId,
                 content=[{"text": response}]
             )
         except Exception as e:
             print(f"Error handling tool call: {e}")
-            
\ No newline at end of file
+            
+    async def handle_tool_calls(self, tool_calls: List[Union[BedrockToolBlock, Dict[str, Any]]]) -> List[BedrockToolResult]:
+        """
+        Run every tool use of a model message concurrently.
+
+        Accepts BedrockToolBlock objects or the message's raw content blocks (blocks
+        without a "toolUse" entry are skipped). Returns one result per tool use, in
+        order; a failed call yields a result with status "error" instead of raising.
+        """
+        blocks = []
+        for tool_call in tool_calls:
+            if isinstance(tool_call, dict):
+                if "toolUse" not in tool_call:
+                    continue
+                tool_use = tool_call["toolUse"]
+                tool_call = BedrockToolBlock(toolUseId=tool_use["toolUseId"], name=tool_use["name"], input=tool_use["input"])
+            blocks.append(tool_call)
+
+        outcomes = await self._paypal_api.arun_many([(block.name, block.input) for block in blocks])
+        return [
+            BedrockToolResult(toolUseId=block.toolUseId, content=[{"text": self._paypal_api.render(block.name, outcome.result)}])
+            if outcome.ok else
+            BedrockToolResult(toolUseId=block.toolUseId, content=[{"text": f"Error: {outcome.error}"}], status="error")
+            for block, outcome in zip(blocks, outcomes)
+        ]
@@ -5,9 +5,9 @@ PayPal Agent Toolkit for CrewAI.
 from typing import List, Optional
 from pydantic import PrivateAttr, BaseModel
 
-from ..shared.api import PayPalAPI
-from ..shared.tools import tools
-from ..shared.configuration import Configuration, is_tool_allowed
+from ..shared.api import PayPalAPI, toolkit_api
+from ..shared.tools import get_allowed_tools
+from ..shared.configuration import Configuration
 from .tool import PayPalTool
 
 
@@ -15,17 +15,18 @@ class PayPalToolkit:
     _tools: List = PrivateAttr()
     SOURCE = "CREWAI"
     def __init__(
-        self, client_id: str, secret: str, configuration: Optional[Configuration] = None
+        self,
+        client_id: Optional[str] = None,
+        secret: Optional[str] = None,
+        configuration: Optional[Configuration] = None,
+        paypal_api: Optional[PayPalAPI] = None,
     ):
         super().__init__()
         self._tools = []
-        self.context = configuration.context if configuration and configuration.context else Configuration.Context.default()
-        self.context.source = self.SOURCE
-        paypal_api = PayPalAPI(client_id=client_id, secret=secret, context=self.context)
+        paypal_api = toolkit_api(client_id, secret, configuration, self.SOURCE, paypal_api)
+        self.context = paypal_api.context
 
-        filtered_tools = [
-            tool for tool in tools if is_tool_allowed(tool, configuration)
-        ]
+        filtered_tools = get_allowed_tools(configuration)
         for tool in filtered_tools:
             args_schema = tool.get("args_schema")
     
@@ -42,6 +42,18 @@ class PayPalTool(BaseTool):
         except Exception as e:
             return f"Error executing PayPalTool '{self.method}': {str(e)}"
 
+    async def _arun(self, *args: Any, **kwargs: Any) -> str:
+        """
+        Executes the configured PayPal API method without blocking the event loop.
+
+        Returns:
+            str: The result from the PayPal API, or an error message.
+        """
+        try:
+            return await self.paypal_api.arun(self.method, kwargs)
+        except Exception as e:
+            return f"Error executing PayPalTool '{self.method}': {str(e)}"
+
     def __repr__(self):
         return f"<PayPalTool name={self.name}, method={self.method}>"
 
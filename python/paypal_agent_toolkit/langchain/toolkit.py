@@ -3,9 +3,9 @@
 from typing import List, Optional
 from pydantic import PrivateAttr
 
-from ..shared.api import PayPalAPI
-from ..shared.tools import tools
-from ..shared.configuration import Configuration, Context, is_tool_allowed
+from ..shared.api import PayPalAPI, toolkit_api
+from ..shared.tools import get_allowed_tools
+from ..shared.configuration import Configuration, Context
 from .tool import PayPalTool
 
 
@@ -14,16 +14,13 @@ class PayPalToolkit:
 
     _tools: List = PrivateAttr(default=[])
     SOURCE = "LANGCHAIN"
-    def __init__(self, client_id, secret, configuration: Configuration):
+    def __init__(self, client_id=None, secret=None, configuration: Optional[Configuration] = None, paypal_api: Optional[PayPalAPI] = None):
         super().__init__()
         self.configuration = configuration
-        self.context = configuration.context if configuration and configuration.context else Configuration.Context.default()
-        self.context.source = self.SOURCE
-        self._paypal_api = PayPalAPI(client_id=client_id, secret=secret, context=self.context)
+        self._paypal_api = toolkit_api(client_id, secret, configuration, self.SOURCE, paypal_api)
+        self.context = self._paypal_api.context
 
-        filtered_tools = [
-            tool for tool in tools if is_tool_allowed(tool, configuration)
-        ]
+        filtered_tools = get_allowed_tools(configuration)
 
         self._tools = [
             PayPalTool(
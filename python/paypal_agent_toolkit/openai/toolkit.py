@@ -1,12 +1,13 @@
 """PayPal Agentic Toolkit."""
-from typing import List
+from typing import List, Optional
 from agents import FunctionTool
 from pydantic import PrivateAttr
-from ..shared.tools import tools
+from ..shared.tools import get_allowed_tools
 from ..openai.tool import PayPalTool
 from ..shared.paypal_client import PayPalClient
-from ..shared.configuration import Configuration, is_tool_allowed
-from ..shared.api import PayPalAPI
+from ..shared.configuration import Configuration
+from ..shared.api import PayPalAPI, toolkit_api
+from ..shared.schemas import get_json_schema
 
 class PayPalToolkit:
 
@@ -15,16 +16,13 @@ class PayPalToolkit:
     _paypal_api: PayPalAPI = PrivateAttr(default=None)
     SOURCE = "OPEN-AI"
 
-    def __init__(self, client_id, secret, configuration: Configuration):
+    def __init__(self, client_id=None, secret=None, configuration: Optional[Configuration] = None, paypal_api: Optional[PayPalAPI] = None):
         self.configuration = configuration
         
-        self.context = configuration.context if configuration and configuration.context else Configuration.Context.default()
-        self.context.source = self.SOURCE
-        self._paypal_api = PayPalAPI(client_id=client_id, secret=secret, context=self.context)
+        self._paypal_api = toolkit_api(client_id, secret, configuration, self.SOURCE, paypal_api)
+        self.context = self._paypal_api.context
 
-        filtered_tools = [
-            tool for tool in tools if is_tool_allowed(tool, configuration)
-        ]
+        filtered_tools = get_allowed_tools(configuration)
 
         self._tools = [
             PayPalTool(self._paypal_api, tool)
@@ -37,7 +35,7 @@ class PayPalToolkit:
                 "function": {
                     "name": tool["method"],
                     "description": tool["description"],
-                    "parameters": tool["args_schema"].model_json_schema(),
+                    "parameters": get_json_schema(tool["args_schema"]),
                 }
             }
             for tool in filtered_tools
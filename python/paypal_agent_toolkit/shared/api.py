@@ -1,31 +1,308 @@
-
-
-from typing import Optional
+import asyncio
+import contextvars
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
 from pydantic import BaseModel
-from .configuration import Context
-from .paypal_client import PayPalClient
-from .tools import tools
+from .batch import MAX_BATCH_CONCURRENCY, ToolCallOutcome
+from .configuration import Configuration, Context
+from .deadline import deadline_scope, remaining
+from .errors import DeadlineExceededError
+from .idempotency import ReplayCache, idempotency_key, idempotency_scope, invocation_key
+from .paypal_client import AsyncPayPalClient, PayPalClient
+from .projection import continuation_scope, project
+from .result import ToolResult
+from .retry import RetryMetrics
+from .single_flight import SingleFlight
+from .tools import get_tool
+
 
 class PayPalAPI(BaseModel):
-    
+
     _context: Context
     _paypal_client: PayPalClient
-    
+    # httpx.AsyncClient is bound to the event loop it first ran on: one client per loop.
+    _async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncPayPalClient]"
+    _async_clients_lock: threading.Lock
+    _async_retry_metrics: RetryMetrics
+    _async_single_flight: SingleFlight
+    _replay_cache: ReplayCache
+
     def __init__(self, client_id: str, secret: str, context: Optional[Context]):
         super().__init__()
 
         self._context = context if context is not None else Context()
-        self._paypal_client = PayPalClient(client_id=client_id, secret=secret, context=context)
-        
-    
-    def run(self, method: str, params: dict) -> str:
+        self._paypal_client = PayPalClient(client_id=client_id, secret=secret, context=self._context)
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._async_clients_lock = threading.Lock()
+        self._async_retry_metrics = RetryMetrics()
+        self._async_single_flight = SingleFlight()
+        self._replay_cache = ReplayCache(ttl=self._context.replay_ttl)
+
+    @property
+    def context(self) -> Context:
+        return self._context
+
+    def close(self):
+        """Release the pooled HTTP connections held by the underlying client."""
+        self._paypal_client.close()
+
+    async def aclose(self):
+        """Release the sync connection pool and the async one of the running event loop."""
+        self.close()
+        with self._async_clients_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def metrics(self) -> dict:
+        metrics = self._paypal_client.metrics()
+        # The async clients share the caches, limiter and breaker with the sync client,
+        # and their retry and single-flight counters with each other.
+        metrics["async"] = {
+            **metrics,
+            "retry": self._async_retry_metrics.stats(),
+            "single_flight": self._async_single_flight.stats(),
+        }
+        metrics["replay_cache"] = self._replay_cache.stats()
+        return metrics
+
+    def _get_async_client(self) -> AsyncPayPalClient:
+        """The async client of the running event loop, created on first use in that loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                for stale in [other for other in self._async_clients if other.is_closed()]:
+                    del self._async_clients[stale]
+                client = self._async_clients[loop] = AsyncPayPalClient(
+                    client_id=self._paypal_client.client_id,
+                    secret=self._paypal_client.secret,
+                    context=self._context,
+                    token_cache=self._paypal_client.token_cache,
+                )
+                # Counters survive the loop: metrics() reports every async call.
+                client.retry_metrics = self._async_retry_metrics
+                client.single_flight = self._async_single_flight
+            return client
+
+    def _find_tool(self, method: str) -> dict:
         if method == "get_merchant_insights" and self._context.sandbox:
             raise ValueError("get_merchant_insights is not supported in sandbox mode")
-        
-        for tool in tools:
-            if tool.get("method") == method:
-                execute_fn = tool.get("execute")
-                if execute_fn:
-                    return execute_fn(self._paypal_client, params)
+
+        tool = get_tool(method)
+        if tool is not None:
+            return tool
         raise ValueError(f"method: {method} not found in tools list")
 
+    def _deduplicates_calls(self) -> bool:
+        """Whether identical calls share a key: only when the caller opted in."""
+        return self._context.request_id is not None or self._replay_cache.enabled
+
+    def _idempotency_key(self, tool, params: dict) -> Optional[str]:
+        if not tool.get("idempotent"):
+            return None
+        if not self._deduplicates_calls():
+            return invocation_key()
+        try:
+            canonical = tool["args_schema"](**params).model_dump(mode="json", exclude_none=True)
+        except Exception:
+            # Invalid parameters; the handler will raise its own validation error.
+            canonical = params
+        scope = (self._paypal_client.client_id, self._paypal_client.environment, self._context.merchant_id)
+        # Without a request id, identical calls are one operation only within a replay_ttl window.
+        window = int(time.time() // self._replay_cache.ttl) if self._context.request_id is None else None
+        return idempotency_key(scope, tool["method"], canonical, self._context.request_id, window)
+
+    def execute(self, method: str, params: dict, timeout: Optional[float] = None) -> ToolResult:
+        """
+        Run a tool and return its structured result; `result.data` holds the PayPal
+        response without any JSON round trip.
+
+        `timeout` (default: Context.tool_timeout) bounds the whole call, including
+        every HTTP request it makes; DeadlineExceededError is raised when it runs out.
+        Idempotent tools get a new PayPal-Request-Id per call, kept across retries;
+        with Context.request_id or replay_ttl set, identical calls share one and
+        return the stored result.
+        """
+        tool = self._find_tool(method)
+        execute_fn = tool.get("execute")
+        if not execute_fn:
+            raise ValueError(f"method: {method} not found in tools list")
+
+        key = self._idempotency_key(tool, params)
+
+        def execute():
+            with deadline_scope(timeout if timeout is not None else self._context.tool_timeout), idempotency_scope(key):
+                return execute_fn(self._paypal_client, params)
+
+        if key is None or not self._deduplicates_calls():
+            return execute()
+        return self._replay_cache.run_once(key, execute)
+
+    async def aexecute(self, method: str, params: dict, timeout: Optional[float] = None) -> ToolResult:
+        """Async counterpart of `execute`, using the asyncio PayPal client."""
+        tool = self._find_tool(method)
+        execute_fn = tool.get("execute_async")
+        if not execute_fn:
+            raise ValueError(f"method: {method} not found in tools list")
+
+        key = self._idempotency_key(tool, params)
+
+        async def execute():
+            with deadline_scope(timeout if timeout is not None else self._context.tool_timeout), idempotency_scope(key):
+                left = remaining()
+                if left is None:
+                    return await execute_fn(self._get_async_client(), params)
+                # HTTP timeouts only bound each read; this bounds the whole handler, e.g. a response
+                # trickling in or work between requests.
+                try:
+                    return await asyncio.wait_for(execute_fn(self._get_async_client(), params), max(left, 0.0))
+                except DeadlineExceededError:
+                    raise
+                except TimeoutError:
+                    if remaining() > 0:
+                        raise
+                    raise DeadlineExceededError(f"The {method} tool call did not complete before its deadline.") from None
+
+        if key is None or not self._deduplicates_calls():
+            return await execute()
+        return await self._replay_cache.arun_once(key, execute)
+
+    def render(self, method: str, result: ToolResult) -> str:
+        """The text handed to the LLM: the result, trimmed by Context.projection when set."""
+        projection = self._context.projection
+        if projection is None:
+            return result.text
+        return project(method, result.data, projection, continuation_scope(self._paypal_client))
+
+    def run(self, method: str, params: dict, timeout: Optional[float] = None) -> str:
+        """Run a tool and return the JSON text handed to the LLM. See `execute`."""
+        return self.render(method, self.execute(method, params, timeout))
+
+    async def arun(self, method: str, params: dict, timeout: Optional[float] = None) -> str:
+        """Run a tool without blocking the event loop, using the asyncio PayPal client."""
+        return self.render(method, await self.aexecute(method, params, timeout))
+
+    def run_many(
+        self,
+        calls: Iterable[Tuple[str, dict]],
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+        timeout: Optional[float] = None,
+    ) -> List[ToolCallOutcome]:
+        """
+        Run independent tool calls concurrently, at most `max_concurrency` at a time.
+
+        Returns one ToolCallOutcome per call, in the order given; a failing call
+        records its error instead of aborting the others. `timeout` applies to
+        each call, as in `execute`.
+        """
+        calls = list(calls)
+        if not calls:
+            return []
+
+        def run_one(method: str, params: dict) -> ToolCallOutcome:
+            try:
+                return ToolCallOutcome(method, result=self.execute(method, params, timeout=timeout))
+            except Exception as e:
+                return ToolCallOutcome(method, error=e)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(calls)))) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, run_one, method, params) for method, params in calls]
+            return [future.result() for future in futures]
+
+    async def arun_many(
+        self,
+        calls: Iterable[Tuple[str, dict]],
+        max_concurrency: int = MAX_BATCH_CONCURRENCY,
+        timeout: Optional[float] = None,
+    ) -> List[ToolCallOutcome]:
+        """Async counterpart of `run_many`, built on `arun`."""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_one(method: str, params: dict) -> ToolCallOutcome:
+            async with semaphore:
+                try:
+                    return ToolCallOutcome(method, result=await self.aexecute(method, params, timeout=timeout))
+                except Exception as e:
+                    return ToolCallOutcome(method, error=e)
+
+        return list(await asyncio.gather(*(run_one(method, params) for method, params in calls)))
+
+    def _find_iterator(self, method: str, key: str):
+        tool = self._find_tool(method)
+        if key not in tool:
+            raise ValueError(f"method: {method} does not support iteration")
+        return tool[key]
+
+    def iter_items(self, method: str, params: dict) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the items of a list tool (list_invoices, list_products,
+        list_subscription_plans, list_disputes, list_transactions) across pages,
+        prefetching the next page while the current one is consumed.
+        """
+        return self._find_iterator(method, "iterate")(self._paypal_client, params)
+
+    async def aiter_items(self, method: str, params: dict) -> AsyncIterator[Dict[str, Any]]:
+        iterate = self._find_iterator(method, "iterate_async")
+        async for item in iterate(self._get_async_client(), params):
+            yield item
+
+    def bulk_create_invoices(self, invoices: Iterable[Any], **options: Any):
+        """Create and send many invoices concurrently. See invoices.bulk.bulk_create_invoices for the options."""
+        from .invoices.bulk import bulk_create_invoices
+        return bulk_create_invoices(self._paypal_client, invoices, **options)
+
+    async def abulk_create_invoices(self, invoices: Iterable[Any], **options: Any):
+        from .invoices.bulk import abulk_create_invoices
+        return await abulk_create_invoices(self._get_async_client(), invoices, **options)
+
+    def create_shipment_trackers(self, shipments: Iterable[Any], **options: Any):
+        """Add many tracking numbers in trackers-batch chunks. See tracking.batch.create_shipment_trackers."""
+        from .tracking.batch import create_shipment_trackers
+        return create_shipment_trackers(self._paypal_client, shipments, **options)
+
+    async def acreate_shipment_trackers(self, shipments: Iterable[Any], **options: Any):
+        from .tracking.batch import acreate_shipment_trackers
+        return await acreate_shipment_trackers(self._get_async_client(), shipments, **options)
+
+    def iter_transactions(self, params: dict) -> Iterator[Dict[str, Any]]:
+        """Stream transactions over any date range, page by page. See transactions.tool_handlers.iter_transactions."""
+        return self.iter_items("list_transactions", params)
+
+    def aiter_transactions(self, params: dict) -> AsyncIterator[Dict[str, Any]]:
+        return self.aiter_items("list_transactions", params)
+
+def toolkit_api(
+    client_id: Optional[str],
+    secret: Optional[str],
+    configuration: Optional[Configuration],
+    source: str,
+    paypal_api: Optional[PayPalAPI] = None,
+) -> PayPalAPI:
+    """
+    The PayPalAPI a framework toolkit runs its tools on. Passing an existing
+    `paypal_api` lets toolkits built per conversation share one client, with its
+    warm connection pool and token; it is used as is and its context is not modified.
+    """
+    if paypal_api is not None:
+        return paypal_api
+    if not client_id or not secret:
+        raise ValueError("client_id and secret are required unless paypal_api is given")
+    context = configuration.context if configuration and configuration.context else Context.default()
+    context.source = source
+    return PayPalAPI(client_id=client_id, secret=secret, context=context)
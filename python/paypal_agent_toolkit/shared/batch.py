@@ -0,0 +1,33 @@
+"""
+Concurrent execution of several independent tool calls, as emitted by models
+that use parallel function calling.
+"""
+
+from typing import Any, Optional
+
+# Upper bound on tool calls of one batch running at the same time.
+MAX_BATCH_CONCURRENCY = 8
+
+
+class ToolCallOutcome:
+    """Result of one call in a batch: either its ToolResult or the `error` it raised."""
+
+    def __init__(self, method: str, result: Any = None, error: Optional[Exception] = None):
+        self.method = method
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Any:
+        """Return the result, or raise the error the call failed with."""
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"ToolCallOutcome({self.method!r}, result={self.result!r})"
+        return f"ToolCallOutcome({self.method!r}, error={self.error!r})"
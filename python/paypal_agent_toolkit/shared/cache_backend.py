@@ -0,0 +1,336 @@
+"""
+Storage backends for the token and response caches.
+
+- MemoryCacheBackend: in-process LRU bounded by bytes (the default).
+- FileCacheBackend: one file per key in a local directory, shared by every
+  process on the host.
+- RedisCacheBackend: any server speaking the Redis protocol (RESP), shared
+  across hosts. Implemented on a plain socket so no client library is needed.
+
+Backends store opaque bytes with a TTL. I/O failures of the shared backends
+are logged and treated as cache misses, so an unavailable cache never fails a
+tool call.
+"""
+
+import hashlib
+import logging
+import os
+import socket
+import stat
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+
+class CacheBackend:
+    """Interface shared by every cache backend. Keys are strings, values bytes."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        """Remove `key`; return whether an entry was removed."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe TTL cache bounded by the total size of its values, evicting least recently used first."""
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._clock() >= entry[0]:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (self._clock() + ttl, value)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry[1])
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "evictions": self._evictions}
+
+
+_EXPIRY = struct.Struct("!d")
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    Cross-process cache on the local filesystem.
+
+    Each key is a file named by its SHA-256, holding the wall-clock expiry
+    followed by the value. Writes go to a temporary file that is atomically
+    renamed into place, so readers in other processes never see a partial
+    entry and no locking is needed. Files are created readable by the owner
+    only, since the token cache stores bearer tokens here.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), f"paypal-agent-toolkit-{os.getuid() if hasattr(os, 'getuid') else 'cache'}")
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self._check_directory()
+
+    def _check_directory(self):
+        # The directory name is predictable and holds bearer tokens: another local user
+        # could have created it first and planted entries, so only a private directory
+        # owned by this user is accepted.
+        if not hasattr(os, "getuid"):
+            return
+        info = os.lstat(self.directory)
+        if not stat.S_ISDIR(info.st_mode):
+            raise PermissionError(f"Cache directory {self.directory} is not a directory.")
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"Cache directory {self.directory} is owned by another user.")
+        if info.st_mode & 0o077:
+            raise PermissionError(f"Cache directory {self.directory} is accessible to other users; restrict it with chmod 700.")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.warning("Cache read from %s failed: %s", self.directory, e)
+            return None
+        if len(data) < _EXPIRY.size or time.time() >= _EXPIRY.unpack_from(data)[0]:
+            self._unlink(path)
+            return None
+        return data[_EXPIRY.size:]
+
+    def set(self, key: str, value: bytes, ttl: float):
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_EXPIRY.pack(time.time() + ttl))
+                    f.write(value)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                self._unlink(tmp_path)
+                raise
+        except OSError as e:
+            logging.warning("Cache write to %s failed: %s", self.directory, e)
+
+    def delete(self, key: str) -> bool:
+        return self._unlink(self._path(key))
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            self._unlink(os.path.join(self.directory, name))
+
+    def purge_expired(self):
+        """Remove expired entries; reads only remove the entries they touch."""
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, "rb") as f:
+                    header = f.read(_EXPIRY.size)
+            except OSError:
+                continue
+            if len(header) == _EXPIRY.size and now >= _EXPIRY.unpack(header)[0]:
+                self._unlink(path)
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            return {"entries": sum(1 for name in os.listdir(self.directory) if not name.startswith("."))}
+        except OSError:
+            return {}
+
+    @staticmethod
+    def _unlink(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
+
+
+class RedisProtocolError(Exception):
+    pass
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache stored in Redis (or any server speaking RESP, such as Valkey or KeyDB).
+
+    Keys are prefixed with `namespace` so `clear()` only removes toolkit entries.
+    One connection is shared by all threads and re-established after a failure.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        namespace: str = "paypal-agent-toolkit:",
+        socket_timeout: float = 1.0,
+    ):
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported cache URL scheme: {parsed.scheme}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.namespace = namespace
+        self.socket_timeout = socket_timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.socket_timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock, self._reader = sock, sock.makefile("rb")
+        try:
+            if self.password:
+                self._call(*(["AUTH", self.username] if self.username else ["AUTH"]), self.password)
+            if self.db:
+                self._call("SELECT", str(self.db))
+        except BaseException:
+            # Never keep a connection that is not authenticated or on the wrong database.
+            self._disconnect()
+            raise
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    def _call(self, *args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionResetError("Connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise RedisProtocolError(rest.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise RedisProtocolError(f"Unexpected reply: {line!r}")
+
+    def execute(self, *args):
+        """Run one command, reconnecting once if the pooled connection went stale."""
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._call(*args)
+                except OSError:
+                    self._disconnect()
+                    if attempt == 2:
+                        raise
+
+    def _safe(self, *args):
+        try:
+            return self.execute(*args)
+        except (OSError, RedisProtocolError) as e:
+            logging.warning("Redis cache %s failed on %s:%s: %s", args[0], self.host, self.port, e)
+            return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._safe("GET", self.namespace + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        milliseconds = int(ttl * 1000)
+        if milliseconds > 0:
+            self._safe("SET", self.namespace + key, value, "PX", str(milliseconds))
+
+    def delete(self, key: str) -> bool:
+        return bool(self._safe("DEL", self.namespace + key))
+
+    def clear(self):
+        cursor = b"0"
+        while True:
+            reply = self._safe("SCAN", cursor, "MATCH", self.namespace + "*", "COUNT", "500")
+            if not reply:
+                return
+            cursor, keys = reply
+            if keys:
+                self._safe("DEL", *keys)
+            if cursor == b"0":
+                return
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
@@ -0,0 +1,114 @@
+"""
+Circuit breaking per PayPal endpoint family.
+
+When one PayPal API degrades (say reporting times out), calls to it would each
+wait out their full timeout and retries. The opt-in CircuitBreaker
+(Context.circuit_breaker) counts consecutive failed requests per endpoint
+family; after `failure_threshold` of them the family's circuit opens and its
+requests fail immediately with CircuitOpenError, leaving other families untouched. Once `reset_timeout` has
+passed the circuit is half-open: a single probe request goes through, and
+closes the circuit if it succeeds or reopens it if it fails.
+
+Failures are connection errors, timeouts and 5xx responses. Other responses,
+4xx included, prove the API is up and count as successes.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from .errors import CircuitOpenError
+from .rate_limit import endpoint_family
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_failure(error: Optional[httpx.HTTPError]) -> bool:
+    if error is None:
+        return False
+    response = getattr(error, "response", None)
+    if response is not None:
+        return response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class _Circuit:
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started: Optional[float] = None
+        self.times_opened = 0
+        self.rejected = 0
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "times_opened": self.times_opened, "rejected": self.rejected}
+
+
+class CircuitBreaker:
+    """
+    Per-family circuits shared by every client whose Context references this breaker.
+    Each request counts once, after its retries: a request that keeps failing is
+    one failure, however many attempts it made.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, family: str) -> _Circuit:
+        circuit = self._circuits.get(family)
+        if circuit is None:
+            circuit = self._circuits[family] = _Circuit()
+        return circuit
+
+    def before_request(self, uri: str):
+        """Let a request to `uri` through, or raise CircuitOpenError."""
+        family = endpoint_family(uri)
+        with self._lock:
+            circuit = self._circuit(family)
+            if circuit.state == CLOSED:
+                return
+            now = self._clock()
+            retry_in = circuit.opened_at + self.reset_timeout - now
+            # A probe that never reported back (e.g. it failed before reaching PayPal)
+            # gives up its slot after reset_timeout.
+            probe_lost = circuit.probe_started is not None and now - circuit.probe_started >= self.reset_timeout
+            if retry_in <= 0 and (circuit.probe_started is None or probe_lost):
+                circuit.state = HALF_OPEN
+                circuit.probe_started = now
+                return
+            circuit.rejected += 1
+        raise CircuitOpenError(family, max(retry_in, 0.0), circuit.failures)
+
+    def record(self, uri: str, failed: bool):
+        family = endpoint_family(uri)
+        with self._lock:
+            circuit = self._circuit(family)
+            if not failed:
+                circuit.state = CLOSED
+                circuit.failures = 0
+                circuit.probe_started = None
+                return
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or (circuit.state == CLOSED and circuit.failures >= self.failure_threshold):
+                circuit.state = OPEN
+                circuit.opened_at = self._clock()
+                circuit.probe_started = None
+                circuit.times_opened += 1
+
+    def state(self, uri: str) -> str:
+        with self._lock:
+            circuit = self._circuits.get(endpoint_family(uri))
+            return circuit.state if circuit is not None else CLOSED
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {family: circuit.stats() for family, circuit in self._circuits.items()}
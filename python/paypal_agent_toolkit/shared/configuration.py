@@ -1,4 +1,11 @@
 from typing import Optional, Dict, Any
+from .circuit_breaker import CircuitBreaker
+from .projection import ProjectionOptions
+from .rate_limit import RateLimiter
+from .response_cache import ResponseCache
+from .retry import RetryPolicy
+from .token_cache import TokenCache
+from .transport import TransportOptions
 
 class Context:
 
@@ -14,6 +21,17 @@ class Context:
         request_id: Optional[str] = None,
         tenant_context: Optional[Any] = None,
         source: Optional[str] = None,
+        transport: Optional[TransportOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 30.0,
+        tool_timeout: Optional[float] = None,
+        replay_ttl: float = 0.0,
+        response_cache: Optional[ResponseCache] = None,
+        token_cache: Optional[TokenCache] = None,
+        projection: Optional[ProjectionOptions] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
         **kwargs: Any
     ):
         self.merchant_id = merchant_id
@@ -22,6 +40,29 @@ class Context:
         self.request_id = request_id
         self.tenant_context = tenant_context
         self.source = source or "OPEN-AI"
+        self.transport = transport or TransportOptions()
+        self.retry = retry or RetryPolicy()
+        # Seconds allowed to establish a connection / wait for each response.
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # Default deadline for a whole tool call, across every HTTP request it makes.
+        self.tool_timeout = tool_timeout
+        # Seconds a mutating tool's result is replayed for an identical call; 0 (the
+        # default) only shares the result between identical calls running concurrently.
+        self.replay_ttl = replay_ttl
+        # Opt-in cache for GET lookups of single resources; None disables it.
+        self.response_cache = response_cache
+        # OAuth token cache; None uses the process-wide default. Give it a shared
+        # CacheBackend so several worker processes reuse one token.
+        self.token_cache = token_cache
+        # Trims tool results before they reach the LLM; None returns them unchanged.
+        self.projection = projection
+        # Client-side token buckets every request waits on; share one instance between
+        # contexts using the same credentials. None disables rate limiting.
+        self.rate_limiter = rate_limiter
+        # Fails fast on endpoint families that keep failing; share one instance between
+        # contexts using the same credentials. None disables circuit breaking.
+        self.circuit_breaker = circuit_breaker
         self.extra = kwargs
 
 class Configuration:
@@ -0,0 +1,47 @@
+"""
+Per-tool-call deadlines.
+
+PayPalAPI.run/arun open a deadline scope; every HTTP call made while the scope
+is active - including follow-up calls such as create_invoice -> send_invoice -
+caps its timeouts to the time remaining and fails fast once it has run out.
+The deadline lives in a ContextVar, so it follows asyncio tasks; code that
+hands work to threads must copy the context (see `contextvars.copy_context`).
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .errors import DeadlineExceededError
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("paypal_tool_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[None]:
+    """Run the body with at most `timeout` seconds left (never extends an outer deadline)."""
+    if timeout is None:
+        yield
+        return
+    deadline = time.monotonic() + timeout
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the active deadline, or None when no deadline is set."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(operation: str):
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError(f"Deadline exceeded before {operation}; the PayPal tool call took too long.")
@@ -16,6 +16,9 @@ class ListDisputesParameters(BaseModel):
         ]
     ] = Field(default=None, description="OPEN_INQUIRIES")
     page_size: Optional[int] = Field(default=10)
+    next_page_token: Optional[str] = Field(None, description="The token of the page to fetch, as returned in next_page_token by a previous call.")
+    max_items: Optional[int] = Field(None, ge=1, le=1000, description="Follow the next pages until this many disputes are collected. Without max_items or max_pages only one page is fetched.")
+    max_pages: Optional[int] = Field(None, ge=1, le=50, description="The maximum number of pages to fetch in this call.")
 
 
 class GetDisputeParameters(BaseModel):
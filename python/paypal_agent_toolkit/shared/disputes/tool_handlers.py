@@ -1,19 +1,28 @@
 
 from urllib.parse import urlencode
 from .parameters import *
-import json
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, AsyncIterator, Iterator
+from ..pagination import acollect_pages, aiter_items, collect_pages, iter_items
+from ..result import ToolResult
 
 
 
+def list_disputes_uri(validated: ListDisputesParameters) -> str:
+    query_string = urlencode(validated.dict(exclude_none=True, exclude={"max_items", "max_pages"}))
+    return f"/v1/customer/disputes?{query_string}"
+
+
 def list_disputes(client, params: dict):
     
     validated = ListDisputesParameters(**params)
-    query_string = urlencode(validated.dict(exclude_none=True))
-    uri = f"/v1/customer/disputes?{query_string}"
+    response = collect_pages(client, list_disputes_uri(validated), "items", validated.max_items, validated.max_pages)
+    return ToolResult(response) 
 
-    response = client.get(uri=uri)
-    return json.dumps(response) 
+
+def iter_disputes(client, params: dict) -> Iterator[Dict[str, Any]]:
+    """Yield the disputes of every page, prefetching the next page; max_items/max_pages bound the scan."""
+    validated = ListDisputesParameters(**params)
+    return iter_items(client, list_disputes_uri(validated), "items", validated.max_items, validated.max_pages)
 
 
 def get_dispute(client, params: dict):
@@ -21,7 +30,7 @@ def get_dispute(client, params: dict):
     uri = f"/v1/customer/disputes/{validated.dispute_id}"
 
     response = client.get(uri=uri)
-    return json.dumps(response) 
+    return ToolResult(response) 
 
 
 def accept_dispute_claim(client, params: dict):
@@ -29,6 +38,33 @@ def accept_dispute_claim(client, params: dict):
     uri = f"/v1/customer/disputes/{validated.dispute_id}/accept-claim"
 
     response = client.post(uri=uri, payload={"note": validated.note})
-    return json.dumps(response) 
+    return ToolResult(response) 
+
+
+
+async def alist_disputes(client, params: dict):
+
+    validated = ListDisputesParameters(**params)
+    response = await acollect_pages(client, list_disputes_uri(validated), "items", validated.max_items, validated.max_pages)
+    return ToolResult(response)
+
 
+def aiter_disputes(client, params: dict) -> AsyncIterator[Dict[str, Any]]:
+    validated = ListDisputesParameters(**params)
+    return aiter_items(client, list_disputes_uri(validated), "items", validated.max_items, validated.max_pages)
+
+
+async def aget_dispute(client, params: dict):
+    validated = GetDisputeParameters(**params)
+    uri = f"/v1/customer/disputes/{validated.dispute_id}"
+
+    response = await client.get(uri=uri)
+    return ToolResult(response)
+
+
+async def aaccept_dispute_claim(client, params: dict):
+    validated = AcceptDisputeClaimParameters(**params)
+    uri = f"/v1/customer/disputes/{validated.dispute_id}/accept-claim"
 
+    response = await client.post(uri=uri, payload={"note": validated.note})
+    return ToolResult(response)
@@ -0,0 +1,34 @@
+"""
+Typed errors raised by the toolkit itself (as opposed to PayPal API errors,
+which surface as httpx.HTTPStatusError).
+"""
+
+
+class PayPalToolkitError(Exception):
+    """Base class for errors raised by the PayPal agent toolkit."""
+
+
+class DeadlineExceededError(PayPalToolkitError, TimeoutError):
+    """The tool call ran out of time before PayPal responded."""
+
+
+class RateLimitExceededError(PayPalToolkitError):
+    """The client-side rate limiter could not grant a request slot within its wait budget."""
+
+    def __init__(self, family: str, wait: float):
+        super().__init__(f"Rate limit for PayPal {family} endpoints exceeded; the next slot is {wait:.2f}s away.")
+        self.family = family
+        self.wait = wait
+
+
+class CircuitOpenError(PayPalToolkitError):
+    """Requests to a failing PayPal endpoint family are being rejected without calling PayPal."""
+
+    def __init__(self, family: str, retry_after: float, failures: int):
+        super().__init__(
+            f"PayPal {family} endpoints are temporarily unavailable after {failures} consecutive failures; "
+            f"the request was not sent. Try again in {retry_after:.0f}s or use other tools meanwhile."
+        )
+        self.family = family
+        self.retry_after = retry_after
+        self.failures = failures
@@ -0,0 +1,149 @@
+"""
+Idempotency keys and local replay for mutating tools.
+
+Tools flagged with "idempotent": True in the tools list get an idempotency key
+for each call. While the tool runs, every POST it makes carries a
+PayPal-Request-Id derived from that key, so the retry policy may safely retry
+those POSTs and PayPal deduplicates the retries.
+
+By default the key is random, drawn once per call: two calls with the same
+parameters are two operations. Callers opt into deduplication across calls by
+setting Context.request_id (one logical operation per request id) or
+Context.replay_ttl (identical calls within the same TTL window are one
+operation); the key is then a hash of the account, the tool name, its
+canonicalized parameters and that request id or window. Successful results of
+such calls are kept in a ReplayCache so a repeat is answered locally.
+"""
+
+import contextvars
+import hashlib
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from .single_flight import SingleFlight
+
+_idempotency_key: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("paypal_idempotency_key", default=None)
+
+_MISSING = object()
+
+
+def canonicalize(params: Any) -> str:
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def idempotency_key(scope: Tuple[Any, ...], method: str, params: Any, request_id: Optional[str] = None, window: Optional[int] = None) -> str:
+    """
+    `scope` identifies the account (client id, environment, merchant) so equal
+    parameters from different tenants never share a key. A caller-supplied
+    `request_id` is mixed in, so a new request id deliberately repeats a call;
+    so is `window`, the replay TTL window the call falls in.
+    """
+    digest = hashlib.sha256(canonicalize([list(scope), request_id, window, method, params]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def invocation_key() -> str:
+    """A fresh key for one tool call, shared by all of its retries and by no other call."""
+    return secrets.token_hex(32)
+
+
+def paypal_request_id(key: str, uri: str) -> str:
+    """Per-endpoint request id, so a tool that POSTs twice (create, then send) uses distinct ids."""
+    return f"{key[:64]}-{hashlib.sha256(uri.encode('utf-8')).hexdigest()[:8]}"
+
+
+@contextmanager
+def idempotency_scope(key: Optional[str]) -> Iterator[None]:
+    token = _idempotency_key.set(key)
+    try:
+        yield
+    finally:
+        _idempotency_key.reset(token)
+
+
+def current_idempotency_key() -> Optional[str]:
+    return _idempotency_key.get()
+
+
+class ReplayCache:
+    """
+    Bounded TTL cache of successful mutating tool results, keyed by idempotency key.
+    Concurrent calls with the same key (threads or asyncio tasks) run once and
+    the others get that call's result, even when the TTL is 0 and nothing is kept.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._replays = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the stored result for `key`, or the module sentinel `_MISSING`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, result = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            self._replays += 1
+            return result
+
+    def put(self, key: Hashable, result: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def run_once(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        result = self.get(key)
+        if result is not _MISSING:
+            return result
+
+        def execute():
+            # Re-check: an identical call may have finished since the lookup above.
+            result = self.get(key)
+            if result is _MISSING:
+                result = fn()
+                self.put(key, result)
+            return result
+
+        return self._in_flight.do(key, execute)
+
+    async def arun_once(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        result = self.get(key)
+        if result is not _MISSING:
+            return result
+
+        async def execute():
+            result = self.get(key)
+            if result is _MISSING:
+                result = await fn()
+                self.put(key, result)
+            return result
+
+        return await self._in_flight.ado(key, execute)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = {"replays": self._replays, "entries": len(self._entries)}
+        stats["coalesced"] = self._in_flight.stats()["coalesced"]
+        return stats
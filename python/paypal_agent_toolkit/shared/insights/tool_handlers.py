@@ -1,8 +1,14 @@
 from .parameters import *
-import json
+from ..result import ToolResult
 
 def get_merchant_insights(client, params: dict):
     validated = GetMerchantInsightsParameters(**params)
     merchant_uri = f"/v1/merchant/insights?start_date={validated.start_date}&end_date={validated.end_date}&insight_type={validated.insight_type}&time_interval={validated.time_interval}"
     result = client.get(uri = merchant_uri)
-    return json.dumps(result)
\ No newline at end of file
+    return ToolResult(result)
+
+async def aget_merchant_insights(client, params: dict):
+    validated = GetMerchantInsightsParameters(**params)
+    merchant_uri = f"/v1/merchant/insights?start_date={validated.start_date}&end_date={validated.end_date}&insight_type={validated.insight_type}&time_interval={validated.time_interval}"
+    result = await client.get(uri = merchant_uri)
+    return ToolResult(result)
@@ -0,0 +1,399 @@
+"""
+Bulk invoicing: create and send many invoices concurrently.
+
+`bulk_create_invoices` (and `abulk_create_invoices`) runs create -> send for
+each invoice on a bounded pool of workers, so the sends of some invoices
+overlap the creates of others. Every invoice has a key (a hash of its payload
+unless the caller supplies one) that serves two purposes:
+
+- its POSTs carry PayPal-Request-Ids derived from the key, so PayPal
+  deduplicates a create that is repeated after a crash;
+- with a `checkpoint` file, each completed stage is appended to it, and a rerun
+  skips invoices already sent and only sends those already created.
+
+Rate limits: 429 responses are retried by the client's RetryPolicy (honouring
+Retry-After), and `requests_per_second` paces the pipeline's own requests.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from ..idempotency import canonicalize, idempotency_scope
+from .parameters import CreateInvoiceParameters
+from .tool_handlers import (
+    asend_invoice,
+    asend_invoice_reminder,
+    created_invoice_id,
+    send_created_invoice_params,
+    send_invoice,
+    send_invoice_reminder,
+)
+
+DEFAULT_BULK_CONCURRENCY = 8
+
+CREATE_URI = "/v2/invoicing/invoices"
+
+InvoiceInput = Union[CreateInvoiceParameters, Dict[str, Any]]
+
+
+class InvoiceOutcome:
+    """
+    What happened to one invoice of a bulk run. `status` is "sent", "created"
+    (send disabled or failed after create), "reminded", "skipped" (already done
+    according to the checkpoint, or a repeat of an earlier input) or "failed".
+    """
+
+    def __init__(self, index: int, key: str, status: str, invoice_id: Optional[str] = None, error: Optional[Exception] = None):
+        self.index = index
+        self.key = key
+        self.status = status
+        self.invoice_id = invoice_id
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"InvoiceOutcome({self.index}, {self.status!r}, invoice_id={self.invoice_id!r})"
+        return f"InvoiceOutcome({self.index}, {self.status!r}, invoice_id={self.invoice_id!r}, error={self.error!r})"
+
+
+class BulkInvoiceReport:
+    """Per-invoice outcomes (in input order) and the throughput of a bulk run."""
+
+    def __init__(self, outcomes: List[InvoiceOutcome], elapsed: float):
+        self.outcomes = outcomes
+        self.elapsed = elapsed
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for outcome in self.outcomes:
+            counts[outcome.status] = counts.get(outcome.status, 0) + 1
+        return counts
+
+    @property
+    def failed(self) -> List[InvoiceOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+    @property
+    def throughput(self) -> float:
+        """Invoices processed per second, skipped ones excluded."""
+        processed = sum(1 for outcome in self.outcomes if outcome.status != "skipped")
+        return processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total": len(self.outcomes),
+            "counts": self.counts,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 2),
+        }
+
+    def __repr__(self) -> str:
+        return f"BulkInvoiceReport({self.summary()})"
+
+
+class InvoiceCheckpoint:
+    """
+    Append-only JSON-lines record of completed stages, keyed by invoice key.
+    Each line is flushed and fsynced before the stage counts as done, so a
+    crash loses at most the stage in flight.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._state.setdefault(entry["key"], {}).update(entry)
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn last line of an interrupted run
+        self._fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+        # Terminate a torn last line so the next entry does not get appended to it.
+        size = os.fstat(self._fd).st_size
+        if size and os.pread(self._fd, 1, size - 1) != b"\n":
+            os.write(self._fd, b"\n")
+
+    def get(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._state.get(key, {}))
+
+    def record(self, key: str, stage: str, invoice_id: Optional[str]):
+        entry = {"key": key, "stage": stage, "invoice_id": invoice_id, "time": time.time()}
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._lock:
+            os.write(self._fd, line)
+            os.fsync(self._fd)
+            self._state.setdefault(key, {}).update(entry)
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _Pacer:
+    """Spaces requests at least 1 / requests_per_second apart, across all workers."""
+
+    def __init__(self, requests_per_second: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._clock = clock
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+            return slot - now
+
+    def wait(self):
+        if self.interval:
+            delay = self._reserve()
+            if delay > 0:
+                time.sleep(delay)
+
+    async def await_slot(self):
+        if self.interval:
+            delay = self._reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+
+def invoice_key(client, payload: Dict[str, Any]) -> str:
+    """Default invoice identity: the account and the canonical payload."""
+    scope = [client.client_id, client.environment, client.context.merchant_id]
+    return hashlib.sha256(canonicalize([scope, "bulk_create_invoice", payload]).encode("utf-8")).hexdigest()
+
+
+def _prepare(client, invoices: Iterable[InvoiceInput], key: Optional[Callable[[CreateInvoiceParameters], str]]):
+    """Yield (index, key, payload, error) per input, validating lazily so huge iterables stream."""
+    for index, invoice in enumerate(invoices):
+        try:
+            validated = invoice if isinstance(invoice, CreateInvoiceParameters) else CreateInvoiceParameters(**invoice)
+            payload = validated.model_dump()
+            identity = key(validated) if key is not None else invoice_key(client, payload)
+        except Exception as e:
+            yield index, "", None, e
+            continue
+        yield index, identity, payload, None
+
+
+def _create_and_send(client, index: int, key: str, payload: Dict[str, Any], send: bool, checkpoint: Optional[InvoiceCheckpoint], pacer: _Pacer) -> InvoiceOutcome:
+    done = checkpoint.get(key) if checkpoint is not None else {}
+    invoice_id = done.get("invoice_id")
+    if done.get("stage") == "sent" or (done.get("stage") == "created" and not send):
+        return InvoiceOutcome(index, key, "skipped", invoice_id)
+
+    with idempotency_scope(key):
+        if invoice_id is None:
+            pacer.wait()
+            try:
+                response = client.post(uri=CREATE_URI, payload=payload)
+            except Exception as e:
+                return InvoiceOutcome(index, key, "failed", error=e)
+            invoice_id = created_invoice_id(response)
+            if invoice_id is None:
+                return InvoiceOutcome(index, key, "failed", error=RuntimeError(f"unexpected create invoice response: {response}"))
+            if checkpoint is not None:
+                checkpoint.record(key, "created", invoice_id)
+        if not send:
+            return InvoiceOutcome(index, key, "created", invoice_id)
+
+        pacer.wait()
+        try:
+            send_invoice(client, send_created_invoice_params(invoice_id))
+        except Exception as e:
+            return InvoiceOutcome(index, key, "created", invoice_id, error=e)
+    if checkpoint is not None:
+        checkpoint.record(key, "sent", invoice_id)
+    return InvoiceOutcome(index, key, "sent", invoice_id)
+
+
+async def _acreate_and_send(client, index: int, key: str, payload: Dict[str, Any], send: bool, checkpoint: Optional[InvoiceCheckpoint], pacer: _Pacer) -> InvoiceOutcome:
+    done = checkpoint.get(key) if checkpoint is not None else {}
+    invoice_id = done.get("invoice_id")
+    if done.get("stage") == "sent" or (done.get("stage") == "created" and not send):
+        return InvoiceOutcome(index, key, "skipped", invoice_id)
+
+    with idempotency_scope(key):
+        if invoice_id is None:
+            await pacer.await_slot()
+            try:
+                response = await client.post(uri=CREATE_URI, payload=payload)
+            except Exception as e:
+                return InvoiceOutcome(index, key, "failed", error=e)
+            invoice_id = created_invoice_id(response)
+            if invoice_id is None:
+                return InvoiceOutcome(index, key, "failed", error=RuntimeError(f"unexpected create invoice response: {response}"))
+            if checkpoint is not None:
+                checkpoint.record(key, "created", invoice_id)
+        if not send:
+            return InvoiceOutcome(index, key, "created", invoice_id)
+
+        await pacer.await_slot()
+        try:
+            await asend_invoice(client, send_created_invoice_params(invoice_id))
+        except Exception as e:
+            return InvoiceOutcome(index, key, "created", invoice_id, error=e)
+    if checkpoint is not None:
+        checkpoint.record(key, "sent", invoice_id)
+    return InvoiceOutcome(index, key, "sent", invoice_id)
+
+
+def _run_bounded(jobs, max_concurrency: int) -> List[InvoiceOutcome]:
+    """Run `jobs` (index, fn) on a pool with at most 2 x max_concurrency queued at once."""
+    outcomes: List[InvoiceOutcome] = []
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        in_flight = set()
+        for fn in jobs:
+            if len(in_flight) >= 2 * max_concurrency:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                outcomes.extend(future.result() for future in done)
+            # Copy the context so each worker sees the caller's deadline.
+            in_flight.add(pool.submit(contextvars.copy_context().run, fn))
+        outcomes.extend(future.result() for future in wait(in_flight).done)
+    return sorted(outcomes, key=lambda outcome: outcome.index)
+
+
+async def _arun_bounded(jobs, max_concurrency: int) -> List[InvoiceOutcome]:
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    tasks = []
+
+    async def run(fn):
+        try:
+            return await fn()
+        finally:
+            semaphore.release()
+
+    for fn in jobs:
+        await semaphore.acquire()
+        tasks.append(asyncio.ensure_future(run(fn)))
+    outcomes = await asyncio.gather(*tasks)
+    return sorted(outcomes, key=lambda outcome: outcome.index)
+
+
+def _jobs(client, invoices, key, send, checkpoint, pacer, worker, done):
+    """One callable per input; `done` wraps outcomes known without a request (sync or async)."""
+    seen = set()
+    for index, invoice_key_, payload, error in _prepare(client, invoices, key):
+        if error is not None:
+            yield lambda index=index, error=error: done(InvoiceOutcome(index, "", "failed", error=error))
+        elif invoice_key_ in seen:
+            # Same key twice in one run: create it once.
+            yield lambda index=index, k=invoice_key_: done(InvoiceOutcome(index, k, "skipped"))
+        else:
+            seen.add(invoice_key_)
+            yield lambda index=index, k=invoice_key_, payload=payload: worker(client, index, k, payload, send, checkpoint, pacer)
+
+
+def _done(outcome: InvoiceOutcome) -> InvoiceOutcome:
+    return outcome
+
+
+async def _adone(outcome: InvoiceOutcome) -> InvoiceOutcome:
+    return outcome
+
+
+def bulk_create_invoices(
+    client,
+    invoices: Iterable[InvoiceInput],
+    send: bool = True,
+    max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    checkpoint: Optional[str] = None,
+    requests_per_second: Optional[float] = None,
+    key: Optional[Callable[[CreateInvoiceParameters], str]] = None,
+) -> BulkInvoiceReport:
+    """
+    Create (and by default send) every invoice of `invoices`, at most
+    `max_concurrency` at a time. `checkpoint` is the path of a progress file
+    that makes the run resumable. `key` maps an invoice to its identity (e.g.
+    your billing record id); by default identical payloads are one invoice.
+    A failed invoice never stops the run; see the report's outcomes.
+    """
+    started = time.monotonic()
+    store = InvoiceCheckpoint(checkpoint) if checkpoint else None
+    try:
+        outcomes = _run_bounded(_jobs(client, invoices, key, send, store, _Pacer(requests_per_second), _create_and_send, _done), max_concurrency)
+    finally:
+        if store is not None:
+            store.close()
+    return BulkInvoiceReport(outcomes, time.monotonic() - started)
+
+
+async def abulk_create_invoices(
+    client,
+    invoices: Iterable[InvoiceInput],
+    send: bool = True,
+    max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    checkpoint: Optional[str] = None,
+    requests_per_second: Optional[float] = None,
+    key: Optional[Callable[[CreateInvoiceParameters], str]] = None,
+) -> BulkInvoiceReport:
+    """Async counterpart of `bulk_create_invoices` for use with AsyncPayPalClient."""
+    started = time.monotonic()
+    store = InvoiceCheckpoint(checkpoint) if checkpoint else None
+    try:
+        outcomes = await _arun_bounded(_jobs(client, invoices, key, send, store, _Pacer(requests_per_second), _acreate_and_send, _adone), max_concurrency)
+    finally:
+        if store is not None:
+            store.close()
+    return BulkInvoiceReport(outcomes, time.monotonic() - started)
+
+
+def bulk_send_reminders(
+    client,
+    invoice_ids: Iterable[str],
+    max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    requests_per_second: Optional[float] = None,
+    note: Optional[str] = None,
+) -> BulkInvoiceReport:
+    """Send a payment reminder for each invoice, at most `max_concurrency` at a time."""
+    started = time.monotonic()
+    pacer = _Pacer(requests_per_second)
+
+    def remind(index: int, invoice_id: str) -> InvoiceOutcome:
+        pacer.wait()
+        try:
+            send_invoice_reminder(client, {"invoice_id": invoice_id, "note": note})
+        except Exception as e:
+            return InvoiceOutcome(index, invoice_id, "failed", invoice_id, error=e)
+        return InvoiceOutcome(index, invoice_id, "reminded", invoice_id)
+
+    jobs = (lambda index=index, invoice_id=invoice_id: remind(index, invoice_id) for index, invoice_id in enumerate(invoice_ids))
+    return BulkInvoiceReport(_run_bounded(jobs, max_concurrency), time.monotonic() - started)
+
+
+async def abulk_send_reminders(
+    client,
+    invoice_ids: Iterable[str],
+    max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    requests_per_second: Optional[float] = None,
+    note: Optional[str] = None,
+) -> BulkInvoiceReport:
+    started = time.monotonic()
+    pacer = _Pacer(requests_per_second)
+
+    async def remind(index: int, invoice_id: str) -> InvoiceOutcome:
+        await pacer.await_slot()
+        try:
+            await asend_invoice_reminder(client, {"invoice_id": invoice_id, "note": note})
+        except Exception as e:
+            return InvoiceOutcome(index, invoice_id, "failed", invoice_id, error=e)
+        return InvoiceOutcome(index, invoice_id, "reminded", invoice_id)
+
+    jobs = (lambda index=index, invoice_id=invoice_id: remind(index, invoice_id) for index, invoice_id in enumerate(invoice_ids))
+    return BulkInvoiceReport(await _arun_bounded(jobs, max_concurrency), time.monotonic() - started)
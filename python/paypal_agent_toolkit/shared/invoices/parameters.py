@@ -64,6 +64,8 @@ class ListInvoicesParameters(BaseModel):
     page: Optional[int] = Field(1, ge =1, le=1000, description="The page number of the result set to fetch.")
     page_size: Optional[int] = Field(100, ge=1, le=100, description="The number of records to return per page (maximum 100).")
     total_required: Optional[bool] = Field(None, description="Indicates whether the response should include the total count of items.")
+    max_items: Optional[int] = Field(None, ge=1, le=1000, description="Follow the next pages until this many invoices are collected. Without max_items or max_pages only one page is fetched.")
+    max_pages: Optional[int] = Field(None, ge=1, le=50, description="The maximum number of pages to fetch in this call.")
 
 
 class SendInvoiceParameters(BaseModel):
@@ -1,11 +1,30 @@
 
 from .parameters import *
-import json
-import httpx
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, AsyncIterator, Iterator
+from ..pagination import acollect_pages, aiter_items, collect_pages, iter_items
+from ..result import ToolResult
 
 
 
+def created_invoice_id(response: dict):
+    """Return the new invoice id when the create response links to the created invoice."""
+    if (
+        response.get("rel") == "self"
+        and "/v2/invoicing/invoices/" in response.get("href", "")
+        and response.get("method") == "GET"
+    ):
+        return response["href"].split("/")[-1]
+    return None
+
+
+def send_created_invoice_params(invoice_id: str) -> dict:
+    return {
+        "invoice_id": invoice_id,
+        "note": "Thank you for choosing us. If there are any issues, feel free to contact us.",
+        "send_to_recipient": True
+    }
+
+
 def create_invoice(client, params: dict):
     
     validated = CreateInvoiceParameters(**params)
@@ -14,26 +33,18 @@ def create_invoice(client, params: dict):
     url = "/v2/invoicing/invoices"
     response = client.post(uri=url, payload=invoice_payload)
 
-    if (
-        response.get("rel") == "self"
-        and "/v2/invoicing/invoices/" in response.get("href", "")
-        and response.get("method") == "GET"
-    ):
-        invoice_id = response["href"].split("/")[-1]
+    invoice_id = created_invoice_id(response)
+    if invoice_id:
         try:
-            send_result = send_invoice(client, {
-                "invoice_id": invoice_id,
-                "note": "Thank you for choosing us. If there are any issues, feel free to contact us.",
-                "send_to_recipient": True
-            })
-            return json.dumps({
+            send_result = send_invoice(client, send_created_invoice_params(invoice_id))
+            return ToolResult({
                 "createResult": response,
-                "sendResult": send_result
+                "sendResult": send_result.data
             })
         except Exception:
-            return json.dumps(response)
+            return ToolResult(response)
 
-    return json.dumps(response)
+    return ToolResult(response)
 
 
 def send_invoice(client, params: dict):
@@ -45,16 +56,25 @@ def send_invoice(client, params: dict):
     url = f"/v2/invoicing/invoices/{invoice_id}/send"
 
     response =  client.post(uri=url, payload=payload)
-    return json.dumps(response)
+    return ToolResult(response)
+
+
+def list_invoices_uri(validated: ListInvoicesParameters) -> str:
+    return f"/v2/invoicing/invoices?page_size={validated.page_size or 10}&page={validated.page or 1}&total_required={validated.total_required or 'true'}"
 
 
 def list_invoices(client, params: dict):
 
     validated = ListInvoicesParameters(**params)
-    invoice_uri = f"/v2/invoicing/invoices?page_size={validated.page_size or 10}&page={validated.page or 1}&total_required={validated.total_required or 'true'}"
-    response = client.get(uri=invoice_uri)
+    response = collect_pages(client, list_invoices_uri(validated), "items", validated.max_items, validated.max_pages)
 
-    return json.dumps(response)
+    return ToolResult(response)
+
+
+def iter_invoices(client, params: dict) -> Iterator[Dict[str, Any]]:
+    """Yield the invoices of every page, prefetching the next page; max_items/max_pages bound the scan."""
+    validated = ListInvoicesParameters(**params)
+    return iter_items(client, list_invoices_uri(validated), "items", validated.max_items, validated.max_pages)
 
 
 def get_invoice(client, params: dict):
@@ -64,7 +84,7 @@ def get_invoice(client, params: dict):
     url = f"/v2/invoicing/invoices/{invoice_id}"
     response = client.get(uri=url)
 
-    return json.dumps(response)
+    return ToolResult(response)
 
 
 def send_invoice_reminder(client, params: dict):
@@ -74,13 +94,11 @@ def send_invoice_reminder(client, params: dict):
 
     invoice_id = payload["invoice_id"]
     url = f"/v2/invoicing/invoices/{invoice_id}/remind"
-    print("url: ", url)
     response = client.post(uri=url, payload=payload)
-    print("response: ", response)
 
     if response is None:
-        return {"success": True, "invoice_id": invoice_id}
-    return json.dumps(response)
+        return ToolResult({"success": True, "invoice_id": invoice_id})
+    return ToolResult(response)
 
 
 def cancel_sent_invoice(client, params: dict):
@@ -94,9 +112,9 @@ def cancel_sent_invoice(client, params: dict):
     
     # PayPal responds with 204 No Content on successful cancellation
     if response is None:
-        return {"success": True, "invoice_id": invoice_id}
+        return ToolResult({"success": True, "invoice_id": invoice_id})
 
-    return json.dumps(response)
+    return ToolResult(response)
 
 
 def generate_invoice_qrcode(client, params: dict):
@@ -113,6 +131,112 @@ def generate_invoice_qrcode(client, params: dict):
     response = client.post(uri=url, payload=payload)
 
     if response is None:
-        return {"success": True, "invoice_id": invoice_id}
+        return ToolResult({"success": True, "invoice_id": invoice_id})
+
+    return ToolResult(response)
+
+
+async def acreate_invoice(client, params: dict):
+
+    validated = CreateInvoiceParameters(**params)
+    invoice_payload = validated.model_dump()
+
+    url = "/v2/invoicing/invoices"
+    response = await client.post(uri=url, payload=invoice_payload)
+
+    invoice_id = created_invoice_id(response)
+    if invoice_id:
+        try:
+            send_result = await asend_invoice(client, send_created_invoice_params(invoice_id))
+            return ToolResult({
+                "createResult": response,
+                "sendResult": send_result.data
+            })
+        except Exception:
+            return ToolResult(response)
+
+    return ToolResult(response)
+
+
+async def asend_invoice(client, params: dict):
+
+    validated = SendInvoiceParameters(**params)
+    payload = validated.model_dump()
+
+    invoice_id = payload["invoice_id"]
+    url = f"/v2/invoicing/invoices/{invoice_id}/send"
+
+    response = await client.post(uri=url, payload=payload)
+    return ToolResult(response)
+
+
+async def alist_invoices(client, params: dict):
+
+    validated = ListInvoicesParameters(**params)
+    response = await acollect_pages(client, list_invoices_uri(validated), "items", validated.max_items, validated.max_pages)
+
+    return ToolResult(response)
+
+
+def aiter_invoices(client, params: dict) -> AsyncIterator[Dict[str, Any]]:
+    validated = ListInvoicesParameters(**params)
+    return aiter_items(client, list_invoices_uri(validated), "items", validated.max_items, validated.max_pages)
+
+
+async def aget_invoice(client, params: dict):
+    validated = GetInvoiceParameters(**params)
+    invoice_id = validated.invoice_id
+
+    url = f"/v2/invoicing/invoices/{invoice_id}"
+    response = await client.get(uri=url)
+
+    return ToolResult(response)
+
+
+async def asend_invoice_reminder(client, params: dict):
+
+    validated = SendInvoiceReminderParameters(**params)
+    payload = validated.model_dump()
+
+    invoice_id = payload["invoice_id"]
+    url = f"/v2/invoicing/invoices/{invoice_id}/remind"
+    response = await client.post(uri=url, payload=payload)
+
+    if response is None:
+        return ToolResult({"success": True, "invoice_id": invoice_id})
+    return ToolResult(response)
+
+
+async def acancel_sent_invoice(client, params: dict):
+
+    validated = CancelSentInvoiceParameters(**params)
+    payload = validated.model_dump()
+    invoice_id = payload["invoice_id"]
+    url = f"/v2/invoicing/invoices/{invoice_id}/cancel"
+
+    response = await client.post(uri=url, payload=payload)
+
+    # PayPal responds with 204 No Content on successful cancellation
+    if response is None:
+        return ToolResult({"success": True, "invoice_id": invoice_id})
+
+    return ToolResult(response)
+
+
+async def agenerate_invoice_qrcode(client, params: dict):
+
+    validated = GenerateInvoiceQrCodeParameters(**params)
+    payload = {
+        "width": validated.width,
+        "height": validated.height
+    }
+
+    invoice_id = validated.invoice_id
+    url = f"/v2/invoicing/invoices/{invoice_id}/generate-qr-code"
+
+    response = await client.post(uri=url, payload=payload)
+
+    if response is None:
+        return ToolResult({"success": True, "invoice_id": invoice_id})
 
-    return json.dumps(response)
\ No newline at end of file
+    return ToolResult(response)
@@ -1,6 +1,72 @@
-
 import logging
 import json
+import random
+from typing import Any, Callable, Optional
+
+
+class PayloadLogOptions:
+    """
+    Controls how much of each PayPal payload is written to the log.
+
+    - max_chars: cap on each payload logged at DEBUG (None logs it in full).
+    - preview_sample_rate: fraction of responses (0.0 - 1.0) for which a compact,
+      truncated preview is logged at INFO while DEBUG is disabled.
+    - preview_max_chars: cap on each preview.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None, preview_sample_rate: float = 0.0, preview_max_chars: int = 1024):
+        self.max_chars = max_chars
+        self.preview_sample_rate = preview_sample_rate
+        self.preview_max_chars = preview_max_chars
+
+
+_options = PayloadLogOptions()
+
+
+def configure_payload_logging(
+    max_chars: Optional[int] = None,
+    preview_sample_rate: float = 0.0,
+    preview_max_chars: int = 1024,
+) -> PayloadLogOptions:
+    global _options
+    _options = PayloadLogOptions(max_chars, preview_sample_rate, preview_max_chars)
+    return _options
+
+
+def truncate(text: str, max_chars: Optional[int]) -> str:
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [truncated, {len(text)} chars total]"
+
+
+class LazyFormat:
+    """Defers building a log argument until a handler actually formats the record."""
+
+    __slots__ = ("_fn", "_args")
+
+    def __init__(self, fn: Callable[..., str], *args: Any):
+        self._fn = fn
+        self._args = args
+
+    def __str__(self) -> str:
+        return self._fn(*self._args)
+
+
+def _dump_json(value: Any, indent: Optional[int] = 2, max_chars: Optional[int] = None) -> str:
+    return truncate(json.dumps(value, indent=indent, default=str), max_chars)
+
+
+def lazy_json(value: Any, indent: Optional[int] = 2, max_chars: Optional[int] = None) -> LazyFormat:
+    return LazyFormat(_dump_json, value, indent, max_chars)
+
+
+def _dump_headers(headers) -> str:
+    return json.dumps(dict(headers), indent=2)
+
+
+def lazy_headers(headers) -> LazyFormat:
+    return LazyFormat(_dump_headers, headers)
+
 
 def mask_bearer_token(token: str) -> str:
     if not token.startswith("Bearer "):
@@ -11,24 +77,41 @@ def mask_bearer_token(token: str) -> str:
     return f"Bearer {raw[:4]}****{raw[-4:]}"
 
 
-def logRequestPayload(payload, url, headers):
-    logging.debug("PayPal POST %s", url)
-    # Mask sensitive header before logging
-    masked_headers = {
-        **headers,
-        "Authorization": mask_bearer_token(headers["Authorization"])
+def mask_headers(headers) -> dict:
+    # httpx normalises header names to lower case, so match case-insensitively
+    return {
+        key: mask_bearer_token(value) if key.lower() == "authorization" else value
+        for key, value in dict(headers).items()
     }
-    logging.debug("PayPal Request Headers:\n%s", json.dumps(masked_headers, indent=2))
-    logging.debug("PayPal Request Payload:\n%s", json.dumps(payload, indent=2))     
+
+
+def _dump_masked_headers(headers) -> str:
+    return json.dumps(mask_headers(headers), indent=2)
+
+
+def logRequestPayload(payload, url, headers, method="POST"):
+    if not logging.root.isEnabledFor(logging.DEBUG):
+        return
+    logging.debug("PayPal %s %s", method, url)
+    # Mask sensitive header before logging
+    logging.debug("PayPal Request Headers:\n%s", LazyFormat(_dump_masked_headers, headers))
+    logging.debug("PayPal Request Payload:\n%s", lazy_json(payload, max_chars=_options.max_chars))
 
 
 def logResponsePayload(response, json_response):
-    request_headers = dict(response.request.headers)
-    masked_headers = {
-        **request_headers,
-        "Authorization": mask_bearer_token(request_headers["Authorization"])
-    }
-    logging.debug("PayPal Request Headers:\n%s", json.dumps(masked_headers, indent=2))
-    logging.debug("PayPal Response Headers: %s", json.dumps(dict(response.headers), indent=2))
-    logging.debug("PayPal Response Payload: %s", json.dumps(json_response, indent=2))
-    
\ No newline at end of file
+    if not logging.root.isEnabledFor(logging.DEBUG):
+        if (
+            _options.preview_sample_rate > 0
+            and logging.root.isEnabledFor(logging.INFO)
+            and random.random() < _options.preview_sample_rate
+        ):
+            logging.info(
+                "PayPal Response Preview %s %s: %s",
+                response.status_code,
+                response.request.url,
+                lazy_json(json_response, indent=None, max_chars=_options.preview_max_chars),
+            )
+        return
+    logging.debug("PayPal Request Headers:\n%s", LazyFormat(_dump_masked_headers, response.request.headers))
+    logging.debug("PayPal Response Headers: %s", lazy_headers(response.headers))
+    logging.debug("PayPal Response Payload: %s", lazy_json(json_response, max_chars=_options.max_chars))
@@ -1,16 +1,30 @@
 
 from .parameters import *
 from .payload_util import parse_order_details
-import json
+from ..result import ToolResult
+
+
+def summarize_order(order_id: str, result: dict) -> ToolResult:
+    status = result.get("status")
+    amount = result.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("amount", {}).get("value")
+    currency = result.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("amount", {}).get("currency_code")
+
+    return ToolResult({
+        "message": f"The PayPal order {order_id} has been successfully captured.",
+        "status": status,
+        "amount": f"{currency} {amount}" if amount and currency else "N/A",
+        "raw": result
+    })
+
 
 def create_order(client, params: dict):
 
     validated = CreateOrderParameters(**params)
     order_payload = parse_order_details(validated.model_dump())
-    
+
     order_uri = "/v2/checkout/orders"
     response = client.post(uri=order_uri, payload=order_payload)
-    return json.dumps(response)
+    return ToolResult(response)
 
 
 
@@ -18,30 +32,37 @@ def capture_order(client, params: dict):
     validated = CaptureOrderParameters(**params)
     order_capture_uri = f"/v2/checkout/orders/{validated.order_id}/capture"
     result = client.post(uri=order_capture_uri, payload=None)
-    status = result.get("status")
-    amount = result.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("amount", {}).get("value")
-    currency = result.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("amount", {}).get("currency_code")
-
-    return json.dumps({
-        "message": f"The PayPal order {validated.order_id} has been successfully captured.",
-        "status": status,
-        "amount": f"{currency} {amount}" if amount and currency else "N/A",
-        "raw": result 
-    })
+    return summarize_order(validated.order_id, result)
 
 
 def get_order_details(client, params: dict):
     validated = OrderIdParameters(**params)
     order_get_uri = f"/v2/checkout/orders/{validated.order_id}"
-    
+
     result = client.get(order_get_uri)
-    status = result.get("status")
-    amount = result.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("amount", {}).get("value")
-    currency = result.get("purchase_units", [{}])[0].get("payments", {}).get("captures", [{}])[0].get("amount", {}).get("currency_code")
+    return summarize_order(validated.order_id, result)
 
-    return json.dumps({
-        "message": f"The PayPal order {validated.order_id} has been successfully captured.",
-        "status": status,
-        "amount": f"{currency} {amount}" if amount and currency else "N/A",
-        "raw": result 
-    })
\ No newline at end of file
+
+async def acreate_order(client, params: dict):
+
+    validated = CreateOrderParameters(**params)
+    order_payload = parse_order_details(validated.model_dump())
+
+    order_uri = "/v2/checkout/orders"
+    response = await client.post(uri=order_uri, payload=order_payload)
+    return ToolResult(response)
+
+
+async def acapture_order(client, params: dict):
+    validated = CaptureOrderParameters(**params)
+    order_capture_uri = f"/v2/checkout/orders/{validated.order_id}/capture"
+    result = await client.post(uri=order_capture_uri, payload=None)
+    return summarize_order(validated.order_id, result)
+
+
+async def aget_order_details(client, params: dict):
+    validated = OrderIdParameters(**params)
+    order_get_uri = f"/v2/checkout/orders/{validated.order_id}"
+
+    result = await client.get(order_get_uri)
+    return summarize_order(validated.order_id, result)
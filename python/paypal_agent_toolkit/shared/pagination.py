@@ -0,0 +1,200 @@
+"""
+Pagination of the list endpoints (invoices, products, plans, disputes).
+
+Pages are chained through the HATEOAS `next` link of each response, whatever
+the endpoint uses underneath (page numbers or next_page_token). While the
+caller processes one page, the next one is already being fetched.
+
+- `iter_pages` / `aiter_pages` and `iter_items` / `aiter_items` stream a
+  listing for programmatic callers, optionally bounded by max_items/max_pages.
+- `collect_pages` / `acollect_pages` back the list tools: they merge the pages
+  into one response so an agent gets up to `max_items` in a single tool call.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+def next_page_uri(response: Dict[str, Any]) -> Optional[str]:
+    """
+    Path and query of the response's `next` link. The host is dropped: the
+    client always sends requests (and its token) to its own base URL.
+    """
+    for link in response.get("links") or []:
+        if isinstance(link, dict) and link.get("rel") == "next" and link.get("href"):
+            parts = urlsplit(link["href"])
+            return f"{parts.path}?{parts.query}" if parts.query else parts.path
+    return None
+
+
+def _continuation(next_uri: str) -> Dict[str, Any]:
+    """
+    The tool arguments that resume the listing at `next_uri`: `page` for the
+    page-numbered endpoints, `next_page_token` for disputes.
+    """
+    query = parse_qs(urlsplit(next_uri).query)
+    if "next_page_token" in query:
+        return {"next_page_token": query["next_page_token"][0]}
+    if "page" in query and query["page"][0].isdigit():
+        return {"page": int(query["page"][0])}
+    return {}
+
+
+def iter_pages(client, uri: str, max_pages: Optional[int] = None, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield the responses of `uri` and of the pages it links to, in order."""
+    fetched = 0
+    pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending = None
+    try:
+        page = client.get(uri=uri)
+        while True:
+            fetched += 1
+            next_uri = next_page_uri(page)
+            more = next_uri is not None and (max_pages is None or fetched < max_pages)
+            if more and pool is not None:
+                # Copy the context so the prefetch sees the caller's tool-call deadline.
+                pending = pool.submit(contextvars.copy_context().run, client.get, uri=next_uri)
+            yield page
+            if not more:
+                return
+            page = pending.result() if pending is not None else client.get(uri=next_uri)
+            pending = None
+    finally:
+        if pool is not None:
+            if pending is not None:
+                pending.cancel()
+            pool.shutdown(wait=False)
+
+
+async def aiter_pages(client, uri: str, max_pages: Optional[int] = None, prefetch: bool = True) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of `iter_pages` for use with AsyncPayPalClient."""
+    fetched = 0
+    pending = None
+    try:
+        page = await client.get(uri=uri)
+        while True:
+            fetched += 1
+            next_uri = next_page_uri(page)
+            more = next_uri is not None and (max_pages is None or fetched < max_pages)
+            if more and prefetch:
+                pending = asyncio.ensure_future(client.get(uri=next_uri))
+            yield page
+            if not more:
+                return
+            page = await pending if pending is not None else await client.get(uri=next_uri)
+            pending = None
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def iter_items(client, uri: str, items_key: str, max_items: Optional[int] = None, max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the items of every page, stopping after `max_items` items or `max_pages` pages."""
+    count = 0
+    pages = iter_pages(client, uri, max_pages)
+    try:
+        for page in pages:
+            for item in page.get(items_key) or []:
+                if max_items is not None and count >= max_items:
+                    return
+                count += 1
+                yield item
+            if max_items is not None and count >= max_items:
+                return
+    finally:
+        pages.close()
+
+
+async def aiter_items(client, uri: str, items_key: str, max_items: Optional[int] = None, max_pages: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    count = 0
+    pages = aiter_pages(client, uri, max_pages)
+    try:
+        async for page in pages:
+            for item in page.get(items_key) or []:
+                if max_items is not None and count >= max_items:
+                    return
+                count += 1
+                yield item
+            if max_items is not None and count >= max_items:
+                return
+    finally:
+        await pages.aclose()
+
+
+class _Collector:
+    """Merges pages into the first page's response, up to `max_items` items."""
+
+    def __init__(self, items_key: str, max_items: Optional[int]):
+        self.items_key = items_key
+        self.max_items = max_items
+        self.first: Optional[Dict[str, Any]] = None
+        self.last: Dict[str, Any] = {}
+        self.items: List[Any] = []
+        self.pages = 0
+        self.trimmed = False
+
+    def add(self, page: Dict[str, Any]) -> bool:
+        """Add a page; False once enough items have been collected."""
+        if self.first is None:
+            self.first = page
+        self.last = page
+        self.pages += 1
+        items = page.get(self.items_key) or []
+        if self.max_items is not None and len(self.items) + len(items) > self.max_items:
+            items = items[:self.max_items - len(self.items)]
+            self.trimmed = True
+        self.items.extend(items)
+        return self.max_items is None or len(self.items) < self.max_items
+
+    def result(self) -> Dict[str, Any]:
+        merged = dict(self.first or {})
+        merged[self.items_key] = self.items
+        if "links" in self.last:
+            merged["links"] = self.last["links"]
+        merged["pages_fetched"] = self.pages
+        next_uri = next_page_uri(self.last)
+        merged["has_more"] = self.trimmed or next_uri is not None
+        if next_uri is not None and not self.trimmed:
+            merged.update(_continuation(next_uri))
+        return merged
+
+
+def _page_limit(max_items: Optional[int], max_pages: Optional[int]) -> Optional[int]:
+    # Without any limit the tools keep their single-page behaviour.
+    return 1 if max_items is None and max_pages is None else max_pages
+
+
+def collect_pages(client, uri: str, items_key: str, max_items: Optional[int] = None, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    """
+    The listing at `uri` as one response: the first page's fields, the items of
+    every page fetched (at most `max_items`), `pages_fetched`, `has_more`, and
+    the `page` / `next_page_token` argument to resume from when the last page
+    was consumed whole. Fetches a single page when neither limit is given.
+    """
+    collector = _Collector(items_key, max_items)
+    # Sequential on purpose: each next link comes from the previous response and merging a
+    # page costs nothing, so a prefetch has no work to overlap and would only fetch a page
+    # past max_items that is thrown away.
+    pages = iter_pages(client, uri, _page_limit(max_items, max_pages), prefetch=False)
+    try:
+        for page in pages:
+            if not collector.add(page):
+                break
+    finally:
+        pages.close()
+    return collector.result()
+
+
+async def acollect_pages(client, uri: str, items_key: str, max_items: Optional[int] = None, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    collector = _Collector(items_key, max_items)
+    pages = aiter_pages(client, uri, _page_limit(max_items, max_pages), prefetch=False)
+    try:
+        async for page in pages:
+            if not collector.add(page):
+                break
+    finally:
+        await pages.aclose()
+    return collector.result()
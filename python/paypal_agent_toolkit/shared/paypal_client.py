@@ -1,148 +1,387 @@
+import asyncio
+import hashlib
 import json
+import time
 from typing import Optional
-import requests
+import httpx
 
 from ..shared.telemetry import Telemetry
 
-from .logger_util import logRequestPayload, logResponsePayload
+from .logger_util import LazyFormat, lazy_headers, logRequestPayload, logResponsePayload
 from .constants import *
+from .circuit_breaker import is_failure
 from .configuration import Context
+from .deadline import check_deadline, remaining
+from .errors import DeadlineExceededError
+from .idempotency import current_idempotency_key, paypal_request_id
+from .response_cache import MISSING
+from .retry import IDEMPOTENCY_HEADER, RetryMetrics, attempt_outcome, retry_after_seconds
+from .single_flight import SingleFlight
+from .token_cache import TokenCache, default_token_cache
+from .transport import create_async_http_client, create_http_client
 import logging
 
 
-class PayPalClient:
-    def __init__(self, client_id, secret, context: Optional[Context]):
+def _format_error_body(response: httpx.Response) -> str:
+    try:
+        return json.dumps(response.json(), indent=2)
+    except ValueError:
+        return "Not valid JSON"
+
+
+class BasePayPalClient:
+    """State and response handling shared by the sync and async PayPal clients."""
+
+    def __init__(self, client_id, secret, context: Optional[Context], token_cache: Optional[TokenCache] = None):
         self.client_id = client_id
         self.secret = secret
-        self.context = context
-        self.sandbox = context.sandbox
+        self.context = context if context is not None else Context()
+        self.sandbox = self.context.sandbox
         self.base_url = SANDBOX_BASE_URL if self.sandbox  else LIVE_BASE_URL
-    
+        self.environment = ENV_SANDBOX if self.sandbox else ENV_LIVE
+        self.token_cache = token_cache or self.context.token_cache or default_token_cache
+        # The secret is part of the key so a client with wrong credentials never gets
+        # another client's token without authenticating.
+        self._token_key = (self.client_id, self.environment, hashlib.sha256(str(self.secret).encode("utf-8")).hexdigest())
+        self.retry_policy = self.context.retry
+        self.retry_metrics = RetryMetrics()
+        self.response_cache = self.context.response_cache
+        self._cache_scope = (self.client_id, self.environment, self.context.merchant_id)
+        # Concurrent identical GETs share one request.
+        self.single_flight = SingleFlight()
+        self.rate_limiter = self.context.rate_limiter
+        self.circuit_breaker = self.context.circuit_breaker
 
 
-    def log_request_exception(self, e: requests.exceptions.RequestException, url: Optional[str] = None):
+    def log_request_exception(self, e: httpx.HTTPError, url: Optional[str] = None):
+        if not logging.root.isEnabledFor(logging.ERROR):
+            return
         response = getattr(e, 'response', None)
         if response is not None:
-            try:
-                logging.error("PayPal Error Response: %s", json.dumps(response.json(), indent=2))
-            except ValueError:
-                logging.error("PayPal Error Response: Not valid JSON")
-            logging.error("Response Headers: %s", json.dumps(dict(response.headers), indent=2))
+            logging.error("PayPal Error Response: %s", LazyFormat(_format_error_body, response))
+            logging.error("Response Headers: %s", lazy_headers(response.headers))
         if url:
             logging.error("Request to %s failed: %s", url, str(e))
         else:
             logging.error("HTTP request failed: %s", str(e))
 
 
-    def build_headers(self):
-        headers = {
-                "Authorization": f"Bearer {self.get_access_token()}",
+    def metrics(self) -> dict:
+        metrics = {
+            "token_cache": self.token_cache.stats(),
+            "retry": self.retry_metrics.stats(),
+            "single_flight": self.single_flight.stats(),
+        }
+        if self.response_cache is not None:
+            metrics["response_cache"] = self.response_cache.stats()
+        if self.rate_limiter is not None:
+            metrics["rate_limiter"] = self.rate_limiter.stats()
+        if self.circuit_breaker is not None:
+            metrics["circuit_breaker"] = self.circuit_breaker.stats()
+        return metrics
+
+    def cached_response(self, uri: str, headers: Optional[dict]):
+        """The cached response for a GET of `uri`, or MISSING if it has to be fetched."""
+        if self.response_cache is None or headers or not self.response_cache.is_cacheable(uri):
+            return MISSING
+        return self.response_cache.get(self._cache_scope, uri)
+
+    def cache_generation(self, uri: str):
+        return self.response_cache.generation(self._cache_scope, uri) if self.response_cache is not None else None
+
+    def cache_response(self, uri: str, headers: Optional[dict], response, generation=None):
+        if self.response_cache is not None and not headers:
+            self.response_cache.put(self._cache_scope, uri, response, generation)
+
+    def invalidate_cached(self, method: str, uri: str):
+        # Invalidate even when the call failed: a timed-out mutation may still have been applied.
+        if self.response_cache is not None and method != "GET":
+            self.response_cache.invalidate(self._cache_scope, uri)
+
+    def request_headers(self, method: str, uri: str, access_token: str, headers: Optional[dict]) -> dict:
+        request_headers = {**self.headers_for_token(access_token), **(headers or {})}
+        key = current_idempotency_key()
+        if key and method == "POST" and IDEMPOTENCY_HEADER not in request_headers:
+            request_headers[IDEMPOTENCY_HEADER] = paypal_request_id(key, uri)
+        return request_headers
+
+    def request_timeout(self, method: str, url: str) -> httpx.Timeout:
+        """Configured timeouts, capped to whatever is left of the current tool call's deadline."""
+        check_deadline(f"{method} {url}")
+        left = remaining()
+        connect = self.context.connect_timeout if left is None else min(self.context.connect_timeout, left)
+        read = self.context.read_timeout if left is None else min(self.context.read_timeout, left)
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=connect)
+
+    def retry_delay(self, method: str, url: str, headers: dict, error: httpx.HTTPError, attempt: int, started: float) -> Optional[float]:
+        """Record a failed attempt; return the delay before retrying, or None if `error` should be raised."""
+        self.invalidate_access_token(error)
+        self.record_throttling(error)
+        delay = self.retry_policy.next_delay(method, headers, error, attempt, time.monotonic() - started)
+        left = remaining()
+        if delay is not None and left is not None and delay >= left:
+            delay = None
+        self.retry_metrics.record_attempt(attempt_outcome(getattr(error, "response", None), error), retried=delay is not None, failed=True)
+        if delay is None:
+            self.log_request_exception(error, url)
+            if isinstance(error, httpx.TimeoutException) and left is not None and left <= 0:
+                raise DeadlineExceededError(f"PayPal {method} {url} did not complete before the tool call deadline.") from error
+            # One outcome per request, once its retries are exhausted.
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(error.request.url.path, is_failure(error))
+        else:
+            logging.warning("PayPal %s %s failed (attempt %d): %s; retrying in %.2fs", method, url, attempt, error, delay)
+        return delay
+
+    def record_success(self, response: httpx.Response):
+        self.retry_metrics.record_attempt(attempt_outcome(response, None), retried=False, failed=False)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(response.url.path, failed=False)
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_success(response.url.path)
+
+    def record_throttling(self, error: httpx.HTTPError):
+        # A 429 pauses the endpoint family for every client sharing the limiter.
+        response = getattr(error, "response", None)
+        if self.rate_limiter is not None and response is not None and response.status_code == 429:
+            self.rate_limiter.on_throttled(response.url.path, retry_after_seconds(response))
+
+    def headers_for_token(self, access_token: str) -> dict:
+        return {
+                "Authorization": f"Bearer {access_token}",
                 "Content-Type": "application/json",
                 "User-Agent" : Telemetry.generate_user_agent(source=self.context.source)
             }
-        return headers
 
-    def get_access_token(self):
-        token_url = f"{self.base_url}/v1/oauth2/token"
-        try:
-            response = requests.post(
-                token_url,
-                headers={"Accept": "application/json"},
-                data={"grant_type": "client_credentials"},
-                auth=(self.client_id, self.secret)
-            )
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            self.log_request_exception(e, token_url)
-            raise RuntimeError("Failed to obtain access token from PayPal") from e
-        
-        
-        logging.debug("PayPal Response Headers: %s", json.dumps(dict(response.headers), indent=2))
+    def invalidate_access_token(self, e: httpx.HTTPError):
+        # A 401 means the token was revoked or expired early; fetch a new one next time.
+        # Only that token is dropped: a concurrent request may already have replaced it.
+        response = getattr(e, 'response', None)
+        if response is not None and response.status_code == 401:
+            rejected = response.request.headers.get("Authorization", "").removeprefix("Bearer ")
+            self.token_cache.invalidate(self._token_key, rejected)
+
+    def token_request(self) -> dict:
+        return {
+            "url": f"{self.base_url}/v1/oauth2/token",
+            "headers": {"Accept": "application/json"},
+            "data": {"grant_type": "client_credentials"},
+            "auth": (self.client_id, self.secret),
+        }
+
+    def parse_token_response(self, response: httpx.Response):
+        logging.debug("PayPal Response Headers: %s", lazy_headers(response.headers))
 
         token_data = response.json()
         if "access_token" not in token_data:
             raise ValueError("Access token not found in PayPal response")
 
-        return token_data["access_token"]
-
-    def post(self, uri, payload):
-       
-        url = f"{self.base_url}{uri}"
-        headers = self.build_headers()
-        logRequestPayload(payload, url, headers)
-
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            self.log_request_exception(e, url)
-            raise
+        return token_data["access_token"], token_data.get("expires_in", 0)
 
+    def parse_response(self, response: httpx.Response):
         if response.status_code == 204:
             logging.debug("Response Status: 204 No Content")
             return {}
-        
+
         try:
             json_response = response.json()
         except ValueError:
-            logging.warning("Response body is not valid JSON or empty, Headers: %s", json.dumps(dict(response.headers), indent=2))
+            logging.warning("Response body is not valid JSON or empty, Headers: %s", lazy_headers(response.headers))
             return {}
 
         logResponsePayload(response, json_response)
 
         return json_response
 
-    def get(self, uri):
 
-        url = f"{self.base_url}{uri}"
-        headers = self.build_headers()
-        
-        logRequestPayload( None, url, headers)
+class PayPalClient(BasePayPalClient):
+    def __init__(
+        self,
+        client_id,
+        secret,
+        context: Optional[Context],
+        token_cache: Optional[TokenCache] = None,
+        http_client: Optional[httpx.Client] = None,
+    ):
+        super().__init__(client_id, secret, context, token_cache)
+        # One pooled, keep-alive client per PayPalClient; reused by every tool call.
+        self._owns_http_client = http_client is None
+        self.http_client = http_client if http_client is not None else create_http_client(self.context.transport)
 
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            self.log_request_exception(e, url)
-            logging.error("HTTP request failed: %s", str(e))
-            raise
+    def close(self):
+        if self._owns_http_client:
+            self.http_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
+    def build_headers(self):
+        return self.headers_for_token(self.get_access_token())
+
+    def get_access_token(self):
+        return self.token_cache.get(self._token_key, self.fetch_access_token)
+
+    def fetch_access_token(self):
+        token_request = self.token_request()
+        timeout = self.request_timeout("POST", token_request["url"])
         try:
-            json_response = response.json()
-        except ValueError:
-            logging.warning("Response body is not valid JSON or empty")
-            return {}
+            response = self.http_client.post(**token_request, timeout=timeout)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self.log_request_exception(e, token_request["url"])
+            raise RuntimeError("Failed to obtain access token from PayPal") from e
 
-        logResponsePayload(response, json_response)
+        return self.parse_token_response(response)
 
-        return json_response
+    def request(self, method: str, uri: str, payload=None, headers: Optional[dict] = None):
 
-    def put(self, uri, payload):
-       
         url = f"{self.base_url}{uri}"
-        headers = self.build_headers()
-        logRequestPayload(payload, url, headers)
+        started = time.monotonic()
+        attempt = 0
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(uri)
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                check_deadline(f"{method} {url}")
+                self.rate_limiter.acquire(uri, remaining())
+            request_headers = self.request_headers(method, uri, self.get_access_token(), headers)
+            timeout = self.request_timeout(method, url)
+            logRequestPayload(payload, url, request_headers, method)
+
+            try:
+                response = self.http_client.request(method, url, headers=request_headers, json=payload, timeout=timeout)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                delay = self.retry_delay(method, url, request_headers, e, attempt, started)
+                if delay is None:
+                    self.invalidate_cached(method, uri)
+                    raise
+                time.sleep(delay)
+                continue
+
+            self.record_success(response)
+            self.invalidate_cached(method, uri)
+            return self.parse_response(response)
+
+    def post(self, uri, payload, headers: Optional[dict] = None):
+        return self.request("POST", uri, payload, headers)
+
+    def get(self, uri, headers: Optional[dict] = None):
+        response = self.cached_response(uri, headers)
+        if response is not MISSING:
+            return response
+        if headers:
+            return self.request("GET", uri, headers=headers)
+        return self.single_flight.do(uri, lambda: self.fetch_and_cache(uri))
+
+    def fetch_and_cache(self, uri):
+        generation = self.cache_generation(uri)
+        response = self.request("GET", uri)
+        self.cache_response(uri, None, response, generation)
+        return response
+
+    def put(self, uri, payload, headers: Optional[dict] = None):
+        return self.request("PUT", uri, payload, headers)
+
+
+class AsyncPayPalClient(BasePayPalClient):
+    """
+    asyncio counterpart of PayPalClient built on httpx.AsyncClient.
+
+    Shares the OAuth token cache with PayPalClient instances for the same credentials.
+    """
+
+    def __init__(
+        self,
+        client_id,
+        secret,
+        context: Optional[Context],
+        token_cache: Optional[TokenCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        super().__init__(client_id, secret, context, token_cache)
+        self._owns_http_client = http_client is None
+        self.http_client = http_client if http_client is not None else create_async_http_client(self.context.transport)
+
+    async def aclose(self):
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
+    async def build_headers(self):
+        return self.headers_for_token(await self.get_access_token())
+
+    async def get_access_token(self):
+        return await self.token_cache.aget(self._token_key, self.fetch_access_token)
+
+    async def fetch_access_token(self):
+        token_request = self.token_request()
+        timeout = self.request_timeout("POST", token_request["url"])
         try:
-            response = requests.put(url, headers=headers, json=payload)
+            response = await self.http_client.post(**token_request, timeout=timeout)
             response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            self.log_request_exception(e, url)
-            raise
+        except httpx.HTTPError as e:
+            self.log_request_exception(e, token_request["url"])
+            raise RuntimeError("Failed to obtain access token from PayPal") from e
 
-        if response.status_code == 204:
-            logging.debug("Response Status: 204 No Content")
-            return {}
-        
-        try:
-            json_response = response.json()
-        except ValueError:
-            logging.warning("Response body is not valid JSON or empty, Headers: %s", json.dumps(dict(response.headers), indent=2))
-            return {}
+        return self.parse_token_response(response)
 
-        logResponsePayload(response, json_response)
+    async def request(self, method: str, uri: str, payload=None, headers: Optional[dict] = None):
 
-        return json_response
+        url = f"{self.base_url}{uri}"
+        started = time.monotonic()
+        attempt = 0
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(uri)
+        while True:
+            attempt += 1
+            if self.rate_limiter is not None:
+                check_deadline(f"{method} {url}")
+                await self.rate_limiter.aacquire(uri, remaining())
+            request_headers = self.request_headers(method, uri, await self.get_access_token(), headers)
+            timeout = self.request_timeout(method, url)
+            logRequestPayload(payload, url, request_headers, method)
+
+            try:
+                response = await self.http_client.request(method, url, headers=request_headers, json=payload, timeout=timeout)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                delay = self.retry_delay(method, url, request_headers, e, attempt, started)
+                if delay is None:
+                    self.invalidate_cached(method, uri)
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            self.record_success(response)
+            self.invalidate_cached(method, uri)
+            return self.parse_response(response)
+
+    async def post(self, uri, payload, headers: Optional[dict] = None):
+        return await self.request("POST", uri, payload, headers)
+
+    async def get(self, uri, headers: Optional[dict] = None):
+        response = self.cached_response(uri, headers)
+        if response is not MISSING:
+            return response
+        if headers:
+            return await self.request("GET", uri, headers=headers)
+        return await self.single_flight.ado(uri, lambda: self.fetch_and_cache(uri))
+
+    async def fetch_and_cache(self, uri):
+        generation = self.cache_generation(uri)
+        response = await self.request("GET", uri)
+        self.cache_response(uri, None, response, generation)
+        return response
 
-    
-    
+    async def put(self, uri, payload, headers: Optional[dict] = None):
+        return await self.request("PUT", uri, payload, headers)
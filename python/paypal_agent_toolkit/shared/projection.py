@@ -0,0 +1,283 @@
+"""
+Compact projection of tool results before they are handed to the LLM.
+
+PayPal responses carry far more than a model needs: HATEOAS links, nulls,
+every field of every list item. ProjectionOptions (Context.projection) trims
+them per tool:
+
+- `fields`: per-tool allowlists of dotted paths; lists are traversed, so
+  "items.id" keeps the id of every item.
+- `strip_links`: drops `links` arrays except rels worth acting on (the buyer
+  approval link of an order).
+- `prune_nulls`: drops None values and empty containers.
+- `max_items` / `max_bytes`: cut the top-level lists of a response. The rest is
+  kept server-side under a continuation token that the get_more_results tool
+  redeems.
+
+Projection only applies to the text returned by PayPalAPI.run/arun;
+PayPalAPI.execute still returns the full response.
+"""
+
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_LINK_RELS = ("approve", "payer-action")
+
+_ORDER_FIELDS = (
+    "message",
+    "status",
+    "amount",
+    "raw.id",
+    "raw.status",
+    "raw.intent",
+    "raw.create_time",
+    "raw.payer.name",
+    "raw.payer.email_address",
+    "raw.purchase_units.reference_id",
+    "raw.purchase_units.amount",
+    "raw.purchase_units.items.name",
+    "raw.purchase_units.items.quantity",
+    "raw.purchase_units.items.unit_amount",
+    "raw.purchase_units.payments.captures.id",
+    "raw.purchase_units.payments.captures.status",
+    "raw.purchase_units.payments.captures.amount",
+    "raw.links",
+)
+
+DEFAULT_TOOL_FIELDS: Mapping[str, Tuple[str, ...]] = {
+    "pay_order": _ORDER_FIELDS,
+    "get_order_details": _ORDER_FIELDS,
+    "list_transactions": (
+        "found",
+        "message",
+        "total_items",
+        "total_pages",
+        "page",
+        "start_date",
+        "end_date",
+        "transaction_details.transaction_info.transaction_id",
+        "transaction_details.transaction_info.transaction_event_code",
+        "transaction_details.transaction_info.transaction_initiation_date",
+        "transaction_details.transaction_info.transaction_amount",
+        "transaction_details.transaction_info.fee_amount",
+        "transaction_details.transaction_info.transaction_status",
+        "transaction_details.transaction_info.transaction_subject",
+        "transaction_details.transaction_info.invoice_id",
+        "transaction_details.payer_info.email_address",
+        "transaction_details.payer_info.payer_name",
+    ),
+    "list_invoices": (
+        "total_items",
+        "total_pages",
+        "pages_fetched",
+        "has_more",
+        "page",
+        "items.id",
+        "items.status",
+        "items.detail.invoice_number",
+        "items.detail.invoice_date",
+        "items.detail.payment_term",
+        "items.primary_recipients.billing_info.email_address",
+        "items.primary_recipients.billing_info.name",
+        "items.amount",
+        "items.due_amount",
+    ),
+    "list_disputes": (
+        "pages_fetched",
+        "has_more",
+        "next_page_token",
+        "items.dispute_id",
+        "items.reason",
+        "items.status",
+        "items.dispute_state",
+        "items.dispute_amount",
+        "items.dispute_life_cycle_stage",
+        "items.create_time",
+        "items.update_time",
+    ),
+    "get_dispute": (
+        "dispute_id",
+        "reason",
+        "status",
+        "dispute_state",
+        "dispute_amount",
+        "dispute_outcome",
+        "dispute_life_cycle_stage",
+        "dispute_channel",
+        "seller_response_due_date",
+        "create_time",
+        "update_time",
+        "disputed_transactions.seller_transaction_id",
+        "disputed_transactions.buyer_transaction_id",
+        "disputed_transactions.gross_amount",
+        "disputed_transactions.seller.name",
+        "disputed_transactions.buyer.name",
+        "messages.posted_by",
+        "messages.time_posted",
+        "messages.content",
+        "offer",
+    ),
+}
+
+TRUNCATION_KEY = "_truncated"
+
+
+def _compile_fields(paths: Iterable[str]) -> Dict[str, Any]:
+    """Turn dotted paths into a nested dict; a leaf (True) keeps the whole value."""
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = path.split(".")
+        for part in parents:
+            child = node.get(part)
+            if child is True:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[leaf] = True
+    return tree
+
+
+class ProjectionOptions:
+    """How tool results are trimmed; `fields` defaults to DEFAULT_TOOL_FIELDS, pass {} to keep every field."""
+
+    def __init__(
+        self,
+        fields: Optional[Mapping[str, Iterable[str]]] = None,
+        strip_links: bool = True,
+        keep_link_rels: Iterable[str] = DEFAULT_LINK_RELS,
+        prune_nulls: bool = True,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.fields = dict(DEFAULT_TOOL_FIELDS if fields is None else fields)
+        self.strip_links = strip_links
+        self.keep_link_rels = frozenset(keep_link_rels)
+        self.prune_nulls = prune_nulls
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._trees = {method: _compile_fields(paths) for method, paths in self.fields.items()}
+
+    @property
+    def truncates(self) -> bool:
+        return self.max_items is not None or self.max_bytes is not None
+
+    def field_tree(self, method: str) -> Optional[Dict[str, Any]]:
+        return self._trees.get(method)
+
+
+def select_fields(data: Any, tree: Any) -> Any:
+    if tree is True:
+        return data
+    if isinstance(data, list):
+        return [select_fields(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {key: select_fields(data[key], subtree) for key, subtree in tree.items() if key in data}
+    return data
+
+
+def clean(data: Any, options: ProjectionOptions) -> Any:
+    if isinstance(data, dict):
+        cleaned = {}
+        for key, value in data.items():
+            if key == "links" and options.strip_links and isinstance(value, list):
+                value = [link for link in value if isinstance(link, dict) and link.get("rel") in options.keep_link_rels]
+            value = clean(value, options)
+            if options.prune_nulls and (value is None or value == {} or value == []):
+                continue
+            cleaned[key] = value
+        return cleaned
+    if isinstance(data, list):
+        return [clean(item, options) for item in data]
+    return data
+
+
+class ContinuationStore:
+    """Bounded TTL store for the parts of responses cut by max_items/max_bytes."""
+
+    def __init__(self, ttl: float = 900.0, max_entries: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Hashable, Dict[str, List[Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, scope: Hashable, remainder: Dict[str, List[Any]]) -> str:
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self._entries[token] = (self._clock() + self.ttl, scope, remainder)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return token
+
+    def pop(self, scope: Hashable, token: str) -> Optional[Dict[str, List[Any]]]:
+        """The stored remainder for `token`, if it exists, is unexpired and belongs to `scope`."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] != scope:
+                return None
+            del self._entries[token]
+        expires_at, _, remainder = entry
+        return remainder if self._clock() < expires_at else None
+
+
+default_continuation_store = ContinuationStore()
+
+
+def continuation_scope(client) -> tuple:
+    return (client.client_id, client.environment, client.context.merchant_id)
+
+
+def _encoded_size(data: Any) -> int:
+    return len(json.dumps(data).encode("utf-8"))
+
+
+def truncate(data: Dict[str, Any], options: ProjectionOptions) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+    """
+    Cut the top-level lists of `data` to `max_items`, then shrink the longest of
+    them until the encoded response fits in `max_bytes` (one item per list is
+    always kept). Returns the truncated response and the items cut from each list.
+    """
+    kept = {key: len(value) for key, value in data.items() if isinstance(value, list)}
+    if options.max_items is not None:
+        kept = {key: min(count, options.max_items) for key, count in kept.items()}
+
+    def current():
+        return {key: (value[:kept[key]] if key in kept else value) for key, value in data.items()}
+
+    if options.max_bytes is not None:
+        while _encoded_size(current()) > options.max_bytes:
+            shrinkable = [key for key, count in kept.items() if count > 1]
+            if not shrinkable:
+                break
+            longest = max(shrinkable, key=lambda key: kept[key])
+            kept[longest] //= 2
+
+    remainder = {key: data[key][count:] for key, count in kept.items() if count < len(data[key])}
+    return current(), remainder
+
+
+def project(method: str, data: Any, options: ProjectionOptions, scope: Hashable, store: ContinuationStore = default_continuation_store) -> str:
+    """The compact JSON text of a tool result for the LLM."""
+    if isinstance(data, str):
+        return data
+
+    tree = options.field_tree(method)
+    if tree is not None:
+        data = select_fields(data, tree)
+    if options.strip_links or options.prune_nulls:
+        data = clean(data, options)
+
+    if options.truncates and isinstance(data, dict):
+        data, remainder = truncate(data, options)
+        if remainder:
+            data[TRUNCATION_KEY] = {
+                "omitted_items": {key: len(items) for key, items in remainder.items()},
+                "continuation_token": store.put(scope, remainder),
+                "message": "The response was truncated. Call get_more_results with this continuation_token to fetch the omitted items.",
+            }
+    return json.dumps(data)
@@ -0,0 +1,181 @@
+"""
+Client-side rate limiting of PayPal API calls.
+
+A RateLimiter (Context.rate_limiter) holds token buckets: an optional global
+one and one per endpoint family (checkout, reporting, invoicing, ...). Every
+HTTP attempt of the sync and async clients reserves a token from both before
+it is sent; when none is free the request waits for its slot. It only fails,
+with RateLimitExceededError, if that wait would exceed `max_wait`, or with
+DeadlineExceededError if it would outlast the tool call's deadline. Share one
+RateLimiter between the contexts that use the same credentials so they draw
+from the same buckets.
+
+The limiter adapts to PayPal: a 429 pauses the family for the Retry-After
+period and halves its rate; each success then wins back a little of the
+configured rate.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional
+
+from .errors import DeadlineExceededError, RateLimitExceededError
+
+ENDPOINT_FAMILIES = (
+    ("/v2/checkout/", "checkout"),
+    ("/v1/reporting/", "reporting"),
+    ("/v2/invoicing/", "invoicing"),
+    ("/v1/catalogs/", "catalog"),
+    ("/v1/billing/", "billing"),
+    ("/v1/customer/disputes", "disputes"),
+    ("/v1/shipping/", "shipping"),
+)
+
+# Pause applied after a 429 that carries no Retry-After header.
+DEFAULT_THROTTLE_PAUSE = 1.0
+
+
+def endpoint_family(uri: str) -> str:
+    for prefix, family in ENDPOINT_FAMILIES:
+        if uri.startswith(prefix):
+            return family
+    return "other"
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second up to `burst`. Tokens are reserved ahead of time,
+    so the balance goes negative while requests are queued. A bucket without a
+    rate never limits but can still be paused.
+    """
+
+    def __init__(self, rate: Optional[float], burst: Optional[float] = None, min_rate_ratio: float = 0.1):
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 1.0)
+        self.min_rate = rate * min_rate_ratio if rate else None
+        self.tokens = self.burst
+        # Tokens accrue from this instant; it lies in the future while paused.
+        self.updated = 0.0
+
+    def _refill(self, now: float):
+        if self.rate is not None and now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = max(self.updated, now)
+
+    def delay(self, now: float) -> float:
+        """Seconds until the next reservation would be allowed to proceed."""
+        self._refill(now)
+        wait = self.updated - now
+        if self.rate is not None and self.tokens < 1:
+            wait += (1 - self.tokens) / self.rate
+        return max(0.0, wait)
+
+    def reserve(self, now: float):
+        self._refill(now)
+        if self.rate is not None:
+            self.tokens -= 1
+
+    def throttle(self, now: float, pause: float):
+        """PayPal answered 429: stop until `now + pause` and halve the rate."""
+        self._refill(now)
+        self.updated = max(self.updated, now + pause)
+        if self.rate is not None:
+            self.tokens = min(self.tokens, 0.0)
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def recover(self):
+        if self.rate is not None and self.rate < self.configured_rate:
+            self.rate = min(self.configured_rate, self.rate + self.configured_rate / 20)
+
+
+class RateLimiter:
+    """
+    Token buckets shared by every client whose Context references this limiter.
+
+    `rate`/`burst` bound all requests together (None: no global limit);
+    `family_rates` bounds endpoint families, e.g. {"reporting": 2.0}. Families
+    without a configured rate are only paused after a 429. `max_wait` is how
+    long a request may queue for its slot before RateLimitExceededError.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        family_rates: Optional[Mapping[str, float]] = None,
+        max_wait: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_wait = max_wait
+        self._clock = clock
+        self._global = TokenBucket(rate, burst)
+        self._family_rates = dict(family_rates or {})
+        self._families: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._wait_time = 0.0
+        self._rejected = 0
+        self._throttled = 0
+
+    def _family_bucket(self, family: str) -> TokenBucket:
+        bucket = self._families.get(family)
+        if bucket is None:
+            bucket = self._families[family] = TokenBucket(self._family_rates.get(family))
+        return bucket
+
+    def reserve(self, uri: str, time_left: Optional[float] = None) -> float:
+        """
+        Reserve a slot for a request to `uri` and return how long to wait for it.
+        Reserves nothing and raises DeadlineExceededError if the wait would outlast
+        `time_left` (the tool call's remaining deadline), or RateLimitExceededError
+        if it exceeds `max_wait`.
+        """
+        family = endpoint_family(uri)
+        with self._lock:
+            now = self._clock()
+            family_bucket = self._family_bucket(family)
+            wait = max(self._global.delay(now), family_bucket.delay(now))
+            if time_left is not None and wait >= time_left:
+                self._rejected += 1
+                raise DeadlineExceededError(f"The tool call deadline would pass while waiting {wait:.2f}s for the PayPal {family} rate limit.")
+            if wait > self.max_wait:
+                self._rejected += 1
+                raise RateLimitExceededError(family, wait)
+            self._global.reserve(now)
+            family_bucket.reserve(now)
+            if wait > 0:
+                self._queued += 1
+                self._wait_time += wait
+            return wait
+
+    def acquire(self, uri: str, time_left: Optional[float] = None):
+        wait = self.reserve(uri, time_left)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, uri: str, time_left: Optional[float] = None):
+        wait = self.reserve(uri, time_left)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_throttled(self, uri: str, retry_after: Optional[float]):
+        with self._lock:
+            self._throttled += 1
+            pause = retry_after if retry_after is not None else DEFAULT_THROTTLE_PAUSE
+            self._family_bucket(endpoint_family(uri)).throttle(self._clock(), pause)
+
+    def on_success(self, uri: str):
+        with self._lock:
+            self._family_bucket(endpoint_family(uri)).recover()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "wait_time": round(self._wait_time, 3),
+                "rejected": self._rejected,
+                "throttled": self._throttled,
+                "family_rates": {family: bucket.rate for family, bucket in self._families.items() if bucket.rate is not None},
+            }
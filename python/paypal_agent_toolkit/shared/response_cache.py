@@ -0,0 +1,137 @@
+"""
+Read-through cache for PayPal GET responses.
+
+Only single-resource lookups matching a rule in `ttls` are cached (order,
+product, plan, subscription, invoice and dispute details), keyed by
+(client id, environment, merchant, URI). Any non-GET request to a URI under
+the same resource - for example capturing an order or sending an invoice -
+drops the cached copy of that resource, and a GET that was already in flight
+when it did so does not put the old body back.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Pattern, Tuple
+
+from .cache_backend import CacheBackend, MemoryCacheBackend
+
+# (resource pattern, TTL seconds). The first group of the pattern is the resource path.
+DEFAULT_RESPONSE_TTLS: Tuple[Tuple[str, float], ...] = (
+    (r"^(/v2/checkout/orders/[^/?]+)", 30.0),
+    (r"^(/v2/invoicing/invoices/[^/?]+)", 60.0),
+    (r"^(/v1/customer/disputes/[^/?]+)", 60.0),
+    (r"^(/v1/billing/subscriptions/[^/?]+)", 60.0),
+    (r"^(/v1/billing/plans/[^/?]+)", 300.0),
+    (r"^(/v1/catalogs/products/[^/?]+)", 300.0),
+)
+
+MISSING = object()
+
+# Resources whose invalidation generation is remembered; beyond this the whole
+# table is reset under a new epoch.
+MAX_TRACKED_GENERATIONS = 4096
+
+
+class ResponseCache:
+    """
+    TTL cache of parsed JSON responses on top of a CacheBackend (by default an
+    in-process LRU bounded by `max_bytes`). Responses are stored serialized,
+    so every hit returns a fresh copy the caller may mutate, and a shared
+    backend lets several worker processes serve each other's lookups.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 4 * 1024 * 1024,
+        ttls: Iterable[Tuple[str, float]] = DEFAULT_RESPONSE_TTLS,
+        clock: Callable[[], float] = time.monotonic,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.backend = backend if backend is not None else MemoryCacheBackend(max_bytes, clock)
+        self._rules: Tuple[Tuple[Pattern[str], float], ...] = tuple((re.compile(pattern), ttl) for pattern, ttl in ttls)
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._generations: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def _match(self, uri: str) -> Optional[Tuple[str, float]]:
+        for pattern, ttl in self._rules:
+            match = pattern.match(uri)
+            if match:
+                return match.group(1), ttl
+        return None
+
+    def is_cacheable(self, uri: str) -> bool:
+        # Only the resource itself is cached, so invalidating it is a single delete.
+        rule = self._match(uri)
+        return rule is not None and rule[0] == uri and rule[1] > 0
+
+    @staticmethod
+    def _key(scope: Tuple[Any, ...], uri: str) -> str:
+        account = hashlib.sha256(repr(tuple(scope)).encode("utf-8")).hexdigest()[:16]
+        return f"response:{account}:{uri}"
+
+    def get(self, scope: Tuple[Any, ...], uri: str) -> Any:
+        """Return a copy of the cached response for `uri`, or MISSING."""
+        body = self.backend.get(self._key(scope, uri))
+        with self._lock:
+            if body is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return MISSING if body is None else json.loads(body)
+
+    def _generation(self, key: str) -> Tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def generation(self, scope: Tuple[Any, ...], uri: str) -> Tuple[int, int]:
+        """Take before fetching `uri`; `put` skips the response if the resource was invalidated since."""
+        return self._generation(self._key(scope, uri))
+
+    def put(self, scope: Tuple[Any, ...], uri: str, response: Any, generation: Optional[Tuple[int, int]] = None):
+        if not self.is_cacheable(uri):
+            return
+        key = self._key(scope, uri)
+        if generation is not None and self._generation(key) != generation:
+            return
+        self.backend.set(key, json.dumps(response).encode("utf-8"), self._match(uri)[1])
+        # An invalidation that ran during the write bumped the generation before deleting;
+        # drop the stale body it may have missed.
+        if generation is not None and self._generation(key) != generation:
+            self.backend.delete(key)
+
+    def invalidate(self, scope: Tuple[Any, ...], uri: str):
+        """Drop the cached response for the resource that `uri` belongs to."""
+        rule = self._match(uri)
+        if rule is None:
+            return
+        key = self._key(scope, rule[0])
+        with self._lock:
+            if key not in self._generations and len(self._generations) >= MAX_TRACKED_GENERATIONS:
+                self._generations.clear()
+                self._epoch += 1
+            self._generations[key] = self._generations.get(key, 0) + 1
+        if self.backend.delete(key):
+            with self._lock:
+                self._invalidations += 1
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            stats = {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "invalidations": self._invalidations,
+            }
+        stats.update(self.backend.stats())
+        return stats
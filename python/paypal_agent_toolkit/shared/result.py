@@ -0,0 +1,33 @@
+"""
+Structured tool results.
+"""
+
+import json
+from typing import Any, Optional
+
+
+class ToolResult:
+    """
+    What a tool handler returns: `data` is the PayPal response (or the handler's
+    summary of it) as plain Python objects, for programmatic consumers. `text` is
+    the JSON form handed to the LLM; it is serialized on first use and reused,
+    so a result is encoded at most once, at the framework boundary.
+    """
+
+    __slots__ = ("data", "_text")
+
+    def __init__(self, data: Any, text: Optional[str] = None):
+        self.data = data
+        self._text = text
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.data if isinstance(self.data, str) else json.dumps(self.data)
+        return self._text
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"ToolResult({self.data!r})"
@@ -0,0 +1,5 @@
+from pydantic import BaseModel, Field
+
+
+class GetMoreResultsParameters(BaseModel):
+    continuation_token: str = Field(..., description="The continuation_token from the _truncated field of a previous tool response.")
@@ -0,0 +1,8 @@
+GET_MORE_RESULTS_PROMPT = """
+Fetch the items omitted from a truncated tool response.
+
+Use this tool when a previous response contains a "_truncated" field and the user needs the omitted items. Each token can be used once; the response may itself be truncated and carry a new token.
+
+Parameters:
+- continuation_token (str, required): The continuation_token from the "_truncated" field of the previous response.
+"""
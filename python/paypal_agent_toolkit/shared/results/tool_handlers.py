@@ -0,0 +1,16 @@
+from .parameters import GetMoreResultsParameters
+from ..projection import continuation_scope, default_continuation_store
+from ..result import ToolResult
+
+
+def get_more_results(client, params: dict) -> ToolResult:
+    validated = GetMoreResultsParameters(**params)
+    remainder = default_continuation_store.pop(continuation_scope(client), validated.continuation_token)
+    if remainder is None:
+        raise ValueError("The continuation token is unknown or has expired; call the original tool again.")
+    # Returned untrimmed; PayPalAPI.run applies the projection, which truncates again if needed.
+    return ToolResult(remainder)
+
+
+async def aget_more_results(client, params: dict) -> ToolResult:
+    return get_more_results(client, params)
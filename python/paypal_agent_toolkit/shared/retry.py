@@ -0,0 +1,147 @@
+"""
+Retry policy for PayPal HTTP calls: exponential backoff with full jitter,
+Retry-After support and an overall time budget.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+
+import httpx
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+IDEMPOTENCY_HEADER = "PayPal-Request-Id"
+
+# The request never reached PayPal, so these are safe to retry for any method.
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed PayPal call is retried.
+
+    Idempotent methods are retried on transport errors and on the status codes in
+    `retry_status_codes`. POST is only retried when the request carries a
+    PayPal-Request-Id header, which makes PayPal deduplicate the replay.
+    A 401 is retried once, immediately, with a freshly fetched token.
+    Pass a seeded `rng` to make the jitter reproducible.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        total_timeout: float = 30.0,
+        max_retry_after: float = 60.0,
+        retry_status_codes: Iterable[int] = RETRYABLE_STATUS_CODES,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.total_timeout = total_timeout
+        self.max_retry_after = max_retry_after
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.rng = rng if rng is not None else random.Random()
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        return cls(max_attempts=1)
+
+    def is_replayable(self, method: str, headers: Dict[str, str]) -> bool:
+        method = method.upper()
+        return method in IDEMPOTENT_METHODS or (method == "POST" and IDEMPOTENCY_HEADER in headers)
+
+    def backoff(self, attempt: int) -> float:
+        return self.rng.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def next_delay(
+        self,
+        method: str,
+        headers: Dict[str, str],
+        error: httpx.HTTPError,
+        attempt: int,
+        elapsed: float,
+    ) -> Optional[float]:
+        """
+        Seconds to wait before attempt `attempt + 1`, or None to give up and raise `error`.
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        response = getattr(error, "response", None) if isinstance(error, httpx.HTTPStatusError) else None
+        if response is not None:
+            if response.status_code == 401:
+                return 0.0 if attempt == 1 else None
+            if response.status_code not in self.retry_status_codes or not self.is_replayable(method, headers):
+                return None
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = self.backoff(attempt)
+            elif delay > self.max_retry_after:
+                return None
+        elif isinstance(error, NOT_SENT_ERRORS) or (isinstance(error, httpx.TransportError) and self.is_replayable(method, headers)):
+            delay = self.backoff(attempt)
+        else:
+            return None
+
+        if elapsed + delay > self.total_timeout:
+            return None
+        return delay
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryMetrics:
+    """Thread-safe counters describing every attempt a client made."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._attempts = 0
+        self._retries = 0
+        self._failures = 0
+        self._outcomes: Dict[str, int] = {}
+
+    def record_attempt(self, outcome: str, retried: bool, failed: bool):
+        """
+        `outcome` is the status code or exception name of one attempt; a failed
+        attempt that is not retried is surfaced to the caller.
+        """
+        with self._lock:
+            self._attempts += 1
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+            if retried:
+                self._retries += 1
+            elif failed:
+                self._failures += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "attempts": self._attempts,
+                "retries": self._retries,
+                "failures": self._failures,
+                "outcomes": dict(self._outcomes),
+            }
+
+
+def attempt_outcome(response: Optional[httpx.Response], error: Optional[Exception]) -> str:
+    if response is not None:
+        return str(response.status_code)
+    return type(error).__name__
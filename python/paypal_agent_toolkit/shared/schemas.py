@@ -0,0 +1,68 @@
+"""
+JSON schemas of the tool parameter models, generated once per process.
+
+`model_json_schema()` walks the whole pydantic model every time it is called,
+and the toolkits used to call it for every tool on every construction. Schemas
+are now built once per (model, target) and kept as immutable JSON text; each
+caller decodes its own copy (cheaper than a deepcopy), so frameworks that
+mutate the schema they are given cannot corrupt the cache.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Type
+
+from pydantic import BaseModel
+
+# Plain `model_json_schema()` output (OpenAI chat completions, Bedrock).
+SCHEMA_DEFAULT = "default"
+# Cleaned for the OpenAI Agents SDK FunctionTool: closed object, no titles/defaults.
+SCHEMA_OPENAI_AGENTS = "openai-agents"
+
+
+def _openai_agents_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    # Enforce schema constraints
+    schema.update({
+        "additionalProperties": False,
+        "type": "object"
+    })
+
+    # Remove unnecessary metadata
+    for key in ["description", "title"]:
+        schema.pop(key, None)
+
+    # Clean up properties if they exist
+    for prop in schema.get("properties", {}).values():
+        for key in ["title", "default"]:
+            prop.pop(key, None)
+    return schema
+
+
+_TARGETS = {
+    SCHEMA_DEFAULT: lambda schema: schema,
+    SCHEMA_OPENAI_AGENTS: _openai_agents_schema,
+}
+
+
+@lru_cache(maxsize=None)
+def _cached_schema(model: Type[BaseModel], target: str) -> str:
+    if target not in _TARGETS:
+        raise ValueError(f"Unknown schema target: {target}")
+    return json.dumps(_TARGETS[target](model.model_json_schema()))
+
+
+def get_json_schema(model: Type[BaseModel], target: str = SCHEMA_DEFAULT) -> Dict[str, Any]:
+    """A private copy of the JSON schema of `model` for `target`."""
+    return json.loads(_cached_schema(model, target))
+
+
+def precompute_schemas(tool_specs: Iterable[Mapping[str, Any]], targets: Iterable[str] = (SCHEMA_DEFAULT, SCHEMA_OPENAI_AGENTS)):
+    """Build the schemas of every tool up front, e.g. at server start-up."""
+    targets = tuple(targets)
+    for tool in tool_specs:
+        for target in targets:
+            _cached_schema(tool["args_schema"], target)
+
+
+def clear_schema_cache():
+    _cached_schema.cache_clear()
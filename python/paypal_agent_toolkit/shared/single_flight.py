@@ -0,0 +1,95 @@
+"""
+Coalescing of identical concurrent calls.
+
+When several threads (or asyncio tasks) ask for the same key while a call for
+it is already running, they wait for that call instead of starting their own,
+and all of them get its result or its exception. Waiters receive a deep copy
+of the result, so one caller mutating its response cannot affect another.
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .deadline import remaining
+from .errors import DeadlineExceededError
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight group; waiters give up when their tool-call deadline expires."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            if not call.done.wait(remaining()):
+                raise DeadlineExceededError(f"Timed out waiting for in-flight request {key}.")
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of `do`; coalesces tasks running on the same event loop."""
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(key)
+        if task is not None and task.get_loop() is loop and not task.done():
+            with self._lock:
+                self._coalesced += 1
+            try:
+                result = await asyncio.wait_for(asyncio.shield(task), remaining())
+            except asyncio.TimeoutError:
+                if task.done():
+                    raise
+                raise DeadlineExceededError(f"Timed out waiting for in-flight request {key}.")
+            return copy.deepcopy(result)
+
+        with self._lock:
+            self._executed += 1
+        task = self._tasks[key] = loop.create_task(fn())
+        task.add_done_callback(lambda done: self._finish(key, done))
+        # Shielded so a cancelled caller does not abort the request other tasks are awaiting.
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled.
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executed": self._executed, "coalesced": self._coalesced}
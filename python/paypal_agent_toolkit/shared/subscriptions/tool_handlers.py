@@ -1,6 +1,8 @@
 
+from typing import Any, AsyncIterator, Dict, Iterator
 from .parameters import *
-import json
+from ..pagination import acollect_pages, aiter_items, collect_pages, iter_items
+from ..result import ToolResult
 
  
 def create_product(client, params: dict):
@@ -8,15 +10,24 @@ def create_product(client, params: dict):
     validated = CreateProductParameters(**params)
     product_uri = "/v1/catalogs/products"
     result = client.post(uri = product_uri, payload = validated.model_dump())
-    return json.dumps(result)
+    return ToolResult(result)
+
+
+def list_products_uri(validated: ListProductsParameters) -> str:
+    return f"/v1/catalogs/products?page_size={validated.page_size or 10}&page={validated.page or 1}&total_required={validated.total_required or 'true'}"
 
 
 def list_products(client, params: dict):
 
     validated = ListProductsParameters(**params)
-    product_uri = f"/v1/catalogs/products?page_size={validated.page_size or 10}&page={validated.page or 1}&total_required={validated.total_required or 'true'}"
-    result = client.get(uri = product_uri)
-    return json.dumps(result)
+    result = collect_pages(client, list_products_uri(validated), "products", validated.max_items, validated.max_pages)
+    return ToolResult(result)
+
+
+def iter_products(client, params: dict) -> Iterator[Dict[str, Any]]:
+    """Yield the products of every page, prefetching the next page; max_items/max_pages bound the scan."""
+    validated = ListProductsParameters(**params)
+    return iter_items(client, list_products_uri(validated), "products", validated.max_items, validated.max_pages)
 
 
 def show_product_details(client, params: dict):
@@ -24,7 +35,7 @@ def show_product_details(client, params: dict):
     validated = ShowProductDetailsParameters(**params)
     product_uri = f"/v1/catalogs/products/{validated.product_id}"
     result = client.get(uri = product_uri)
-    return json.dumps(result)
+    return ToolResult(result)
 
 
 def create_subscription_plan(client, params: dict):
@@ -32,17 +43,27 @@ def create_subscription_plan(client, params: dict):
     validated = CreateSubscriptionPlanParameters(**params)
     subscription_plan_uri = "/v1/billing/plans"
     result = client.post(uri = subscription_plan_uri, payload = validated.model_dump())
-    return json.dumps(result)
-
+    return ToolResult(result)
 
-def list_subscription_plans(client, params: dict):
 
-    validated = ListSubscriptionPlansParameters(**params)
+def list_subscription_plans_uri(validated: ListSubscriptionPlansParameters) -> str:
     subscription_plan_uri = f"/v1/billing/plans?page_size={validated.page_size or 10}&page={validated.page or 1}&total_required={validated.total_required or True}"
     if validated.product_id:
         subscription_plan_uri += f"&product_id={validated.product_id}"
-    result = client.get(uri = subscription_plan_uri)
-    return json.dumps(result)
+    return subscription_plan_uri
+
+
+def list_subscription_plans(client, params: dict):
+
+    validated = ListSubscriptionPlansParameters(**params)
+    result = collect_pages(client, list_subscription_plans_uri(validated), "plans", validated.max_items, validated.max_pages)
+    return ToolResult(result)
+
+
+def iter_subscription_plans(client, params: dict) -> Iterator[Dict[str, Any]]:
+    """Yield the plans of every page, prefetching the next page; max_items/max_pages bound the scan."""
+    validated = ListSubscriptionPlansParameters(**params)
+    return iter_items(client, list_subscription_plans_uri(validated), "plans", validated.max_items, validated.max_pages)
 
 
 def show_subscription_plan_details(client, params: dict):
@@ -50,7 +71,7 @@ def show_subscription_plan_details(client, params: dict):
     validated = ShowSubscriptionPlanDetailsParameters(**params)
     subscription_plan_uri = f"/v1/billing/plans/{validated.plan_id}"
     result = client.get(uri = subscription_plan_uri)
-    return json.dumps(result)
+    return ToolResult(result)
 
 
 def create_subscription(client, params: dict):
@@ -58,7 +79,7 @@ def create_subscription(client, params: dict):
     validated = CreateSubscriptionParameters(**params)
     subscription_plan_uri = "/v1/billing/subscriptions"
     result = client.post(uri = subscription_plan_uri, payload = validated.model_dump())
-    return json.dumps(result)
+    return ToolResult(result)
 
 
 def show_subscription_details(client, params: dict):
@@ -66,7 +87,7 @@ def show_subscription_details(client, params: dict):
     validated = ShowSubscriptionDetailsParameters(**params)
     subscription_plan_uri = f"/v1/billing/subscriptions/{validated.subscription_id}"
     result = client.get(uri = subscription_plan_uri)
-    return json.dumps(result)
+    return ToolResult(result)
 
 
 def cancel_subscription(client, params: dict):
@@ -75,5 +96,86 @@ def cancel_subscription(client, params: dict):
     subscription_plan_uri = f"/v1/billing/subscriptions/{validated.subscription_id}/cancel"
     result = client.post(uri = subscription_plan_uri, payload = validated.payload.model_dump())
     if not result:
-        return "Successfully cancelled the subscription."
-    return json.dumps(result)
\ No newline at end of file
+        return ToolResult("Successfully cancelled the subscription.")
+    return ToolResult(result)
+
+async def acreate_product(client, params: dict):
+
+    validated = CreateProductParameters(**params)
+    product_uri = "/v1/catalogs/products"
+    result = await client.post(uri = product_uri, payload = validated.model_dump())
+    return ToolResult(result)
+
+
+async def alist_products(client, params: dict):
+
+    validated = ListProductsParameters(**params)
+    result = await acollect_pages(client, list_products_uri(validated), "products", validated.max_items, validated.max_pages)
+    return ToolResult(result)
+
+
+def aiter_products(client, params: dict) -> AsyncIterator[Dict[str, Any]]:
+    validated = ListProductsParameters(**params)
+    return aiter_items(client, list_products_uri(validated), "products", validated.max_items, validated.max_pages)
+
+
+async def ashow_product_details(client, params: dict):
+
+    validated = ShowProductDetailsParameters(**params)
+    product_uri = f"/v1/catalogs/products/{validated.product_id}"
+    result = await client.get(uri = product_uri)
+    return ToolResult(result)
+
+
+async def acreate_subscription_plan(client, params: dict):
+
+    validated = CreateSubscriptionPlanParameters(**params)
+    subscription_plan_uri = "/v1/billing/plans"
+    result = await client.post(uri = subscription_plan_uri, payload = validated.model_dump())
+    return ToolResult(result)
+
+
+async def alist_subscription_plans(client, params: dict):
+
+    validated = ListSubscriptionPlansParameters(**params)
+    result = await acollect_pages(client, list_subscription_plans_uri(validated), "plans", validated.max_items, validated.max_pages)
+    return ToolResult(result)
+
+
+def aiter_subscription_plans(client, params: dict) -> AsyncIterator[Dict[str, Any]]:
+    validated = ListSubscriptionPlansParameters(**params)
+    return aiter_items(client, list_subscription_plans_uri(validated), "plans", validated.max_items, validated.max_pages)
+
+
+async def ashow_subscription_plan_details(client, params: dict):
+
+    validated = ShowSubscriptionPlanDetailsParameters(**params)
+    subscription_plan_uri = f"/v1/billing/plans/{validated.plan_id}"
+    result = await client.get(uri = subscription_plan_uri)
+    return ToolResult(result)
+
+
+async def acreate_subscription(client, params: dict):
+
+    validated = CreateSubscriptionParameters(**params)
+    subscription_plan_uri = "/v1/billing/subscriptions"
+    result = await client.post(uri = subscription_plan_uri, payload = validated.model_dump())
+    return ToolResult(result)
+
+
+async def ashow_subscription_details(client, params: dict):
+
+    validated = ShowSubscriptionDetailsParameters(**params)
+    subscription_plan_uri = f"/v1/billing/subscriptions/{validated.subscription_id}"
+    result = await client.get(uri = subscription_plan_uri)
+    return ToolResult(result)
+
+
+async def acancel_subscription(client, params: dict):
+
+    validated = CancelSubscriptionParameters(**params)
+    subscription_plan_uri = f"/v1/billing/subscriptions/{validated.subscription_id}/cancel"
+    result = await client.post(uri = subscription_plan_uri, payload = validated.payload.model_dump())
+    if not result:
+        return ToolResult("Successfully cancelled the subscription.")
+    return ToolResult(result)
@@ -1,6 +1,7 @@
 import logging
 import platform
 import sys
+from functools import lru_cache
 from importlib.metadata import version, PackageNotFoundError
 
 
@@ -8,7 +9,11 @@ class Telemetry:
     SDK_NAME = "Paypal Agent Toolkit Python"
     PACKAGE_NAME = "paypal-agent-toolkit"
 
+    # The SDK version and host details cannot change during the life of the
+    # process, so each is computed once; the User-Agent is cached per source.
+
     @classmethod
+    @lru_cache(maxsize=None)
     def get_sdk_version(cls) -> str:
         try:
             return version(cls.PACKAGE_NAME)
@@ -16,18 +21,24 @@ class Telemetry:
             return "unknown"
 
     @classmethod
-    def get_env_info(cls) -> dict:
-        return {
+    @lru_cache(maxsize=None)
+    def _get_env_info(cls) -> tuple:
+        return tuple({
             "os": platform.system(),
             "os_version": platform.version(),
             "python_version": sys.version.split()[0],
             "platform": platform.platform(),
             "machine": platform.machine(),
             "hostname": platform.node()
-        }
+        }.items())
+
+    @classmethod
+    def get_env_info(cls) -> dict:
+        return dict(cls._get_env_info())
 
 
     @classmethod
+    @lru_cache(maxsize=64)
     def generate_user_agent(cls, source: str) -> str:
         components = [
             f"{cls.SDK_NAME}: {source}",
@@ -35,7 +46,13 @@ class Telemetry:
             f"on OS: {platform.system()} {platform.release()}"
         ]
         return ", ".join(filter(None, components))
-    
+
+    @classmethod
+    def clear_cache(cls):
+        cls.get_sdk_version.cache_clear()
+        cls._get_env_info.cache_clear()
+        cls.generate_user_agent.cache_clear()
+
 
     @classmethod
     def log(cls):
@@ -44,4 +61,4 @@ class Telemetry:
             "sdk_version": cls.get_sdk_version(),
             **cls.get_env_info()
         }
-        logging.debug("Telemetry Info:", telemetry_data) 
+        logging.debug("Telemetry Info: %s", telemetry_data)
@@ -0,0 +1,226 @@
+"""
+Process-wide cache of PayPal OAuth access tokens.
+
+Tokens are keyed by (client_id, environment, hash of the secret) so every
+PayPalClient built for the same credentials reuses one token until shortly
+before it expires, while a client with a different secret never does. With a
+shared CacheBackend, worker processes also reuse each other's tokens instead
+of each fetching its own.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .cache_backend import CacheBackend
+
+# Refresh this many seconds before PayPal's reported expiry.
+DEFAULT_REFRESH_MARGIN = 300.0
+
+
+class AccessToken:
+    def __init__(self, value: str, expires_in: float, refresh_margin: float, now: float):
+        self.value = value
+        self.expires_at = now + expires_in
+        # Never spend more than half of a short-lived token's lifetime in the refresh window.
+        self.refresh_at = self.expires_at - min(refresh_margin, expires_in / 2)
+
+
+class TokenCache:
+    """
+    Thread-safe access token cache with single-flight refresh.
+
+    - A missing or expired token blocks callers for the same key on one fetch.
+    - A token inside its refresh window is refreshed by the first caller that
+      notices; concurrent callers keep using the still-valid token meanwhile.
+    """
+
+    def __init__(
+        self,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        clock: Callable[[], float] = time.monotonic,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+        self.backend = backend
+        self._tokens: Dict[Hashable, AccessToken] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._shared_hits = 0
+
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _store(self, key: Hashable, value: str, expires_in: float) -> AccessToken:
+        token = AccessToken(value, expires_in, self.refresh_margin, self._clock())
+        self._tokens[key] = token
+        return token
+
+    @staticmethod
+    def _backend_key(key: Hashable) -> str:
+        return "token:" + hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+    def _load_shared(self, key: Hashable) -> Optional[Tuple[str, float]]:
+        """A token another process stored in the backend, if it is not yet due for refresh."""
+        data = self.backend.get(self._backend_key(key))
+        if data is None:
+            return None
+        try:
+            record = json.loads(data)
+            expires_in = record["expires_at"] - time.time()
+            value = record["access_token"]
+        except (ValueError, KeyError, TypeError):
+            return None
+        if expires_in - min(self.refresh_margin, expires_in / 2) <= 0:
+            return None
+        self._count("_shared_hits")
+        return value, expires_in
+
+    def _save_shared(self, key: Hashable, value: str, expires_in: float):
+        # The backend lives across processes, so the expiry is stored as wall-clock time.
+        record = json.dumps({"access_token": value, "expires_at": time.time() + expires_in})
+        self.backend.set(self._backend_key(key), record.encode("utf-8"), expires_in)
+
+    def _fetch_through_backend(self, key: Hashable, fetch: Callable[[], Tuple[str, float]]) -> Tuple[str, float]:
+        if self.backend is None:
+            return fetch()
+        shared = self._load_shared(key)
+        if shared is not None:
+            return shared
+        value, expires_in = fetch()
+        self._save_shared(key, value, expires_in)
+        return value, expires_in
+
+    def get(self, key: Hashable, fetch: Callable[[], Tuple[str, float]]) -> str:
+        """
+        Return a valid token for `key`, calling `fetch()` -> (access_token, expires_in)
+        only when the cached token is missing, expired or due for refresh.
+        """
+        token = self._tokens.get(key)
+        now = self._clock()
+
+        if token is not None and now < token.expires_at:
+            if now < token.refresh_at:
+                self._count("_hits")
+                return token.value
+            lock = self._key_lock(key)
+            if not lock.acquire(blocking=False):
+                # Another caller is already refreshing; the current token is still valid.
+                self._count("_hits")
+                return token.value
+            try:
+                if self._tokens.get(key) is token:
+                    self._count("_refreshes")
+                    try:
+                        token = self._store(key, *self._fetch_through_backend(key, fetch))
+                    except Exception as e:
+                        # The early refresh failed but the cached token has not expired yet.
+                        logging.warning("Access token refresh failed, using the cached token until it expires: %s", e)
+                else:
+                    self._count("_hits")
+                    token = self._tokens[key]
+                return token.value
+            finally:
+                lock.release()
+
+        with self._key_lock(key):
+            # Re-check: a concurrent caller may have fetched while we waited.
+            token = self._tokens.get(key)
+            if token is not None and self._clock() < token.expires_at:
+                self._count("_hits")
+                return token.value
+            self._count("_misses" if token is None else "_refreshes")
+            return self._store(key, *self._fetch_through_backend(key, fetch)).value
+
+    async def aget(self, key: Hashable, fetch: Callable[[], Awaitable[Tuple[str, float]]]) -> str:
+        """
+        Async counterpart of `get`: concurrent tasks on the same event loop share
+        a single in-flight `fetch()` for `key`.
+        """
+        token = self._tokens.get(key)
+        now = self._clock()
+        valid = token is not None and now < token.expires_at
+        if valid and now < token.refresh_at:
+            self._count("_hits")
+            return token.value
+
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is loop:
+            self._count("_hits")
+            if valid:
+                return token.value
+            return await asyncio.shield(task)
+
+        self._count("_misses" if token is None else "_refreshes")
+        task = self._inflight[key] = loop.create_task(self._afetch(key, fetch))
+        try:
+            # Shielded so a cancelled caller does not abort the fetch other tasks are awaiting.
+            return await asyncio.shield(task)
+        except Exception as e:
+            if not valid or self._clock() >= token.expires_at:
+                raise
+            logging.warning("Access token refresh failed, using the cached token until it expires: %s", e)
+            return token.value
+
+    async def _afetch(self, key: Hashable, fetch: Callable[[], Awaitable[Tuple[str, float]]]) -> str:
+        try:
+            shared = self._load_shared(key) if self.backend is not None else None
+            if shared is None:
+                shared = await fetch()
+                if self.backend is not None:
+                    self._save_shared(key, *shared)
+            return self._store(key, *shared).value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def _shared_value(self, key: Hashable) -> Optional[str]:
+        data = self.backend.get(self._backend_key(key))
+        try:
+            return json.loads(data)["access_token"] if data is not None else None
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def invalidate(self, key: Hashable, value: Optional[str] = None):
+        """Drop the token for `key` (only if it still equals `value`, when given)."""
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is not None and (value is None or token.value == value):
+                del self._tokens[key]
+        if self.backend is not None and (value is None or self._shared_value(key) == value):
+            self.backend.delete(self._backend_key(key))
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "refreshes": self._refreshes,
+                "shared_hits": self._shared_hits,
+                "cached_tokens": len(self._tokens),
+            }
+
+
+default_token_cache = TokenCache()
@@ -1,365 +1,410 @@
-from ..shared.orders.prompts import (
-    CREATE_ORDER_PROMPT,
-    CAPTURE_ORDER_PROMPT,
-    GET_ORDER_PROMPT,
-)
-from ..shared.subscriptions.prompts import (
-    CREATE_PRODUCT_PROMPT,
-    LIST_PRODUCTS_PROMPT,
-    SHOW_PRODUCT_DETAILS_PROMPT,
-    CREATE_SUBSCRIPTION_PLAN_PROMPT,
-    LIST_SUBSCRIPTION_PLANS_PROMPT,
-    SHOW_SUBSCRIPTION_PLAN_DETAILS_PROMPT,
-    CREATE_SUBSCRIPTION_PROMPT,
-    SHOW_SUBSCRIPTION_DETAILS_PROMPT,
-    CANCEL_SUBSCRIPTION_PROMPT,
-)
-
-from ..shared.invoices.prompts import (
-    CREATE_INVOICE_PROMPT,
-    LIST_INVOICE_PROMPT,
-    GET_INVOICE_PROMPT,
-    SEND_INVOICE_PROMPT,
-    SEND_INVOICE_REMINDER_PROMPT,
-    CANCEL_SENT_INVOICE_PROMPT,
-    GENERATE_INVOICE_QRCODE_PROMPT,
-)
-
-from ..shared.disputes.prompts import (
-    LIST_DISPUTES_PROMPT,
-    GET_DISPUTE_PROMPT,
-    ACCEPT_DISPUTE_CLAIM_PROMPT,
-)
-
-from ..shared.tracking.prompts import (
-    CREATE_SHIPMENT_PROMPT,
-    GET_SHIPMENT_TRACKING_PROMPT,
-    UPDATE_SHIPMENT_TRACKING_PROMPT,
-)
-
-from ..shared.transactions.prompt import (
-    LIST_TRANSACTIONS_PROMPT
-)
-
-from ..shared.insights.prompts import (
-    GET_MERCHANT_INSIGHTS_PROMPT
-)
-
-from ..shared.orders.parameters import (
-    
-    CreateOrderParameters,
-    OrderIdParameters,
-)
-
-from ..shared.subscriptions.parameters import (
-    
-    CreateProductParameters,
-    ListProductsParameters,
-    ShowProductDetailsParameters,
-    CreateSubscriptionPlanParameters,
-    ListSubscriptionPlansParameters,
-    ShowSubscriptionPlanDetailsParameters,
-    CreateSubscriptionParameters,
-    ShowSubscriptionDetailsParameters,
-    CancelSubscriptionParameters,
-)
-
-from ..shared.invoices.parameters import (
-    CreateInvoiceParameters,
-    SendInvoiceParameters,
-    ListInvoicesParameters,
-    GetInvoiceParameters,
-    SendInvoiceReminderParameters,
-    CancelSentInvoiceParameters,
-    GenerateInvoiceQrCodeParameters,
-)
-
-from ..shared.disputes.parameters import (
-   ListDisputesParameters,
-   GetDisputeParameters,
-   AcceptDisputeClaimParameters,
-)
-
-from ..shared.tracking.parameters import (
-    CreateShipmentParameters,
-    GetShipmentTrackingParameters,
-    UpdateShipmentTrackingParameters
-)
-
-from ..shared.transactions.parameters import (
-    ListTransactionsParameters
-)
-
-from ..shared.insights.parameters import (
-    GetMerchantInsightsParameters
-)
-
-from ..shared.orders.tool_handlers import (
-    create_order,
-    capture_order,
-    get_order_details,
-)
-
-from ..shared.subscriptions.tool_handlers import (
-    create_product,
-    list_products,
-    show_product_details,
-    create_subscription_plan,
-    list_subscription_plans,
-    show_subscription_plan_details,
-    create_subscription,
-    show_subscription_details,
-    cancel_subscription,
-)
-
-from ..shared.invoices.tool_handlers import (
-    create_invoice,
-    send_invoice,
-    list_invoices,
-    get_invoice,
-    send_invoice_reminder,
-    cancel_sent_invoice,
-    generate_invoice_qrcode
-)
-
-
-from ..shared.disputes.tool_handlers import (
-    list_disputes,
-    get_dispute,
-    accept_dispute_claim
-)
-
-from ..shared.tracking.tool_handlers import (
-    create_shipment_tracking,
-    get_shipment_tracking,
-    update_shipment_tracking
-)
-
-from ..shared.transactions.tool_handlers import (
-    list_transactions
-)
-
-from ..shared.insights.tool_handlers import (
-    get_merchant_insights
-)
-
-from pydantic import BaseModel
-
-tools = [
+"""
+Registry of the tools exposed to agent frameworks.
+
+Specs only name their prompt, parameter model and handlers; the product
+modules behind them (and their pydantic models) are imported the first time a
+spec's value is read. Toolkits only read the tools enabled by
+`Configuration.actions`, so a server that enables the orders tools never
+imports the invoices, disputes, ... modules.
+"""
+
+import importlib
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, Mapping, Optional, Tuple
+from .configuration import Configuration
+
+
+class _Lazy:
+    """`attribute` of the product module `module` (relative to this package), imported on first use."""
+
+    __slots__ = ("module", "attribute", "transform")
+
+    def __init__(self, module: str, attribute: str, transform: Optional[Callable[[Any], Any]] = None):
+        self.module = module
+        self.attribute = attribute
+        self.transform = transform
+
+    def resolve(self) -> Any:
+        value = getattr(importlib.import_module(f"{__package__}.{self.module}"), self.attribute)
+        return self.transform(value) if self.transform is not None else value
+
+    def __repr__(self) -> str:
+        return f"<lazy {self.module}.{self.attribute}>"
+
+
+class LazyToolSpec(Mapping):
+    """Read-only tool spec whose lazy values are resolved (and kept) on first access."""
+
+    def __init__(self, spec: Mapping[str, Any]):
+        self._spec = dict(spec)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._spec[key]
+        if isinstance(value, _Lazy):
+            value = self._spec[key] = value.resolve()
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._spec
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._spec)
+
+    def __len__(self) -> int:
+        return len(self._spec)
+
+    def __repr__(self) -> str:
+        return f"LazyToolSpec({self._spec!r})"
+
+
+_tool_specs = [
     {
         "method": "create_order",
         "name": "Create PayPal Order",
-        "description": CREATE_ORDER_PROMPT.strip(),
-        "args_schema": CreateOrderParameters,
+        "description": _Lazy("orders.prompts", "CREATE_ORDER_PROMPT", str.strip),
+        "args_schema": _Lazy("orders.parameters", "CreateOrderParameters"),
         "actions": {"orders": {"create": True}},
-        "execute": create_order,
+        "execute": _Lazy("orders.tool_handlers", "create_order"),
+        "execute_async": _Lazy("orders.tool_handlers", "acreate_order"),
+        "idempotent": True,
     },
     {
         "method": "pay_order",
         "name": "Process payment for PayPal Order",
-        "description": CAPTURE_ORDER_PROMPT.strip(),
-        "args_schema": OrderIdParameters,
+        "description": _Lazy("orders.prompts", "CAPTURE_ORDER_PROMPT", str.strip),
+        "args_schema": _Lazy("orders.parameters", "OrderIdParameters"),
         "actions": {"orders": {"capture": True}},
-        "execute": capture_order,
+        "execute": _Lazy("orders.tool_handlers", "capture_order"),
+        "execute_async": _Lazy("orders.tool_handlers", "acapture_order"),
+        "idempotent": True,
     },
     {
         "method": "get_order_details",
         "name": "Get PayPal Order Details",
-        "description": GET_ORDER_PROMPT.strip(),
-        "args_schema": OrderIdParameters,
+        "description": _Lazy("orders.prompts", "GET_ORDER_PROMPT", str.strip),
+        "args_schema": _Lazy("orders.parameters", "OrderIdParameters"),
         "actions": {"orders": {"get": True}},
-        "execute": get_order_details,
+        "execute": _Lazy("orders.tool_handlers", "get_order_details"),
+        "execute_async": _Lazy("orders.tool_handlers", "aget_order_details"),
     },
     {
         "method": "create_product",
         "name": "Create PayPal Product",
-        "description": CREATE_PRODUCT_PROMPT.strip(),
-        "args_schema": CreateProductParameters,
+        "description": _Lazy("subscriptions.prompts", "CREATE_PRODUCT_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "CreateProductParameters"),
         "actions": {"products": {"create": True}},
-        "execute": create_product,
+        "execute": _Lazy("subscriptions.tool_handlers", "create_product"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "acreate_product"),
+        "idempotent": True,
     },
     {
         "method": "list_products",
         "name": "List PayPal Products",
-        "description": LIST_PRODUCTS_PROMPT.strip(),
-        "args_schema": ListProductsParameters,
+        "description": _Lazy("subscriptions.prompts", "LIST_PRODUCTS_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "ListProductsParameters"),
         "actions": {"products": {"list": True}},
-        "execute": list_products,
+        "execute": _Lazy("subscriptions.tool_handlers", "list_products"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "alist_products"),
+        "iterate": _Lazy("subscriptions.tool_handlers", "iter_products"),
+        "iterate_async": _Lazy("subscriptions.tool_handlers", "aiter_products"),
     },
     {
         "method": "show_product_details",
         "name": "Show PayPal Product Details",
-        "description": SHOW_PRODUCT_DETAILS_PROMPT.strip(),
-        "args_schema": ShowProductDetailsParameters,
+        "description": _Lazy("subscriptions.prompts", "SHOW_PRODUCT_DETAILS_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "ShowProductDetailsParameters"),
         "actions": {"products": {"show": True}},
-        "execute": show_product_details,
+        "execute": _Lazy("subscriptions.tool_handlers", "show_product_details"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "ashow_product_details"),
     },
     {
         "method": "create_subscription_plan",
         "name": "Create PayPal Subscription Plan",
-        "description": CREATE_SUBSCRIPTION_PLAN_PROMPT.strip(),
-        "args_schema": CreateSubscriptionPlanParameters,
+        "description": _Lazy("subscriptions.prompts", "CREATE_SUBSCRIPTION_PLAN_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "CreateSubscriptionPlanParameters"),
         "actions": {"subscriptionPlans": {"create": True}},
-        "execute": create_subscription_plan,
+        "execute": _Lazy("subscriptions.tool_handlers", "create_subscription_plan"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "acreate_subscription_plan"),
+        "idempotent": True,
     },
     {
         "method": "list_subscription_plans",
         "name": "List PayPal Subscription Plans",
-        "description": LIST_SUBSCRIPTION_PLANS_PROMPT.strip(),
-        "args_schema": ListSubscriptionPlansParameters,
+        "description": _Lazy("subscriptions.prompts", "LIST_SUBSCRIPTION_PLANS_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "ListSubscriptionPlansParameters"),
         "actions": {"subscriptionPlans": {"list": True}},
-        "execute": list_subscription_plans,
+        "execute": _Lazy("subscriptions.tool_handlers", "list_subscription_plans"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "alist_subscription_plans"),
+        "iterate": _Lazy("subscriptions.tool_handlers", "iter_subscription_plans"),
+        "iterate_async": _Lazy("subscriptions.tool_handlers", "aiter_subscription_plans"),
     },
     {
         "method": "show_subscription_plan_details",
         "name": "List PayPal Subscription Plan Details",
-        "description": SHOW_SUBSCRIPTION_PLAN_DETAILS_PROMPT.strip(),
-        "args_schema": ShowSubscriptionPlanDetailsParameters,
+        "description": _Lazy("subscriptions.prompts", "SHOW_SUBSCRIPTION_PLAN_DETAILS_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "ShowSubscriptionPlanDetailsParameters"),
         "actions": {"subscriptionPlans": {"show": True}},
-        "execute": show_subscription_plan_details,
+        "execute": _Lazy("subscriptions.tool_handlers", "show_subscription_plan_details"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "ashow_subscription_plan_details"),
     },
     {
         "method": "create_subscription",
         "name": "Create PayPal Subscription",
-        "description": CREATE_SUBSCRIPTION_PROMPT.strip(),
-        "args_schema": CreateSubscriptionParameters,
+        "description": _Lazy("subscriptions.prompts", "CREATE_SUBSCRIPTION_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "CreateSubscriptionParameters"),
         "actions": {"subscriptions": {"create": True}},
-        "execute": create_subscription,
+        "execute": _Lazy("subscriptions.tool_handlers", "create_subscription"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "acreate_subscription"),
+        "idempotent": True,
     },
     {
         "method": "show_subscription_details",
         "name": "Show PayPal Subscription Details",
-        "description": SHOW_SUBSCRIPTION_DETAILS_PROMPT.strip(),
-        "args_schema": ShowSubscriptionDetailsParameters,
+        "description": _Lazy("subscriptions.prompts", "SHOW_SUBSCRIPTION_DETAILS_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "ShowSubscriptionDetailsParameters"),
         "actions": {"subscriptions": {"show": True}},
-        "execute": show_subscription_details,
+        "execute": _Lazy("subscriptions.tool_handlers", "show_subscription_details"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "ashow_subscription_details"),
     },
     {
         "method": "cancel_subscription",
         "name": "Cancel PayPal Subscription",
-        "description": CANCEL_SUBSCRIPTION_PROMPT.strip(),
-        "args_schema": CancelSubscriptionParameters,
+        "description": _Lazy("subscriptions.prompts", "CANCEL_SUBSCRIPTION_PROMPT", str.strip),
+        "args_schema": _Lazy("subscriptions.parameters", "CancelSubscriptionParameters"),
         "actions": {"subscriptions": {"cancel": True}},
-        "execute": cancel_subscription,
+        "execute": _Lazy("subscriptions.tool_handlers", "cancel_subscription"),
+        "execute_async": _Lazy("subscriptions.tool_handlers", "acancel_subscription"),
     },
     {
         "method": "create_invoice",
         "name": "Create PayPal Invoice",
-        "description": CREATE_INVOICE_PROMPT.strip(),
-        "args_schema": CreateInvoiceParameters,
+        "description": _Lazy("invoices.prompts", "CREATE_INVOICE_PROMPT", str.strip),
+        "args_schema": _Lazy("invoices.parameters", "CreateInvoiceParameters"),
         "actions": {"invoices": {"create": True}},
-        "execute": create_invoice,
+        "execute": _Lazy("invoices.tool_handlers", "create_invoice"),
+        "execute_async": _Lazy("invoices.tool_handlers", "acreate_invoice"),
+        "idempotent": True,
     },
     {
         "method": "list_invoices",
         "name": "List Invoices",
-        "description": LIST_INVOICE_PROMPT.strip(),
-        "args_schema": ListInvoicesParameters,
+        "description": _Lazy("invoices.prompts", "LIST_INVOICE_PROMPT", str.strip),
+        "args_schema": _Lazy("invoices.parameters", "ListInvoicesParameters"),
         "actions": {"invoices": {"list": True}},
-        "execute": list_invoices,
+        "execute": _Lazy("invoices.tool_handlers", "list_invoices"),
+        "execute_async": _Lazy("invoices.tool_handlers", "alist_invoices"),
+        "iterate": _Lazy("invoices.tool_handlers", "iter_invoices"),
+        "iterate_async": _Lazy("invoices.tool_handlers", "aiter_invoices"),
     },
     {
         "method": "get_invoice",
         "name": "Get Invoice",
-        "description": GET_INVOICE_PROMPT.strip(),
-        "args_schema": GetInvoiceParameters,
+        "description": _Lazy("invoices.prompts", "GET_INVOICE_PROMPT", str.strip),
+        "args_schema": _Lazy("invoices.parameters", "GetInvoiceParameters"),
         "actions": {"invoices": {"get": True}},
-        "execute": get_invoice,
+        "execute": _Lazy("invoices.tool_handlers", "get_invoice"),
+        "execute_async": _Lazy("invoices.tool_handlers", "aget_invoice"),
     },
     {
         "method": "send_invoice",
         "name": "Send Invoice",
-        "description": SEND_INVOICE_PROMPT.strip(),
-        "args_schema": SendInvoiceParameters,
+        "description": _Lazy("invoices.prompts", "SEND_INVOICE_PROMPT", str.strip),
+        "args_schema": _Lazy("invoices.parameters", "SendInvoiceParameters"),
         "actions": {"invoices": {"send": True}},
-        "execute": send_invoice,
+        "execute": _Lazy("invoices.tool_handlers", "send_invoice"),
+        "execute_async": _Lazy("invoices.tool_handlers", "asend_invoice"),
     },
     {
         "method": "send_invoice_reminder",
         "name": "Send Invoice Reminder",
-        "description": SEND_INVOICE_REMINDER_PROMPT.strip(),
-        "args_schema": SendInvoiceReminderParameters,
+        "description": _Lazy("invoices.prompts", "SEND_INVOICE_REMINDER_PROMPT", str.strip),
+        "args_schema": _Lazy("invoices.parameters", "SendInvoiceReminderParameters"),
         "actions": {"invoices": {"sendReminder": True}},
-        "execute": send_invoice_reminder,
+        "execute": _Lazy("invoices.tool_handlers", "send_invoice_reminder"),
+        "execute_async": _Lazy("invoices.tool_handlers", "asend_invoice_reminder"),
     },
     {
         "method": "cancel_sent_invoice",
         "name": "Cancel Sent Invoice",
-        "description": CANCEL_SENT_INVOICE_PROMPT.strip(),
-        "args_schema": CancelSentInvoiceParameters,
+        "description": _Lazy("invoices.prompts", "CANCEL_SENT_INVOICE_PROMPT", str.strip),
+        "args_schema": _Lazy("invoices.parameters", "CancelSentInvoiceParameters"),
         "actions": {"invoices": {"cancel": True}},
-        "execute": cancel_sent_invoice,
+        "execute": _Lazy("invoices.tool_handlers", "cancel_sent_invoice"),
+        "execute_async": _Lazy("invoices.tool_handlers", "acancel_sent_invoice"),
     },
     {
         "method": "generate_invoice_qr_code",
         "name": "Generate Invoice QR Code",
-        "description": GENERATE_INVOICE_QRCODE_PROMPT.strip(),
-        "args_schema": GenerateInvoiceQrCodeParameters,
+        "description": _Lazy("invoices.prompts", "GENERATE_INVOICE_QRCODE_PROMPT", str.strip),
+        "args_schema": _Lazy("invoices.parameters", "GenerateInvoiceQrCodeParameters"),
         "actions": {"invoices": {"generateQRC": True}},
-        "execute": generate_invoice_qrcode,
+        "execute": _Lazy("invoices.tool_handlers", "generate_invoice_qrcode"),
+        "execute_async": _Lazy("invoices.tool_handlers", "agenerate_invoice_qrcode"),
     },
     {
         "method": "list_disputes",
         "name": "List Disputes",
-        "description": LIST_DISPUTES_PROMPT.strip(),
-        "args_schema": ListDisputesParameters,
+        "description": _Lazy("disputes.prompts", "LIST_DISPUTES_PROMPT", str.strip),
+        "args_schema": _Lazy("disputes.parameters", "ListDisputesParameters"),
         "actions": {"disputes": {"list": True}},
-        "execute": list_disputes,
+        "execute": _Lazy("disputes.tool_handlers", "list_disputes"),
+        "execute_async": _Lazy("disputes.tool_handlers", "alist_disputes"),
+        "iterate": _Lazy("disputes.tool_handlers", "iter_disputes"),
+        "iterate_async": _Lazy("disputes.tool_handlers", "aiter_disputes"),
     },
     {
         "method": "get_dispute",
         "name": "Get Dispute",
-        "description": GET_DISPUTE_PROMPT.strip(),
-        "args_schema": GetDisputeParameters,
+        "description": _Lazy("disputes.prompts", "GET_DISPUTE_PROMPT", str.strip),
+        "args_schema": _Lazy("disputes.parameters", "GetDisputeParameters"),
         "actions": {"disputes": {"get": True}},
-        "execute": get_dispute,
+        "execute": _Lazy("disputes.tool_handlers", "get_dispute"),
+        "execute_async": _Lazy("disputes.tool_handlers", "aget_dispute"),
     },
     {
         "method": "accept_dispute_claim",
         "name": "Accept Dispute Claim",
-        "description": ACCEPT_DISPUTE_CLAIM_PROMPT.strip(),
-        "args_schema": AcceptDisputeClaimParameters,
+        "description": _Lazy("disputes.prompts", "ACCEPT_DISPUTE_CLAIM_PROMPT", str.strip),
+        "args_schema": _Lazy("disputes.parameters", "AcceptDisputeClaimParameters"),
         "actions": {"disputes": {"create": True}},
-        "execute": accept_dispute_claim,
+        "execute": _Lazy("disputes.tool_handlers", "accept_dispute_claim"),
+        "execute_async": _Lazy("disputes.tool_handlers", "aaccept_dispute_claim"),
     },
     {
         "method": "create_shipment_tracking",
         "name": "Create Shipment",
-        "description": CREATE_SHIPMENT_PROMPT.strip(),
-        "args_schema": CreateShipmentParameters,
+        "description": _Lazy("tracking.prompts", "CREATE_SHIPMENT_PROMPT", str.strip),
+        "args_schema": _Lazy("tracking.parameters", "CreateShipmentParameters"),
         "actions": {"shipment": {"create": True}},
-        "execute": create_shipment_tracking,
+        "execute": _Lazy("tracking.tool_handlers", "create_shipment_tracking"),
+        "execute_async": _Lazy("tracking.tool_handlers", "acreate_shipment_tracking"),
+        "idempotent": True,
+    },
+    {
+        "method": "create_shipment_tracking_batch",
+        "name": "Create Shipment Tracking Batch",
+        "description": _Lazy("tracking.prompts", "CREATE_SHIPMENT_BATCH_PROMPT", str.strip),
+        "args_schema": _Lazy("tracking.parameters", "CreateShipmentBatchParameters"),
+        "actions": {"shipment": {"createBatch": True}},
+        "execute": _Lazy("tracking.batch", "create_shipment_tracking_batch"),
+        "execute_async": _Lazy("tracking.batch", "acreate_shipment_tracking_batch"),
+        "idempotent": True,
     },
     {
         "method": "get_shipment_tracking",
         "name": "Get Shipment Tracking",
-        "description": GET_SHIPMENT_TRACKING_PROMPT.strip(),
-        "args_schema": GetShipmentTrackingParameters,
+        "description": _Lazy("tracking.prompts", "GET_SHIPMENT_TRACKING_PROMPT", str.strip),
+        "args_schema": _Lazy("tracking.parameters", "GetShipmentTrackingParameters"),
         "actions": {"shipment": {"get": True}},
-        "execute": get_shipment_tracking,
+        "execute": _Lazy("tracking.tool_handlers", "get_shipment_tracking"),
+        "execute_async": _Lazy("tracking.tool_handlers", "aget_shipment_tracking"),
     },
     {
         "method": "update_shipment_tracking",
         "name": "Update Shipment Tracking",
-        "description": UPDATE_SHIPMENT_TRACKING_PROMPT.strip(),
-        "args_schema": UpdateShipmentTrackingParameters,
+        "description": _Lazy("tracking.prompts", "UPDATE_SHIPMENT_TRACKING_PROMPT", str.strip),
+        "args_schema": _Lazy("tracking.parameters", "UpdateShipmentTrackingParameters"),
         "actions": {"shipment": {"update": True}},
-        "execute": update_shipment_tracking,
+        "execute": _Lazy("tracking.tool_handlers", "update_shipment_tracking"),
+        "execute_async": _Lazy("tracking.tool_handlers", "aupdate_shipment_tracking"),
     },
     {
         "method": "list_transactions",
         "name": "List Transactions",
-        "description": LIST_TRANSACTIONS_PROMPT.strip(),
-        "args_schema": ListTransactionsParameters,
+        "description": _Lazy("transactions.prompt", "LIST_TRANSACTIONS_PROMPT", str.strip),
+        "args_schema": _Lazy("transactions.parameters", "ListTransactionsParameters"),
         "actions": {"transactions": {"list": True}},
-        "execute": list_transactions,
+        "execute": _Lazy("transactions.tool_handlers", "list_transactions"),
+        "execute_async": _Lazy("transactions.tool_handlers", "alist_transactions"),
+        "iterate": _Lazy("transactions.tool_handlers", "iter_transactions"),
+        "iterate_async": _Lazy("transactions.tool_handlers", "aiter_transactions"),
     },
     {
         "method": "get_merchant_insights",
         "name": "Get Merchant Insights",
-        "description": GET_MERCHANT_INSIGHTS_PROMPT.strip(),
-        "args_schema": GetMerchantInsightsParameters,
+        "description": _Lazy("insights.prompts", "GET_MERCHANT_INSIGHTS_PROMPT", str.strip),
+        "args_schema": _Lazy("insights.parameters", "GetMerchantInsightsParameters"),
         "actions": {"insights": {"get": True}},
-        "execute": get_merchant_insights,
+        "execute": _Lazy("insights.tool_handlers", "get_merchant_insights"),
+        "execute_async": _Lazy("insights.tool_handlers", "aget_merchant_insights"),
+    },
+    {
+        # Not tied to an action: offered whenever Context.projection can truncate responses.
+        "method": "get_more_results",
+        "name": "Get More Results",
+        "description": _Lazy("results.prompts", "GET_MORE_RESULTS_PROMPT", str.strip),
+        "args_schema": _Lazy("results.parameters", "GetMoreResultsParameters"),
+        "actions": {},
+        "execute": _Lazy("results.tool_handlers", "get_more_results"),
+        "execute_async": _Lazy("results.tool_handlers", "aget_more_results"),
     }
 ]
+
+tools = [LazyToolSpec(spec) for spec in _tool_specs]
+
+
+ToolSpec = Mapping[str, object]
+
+
+def _build_registry(tool_specs):
+    """
+    Index the tool specs by method and by (product, action), rejecting duplicates.
+    Runs once at import time without resolving any lazy value; the resulting
+    mappings are read-only.
+    """
+    by_method = {}
+    by_action = {}
+    for tool in tool_specs:
+        method = tool.get("method")
+        if not method or "execute" not in tool:
+            raise ValueError(f"tool spec {tool.get('name')!r} must define 'method' and 'execute'")
+        if method in by_method:
+            raise ValueError(f"duplicate tool method: {method}")
+        spec = by_method[method] = tool if isinstance(tool, LazyToolSpec) else LazyToolSpec(tool)
+        for product, product_actions in tool.get("actions", {}).items():
+            for action in product_actions:
+                by_action.setdefault((product, action), []).append(spec)
+
+    return (
+        MappingProxyType(by_method),
+        MappingProxyType({key: tuple(specs) for key, specs in by_action.items()}),
+    )
+
+
+TOOLS_BY_METHOD, TOOLS_BY_ACTION = _build_registry(tools)
+_TOOL_ORDER = {method: index for index, method in enumerate(TOOLS_BY_METHOD)}
+
+
+def get_tool(method: str) -> Optional[ToolSpec]:
+    return TOOLS_BY_METHOD.get(method)
+
+
+@lru_cache(maxsize=256)
+def _allowed_tools(enabled_actions: Tuple[Tuple[str, str], ...], continuation: bool = False) -> Tuple[ToolSpec, ...]:
+    allowed = {}
+    for key in enabled_actions:
+        for spec in TOOLS_BY_ACTION.get(key, ()):
+            allowed[spec["method"]] = spec
+    if continuation and allowed:
+        allowed["get_more_results"] = TOOLS_BY_METHOD["get_more_results"]
+    return tuple(sorted(allowed.values(), key=lambda spec: _TOOL_ORDER[spec["method"]]))
+
+
+def get_allowed_tools(configuration: Optional[Configuration]) -> Tuple[ToolSpec, ...]:
+    """
+    Tools enabled by `configuration.actions`, in registry order.
+    Equivalent to filtering `tools` with `is_tool_allowed`, but memoized per action set.
+    get_more_results is added when the context's projection may truncate responses.
+    """
+    if configuration is None:
+        return ()
+    enabled_actions = tuple(sorted(
+        (product, action)
+        for product, product_actions in configuration.actions.items()
+        for action, allowed in product_actions.items()
+        if allowed
+    ))
+    context = configuration.context
+    projection = context.projection if context is not None else None
+    return _allowed_tools(enabled_actions, projection is not None and projection.truncates)
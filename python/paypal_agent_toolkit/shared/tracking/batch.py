@@ -0,0 +1,205 @@
+"""
+Batched shipment tracking uploads through /v1/shipping/trackers-batch.
+
+`create_shipment_trackers` splits any number of CreateShipmentParameters into
+chunks of at most MAX_TRACKERS_PER_BATCH trackers, posts the chunks
+concurrently and maps the batch responses back to the inputs: a tracker is
+created when it appears in the response's `tracker_identifiers`; otherwise it
+failed, with the batch error whose details point at it (or the chunk's errors).
+
+Every chunk carries its own PayPal-Request-Id, derived from its trackers (and
+from the calling tool's idempotency key, if any), so a retried chunk is
+deduplicated while different chunks are never mistaken for replays.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..idempotency import canonicalize, current_idempotency_key, idempotency_scope
+from ..result import ToolResult
+from .parameters import CreateShipmentBatchParameters, CreateShipmentParameters
+from .tool_handlers import trackers_batch_payload
+
+TRACKERS_BATCH_URI = "/v1/shipping/trackers-batch"
+# Largest number of trackers the trackers-batch endpoint accepts per request.
+MAX_TRACKERS_PER_BATCH = 20
+DEFAULT_BATCH_CONCURRENCY = 4
+
+_TRACKER_INDEX = re.compile(r"/trackers/(\d+)")
+
+ShipmentInput = Union[CreateShipmentParameters, Dict[str, Any]]
+
+
+class TrackerOutcome:
+    """Result of one input tracker: created, or failed with `error` (a message)."""
+
+    def __init__(self, index: int, transaction_id: Optional[str], tracking_number: Optional[str], error: Optional[str] = None):
+        self.index = index
+        self.transaction_id = transaction_id
+        self.tracking_number = tracking_number
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        outcome = {"transaction_id": self.transaction_id, "tracking_number": self.tracking_number, "status": "CREATED" if self.ok else "FAILED"}
+        if not self.ok:
+            outcome["error"] = self.error
+        return outcome
+
+    def __repr__(self) -> str:
+        if self.ok:
+            return f"TrackerOutcome({self.index}, {self.transaction_id!r}, {self.tracking_number!r})"
+        return f"TrackerOutcome({self.index}, {self.transaction_id!r}, {self.tracking_number!r}, error={self.error!r})"
+
+
+def _validate(shipments: Iterable[ShipmentInput]) -> List[Tuple[int, Optional[CreateShipmentParameters], Optional[str]]]:
+    validated = []
+    for index, shipment in enumerate(shipments):
+        try:
+            validated.append((index, shipment if isinstance(shipment, CreateShipmentParameters) else CreateShipmentParameters(**shipment), None))
+        except Exception as e:
+            validated.append((index, None, str(e)))
+    return validated
+
+
+def _chunk_key(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(canonicalize([current_idempotency_key(), "trackers-batch", payload]).encode("utf-8")).hexdigest()
+
+
+def _chunk_payload(chunk: List[CreateShipmentParameters]) -> Dict[str, Any]:
+    return {"trackers": [tracker for shipment in chunk for tracker in trackers_batch_payload(shipment)["trackers"]]}
+
+
+def _error_message(error: Dict[str, Any]) -> str:
+    issues = [detail.get("description") or detail.get("issue") for detail in error.get("details") or [] if isinstance(detail, dict)]
+    return "; ".join(filter(None, [error.get("message") or error.get("name")] + issues)) or "tracker was not created"
+
+
+def map_batch_response(indexes: List[int], chunk: List[CreateShipmentParameters], response: Dict[str, Any]) -> List[TrackerOutcome]:
+    """Outcomes of the trackers of one chunk, from its trackers-batch response."""
+    created = {
+        (identifier.get("transaction_id"), identifier.get("tracking_number"))
+        for identifier in response.get("tracker_identifiers") or []
+    }
+    by_position: Dict[int, str] = {}
+    unplaced = []
+    for error in response.get("errors") or []:
+        positions = {
+            int(match.group(1))
+            for detail in error.get("details") or [] if isinstance(detail, dict)
+            for match in [_TRACKER_INDEX.search(str(detail.get("field", "")))] if match
+        }
+        for position in positions:
+            by_position[position] = _error_message(error)
+        if not positions:
+            unplaced.append(_error_message(error))
+
+    outcomes = []
+    for position, (index, shipment) in enumerate(zip(indexes, chunk)):
+        if (shipment.transaction_id, shipment.tracking_number) in created:
+            error = None
+        else:
+            error = by_position.get(position) or "; ".join(unplaced) or "tracker was not created"
+        outcomes.append(TrackerOutcome(index, shipment.transaction_id, shipment.tracking_number, error))
+    return outcomes
+
+
+def _chunks(validated, chunk_size: int):
+    valid = [(index, shipment) for index, shipment, _ in validated if shipment is not None]
+    size = max(1, min(chunk_size, MAX_TRACKERS_PER_BATCH))
+    for start in range(0, len(valid), size):
+        part = valid[start:start + size]
+        yield [index for index, _ in part], [shipment for _, shipment in part]
+
+
+def _failed_chunk(indexes, chunk, error: Exception) -> List[TrackerOutcome]:
+    return [TrackerOutcome(index, shipment.transaction_id, shipment.tracking_number, str(error)) for index, shipment in zip(indexes, chunk)]
+
+
+def _send_chunk(client, indexes, chunk) -> List[TrackerOutcome]:
+    payload = _chunk_payload(chunk)
+    try:
+        with idempotency_scope(_chunk_key(payload)):
+            response = client.post(uri=TRACKERS_BATCH_URI, payload=payload)
+    except Exception as e:
+        return _failed_chunk(indexes, chunk, e)
+    return map_batch_response(indexes, chunk, response or {})
+
+
+async def _asend_chunk(client, indexes, chunk) -> List[TrackerOutcome]:
+    payload = _chunk_payload(chunk)
+    try:
+        with idempotency_scope(_chunk_key(payload)):
+            response = await client.post(uri=TRACKERS_BATCH_URI, payload=payload)
+    except Exception as e:
+        return _failed_chunk(indexes, chunk, e)
+    return map_batch_response(indexes, chunk, response or {})
+
+
+def _merge(validated, chunk_outcomes: Iterable[List[TrackerOutcome]]) -> List[TrackerOutcome]:
+    outcomes = [TrackerOutcome(index, None, None, error) for index, shipment, error in validated if shipment is None]
+    for chunk in chunk_outcomes:
+        outcomes.extend(chunk)
+    return sorted(outcomes, key=lambda outcome: outcome.index)
+
+
+def create_shipment_trackers(
+    client,
+    shipments: Iterable[ShipmentInput],
+    chunk_size: int = MAX_TRACKERS_PER_BATCH,
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> List[TrackerOutcome]:
+    """Add tracking numbers in batches; one outcome per input, in input order."""
+    validated = _validate(shipments)
+    chunks = list(_chunks(validated, chunk_size))
+    if not chunks:
+        return _merge(validated, [])
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as pool:
+        # Copy the context so each worker sees the caller's deadline and idempotency key.
+        futures = [pool.submit(contextvars.copy_context().run, _send_chunk, client, indexes, chunk) for indexes, chunk in chunks]
+        return _merge(validated, [future.result() for future in futures])
+
+
+async def acreate_shipment_trackers(
+    client,
+    shipments: Iterable[ShipmentInput],
+    chunk_size: int = MAX_TRACKERS_PER_BATCH,
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+) -> List[TrackerOutcome]:
+    validated = _validate(shipments)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def send(indexes, chunk):
+        async with semaphore:
+            return await _asend_chunk(client, indexes, chunk)
+
+    return _merge(validated, await asyncio.gather(*(send(indexes, chunk) for indexes, chunk in _chunks(validated, chunk_size))))
+
+
+def batch_result(outcomes: List[TrackerOutcome]) -> ToolResult:
+    created = sum(1 for outcome in outcomes if outcome.ok)
+    return ToolResult({
+        "created": created,
+        "failed": len(outcomes) - created,
+        "results": [outcome.to_dict() for outcome in outcomes],
+    })
+
+
+def create_shipment_tracking_batch(client, params: dict) -> ToolResult:
+    """
+    Create many shipment tracking entries in one tool call.
+    """
+    validated = CreateShipmentBatchParameters(**params)
+    return batch_result(create_shipment_trackers(client, validated.shipments))
+
+
+async def acreate_shipment_tracking_batch(client, params: dict) -> ToolResult:
+    validated = CreateShipmentBatchParameters(**params)
+    return batch_result(await acreate_shipment_trackers(client, validated.shipments))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from ..regex import ORDER_ID_REGEX, TRANSACTION_ID_REGEX
 
 class CreateShipmentParameters(BaseModel):
@@ -27,6 +27,15 @@ class CreateShipmentParameters(BaseModel):
     )
 
 
+class CreateShipmentBatchParameters(BaseModel):
+    shipments: List[CreateShipmentParameters] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="The shipments to add tracking for. They are uploaded in batches of 20."
+    )
+
+
 class GetShipmentTrackingParameters(BaseModel):
     order_id: Optional[str] = Field(
         default=None,
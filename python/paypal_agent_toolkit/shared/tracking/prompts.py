@@ -13,6 +13,20 @@ Below is the payload request structure:
 }
 """
 
+CREATE_SHIPMENT_BATCH_PROMPT = """
+Create shipment tracking for many transactions in one call.
+Use this instead of calling the create shipment tool repeatedly when there are several tracking numbers to add.
+Each shipment takes the same fields as a single shipment: tracking_number and transaction_id (required), status and carrier (optional).
+The result lists, for every shipment in the order given, whether it was CREATED or FAILED and why.
+Below is the payload request structure:
+{
+    "shipments": [
+        {"tracking_number": "1234567890", "transaction_id": "9XJ12345ABC67890", "status": "SHIPPED", "carrier": "UPS"},
+        {"tracking_number": "0987654321", "transaction_id": "8AB12345CDE67890", "status": "SHIPPED", "carrier": "FEDEX"}
+    ]
+}
+"""
+
 GET_SHIPMENT_TRACKING_PROMPT = """
 Get tracking information for a shipment by ID.
 This function retrieves tracking information for a specific shipment using the transaction ID and tracking number.
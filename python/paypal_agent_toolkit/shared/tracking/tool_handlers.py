@@ -1,18 +1,12 @@
 
-import json
 from typing import Dict, Any
 from .parameters import CreateShipmentParameters, GetShipmentTrackingParameters, UpdateShipmentTrackingParameters
+from ..result import ToolResult
 
 
-def create_shipment_tracking(client, params: dict) -> Dict[str, Any]:
-    """
-    Create a shipment tracking entry.
-    """
-    validated = CreateShipmentParameters(**params)
-    uri = "/v1/shipping/trackers-batch"
-   
+def trackers_batch_payload(validated: CreateShipmentParameters) -> Dict[str, Any]:
     # Prepare trackers data - wrapping single shipment in an array
-    trackers_data = {
+    return {
         "trackers": [{
             "tracking_number": validated.tracking_number,
             "transaction_id": validated.transaction_id,
@@ -20,12 +14,56 @@ def create_shipment_tracking(client, params: dict) -> Dict[str, Any]:
             "carrier": validated.carrier
         }]
     }
-    response = client.post(uri=uri, payload=trackers_data)
-    return json.dumps(response)
 
 
+def capture_transaction_id(order_details: Dict[str, Any]) -> str:
+    """
+    Extract the capture (transaction) id from an order's first purchase unit.
+    """
+    try:
+        if order_details and "purchase_units" in order_details and len(order_details["purchase_units"]) > 0:
+            purchase_unit = order_details["purchase_units"][0]
+
+            if "payments" in purchase_unit and "captures" in purchase_unit["payments"] and len(purchase_unit["payments"]["captures"]) > 0:
+                capture_details = purchase_unit["payments"]["captures"][0]
+                return capture_details["id"]
+            else:
+                raise ValueError("Could not find capture id in the purchase unit details.")
+        else:
+            raise ValueError("Could not find purchase unit details in order details.")
+    except Exception as error:
+        raise ValueError(f"Error extracting transaction_id from order details: {str(error)}")
+
+
+def update_shipment_request(validated: UpdateShipmentTrackingParameters):
+    update_data = {
+        "transaction_id": validated.transaction_id,
+        "status": validated.status
+    }
+
+    if hasattr(validated, "carrier") and validated.carrier:
+        update_data["carrier"] = validated.carrier
+
+    if hasattr(validated, "tracking_number") and validated.new_tracking_number:
+        update_data["tracking_number"] = validated.new_tracking_number
+
+    id = f"{validated.transaction_id}-{validated.tracking_number}"
+    uri = f"/v1/shipping/trackers/{id}"
+    return uri, update_data
+
 
-def get_shipment_tracking(client, params: dict) -> Dict[str, Any]:
+def create_shipment_tracking(client, params: dict) -> ToolResult:
+    """
+    Create a shipment tracking entry.
+    """
+    validated = CreateShipmentParameters(**params)
+    uri = "/v1/shipping/trackers-batch"
+    response = client.post(uri=uri, payload=trackers_batch_payload(validated))
+    return ToolResult(response)
+
+
+
+def get_shipment_tracking(client, params: dict) -> ToolResult:
     """
     Retrieve shipment tracking information.
     """
@@ -35,47 +73,65 @@ def get_shipment_tracking(client, params: dict) -> Dict[str, Any]:
     # Check if order_id is provided and transaction_id is not
     if validated.order_id and not transaction_id:
         try:
-            order_details = client.get_order_details(order_id=validated.order_id)
-
-            if order_details and "purchase_units" in order_details and len(order_details["purchase_units"]) > 0:
-                purchase_unit = order_details["purchase_units"][0]
-
-                if "payments" in purchase_unit and "captures" in purchase_unit["payments"] and len(purchase_unit["payments"]["captures"]) > 0:
-                    capture_details = purchase_unit["payments"]["captures"][0]
-                    transaction_id = capture_details["id"]
-                else:
-                    raise ValueError("Could not find capture id in the purchase unit details.")
-            else:
-                raise ValueError("Could not find purchase unit details in order details.")
+            order_details = client.get(uri=f"/v2/checkout/orders/{validated.order_id}")
         except Exception as error:
             raise ValueError(f"Error extracting transaction_id from order details: {str(error)}")
+        transaction_id = capture_transaction_id(order_details)
 
     if not transaction_id:
         raise ValueError("Either transaction_id or order_id must be provided.")
 
     uri = f"/v1/shipping/trackers?transaction_id={transaction_id}"
     response = client.get(uri=uri)
-    return json.dumps(response)
+    return ToolResult(response)
 
-def update_shipment_tracking(client, params: dict) -> Dict[str, any]:
+def update_shipment_tracking(client, params: dict) -> ToolResult:
     """
     Update shipment tracking information
     """
     validated = UpdateShipmentTrackingParameters(**params)
-    update_data = {
-        "transaction_id": validated.transaction_id,
-        "status": validated.status
-    }
+    uri, update_data = update_shipment_request(validated)
+    response = client.put(uri=uri, payload=update_data)
+    return ToolResult(response)
 
-    if hasattr(validated, "carrier") and validated.carrier:
-        update_data["carrier"] = validated.carrier
-    
-    if hasattr(validated, "tracking_number") and validated.new_tracking_number:
-        update_data["tracking_number"] = validated.new_tracking_number
 
-    id = f"{validated.transaction_id}-{validated.tracking_number}"
-    uri = f"/v1/shipping/trackers/{id}"
-    response = client.put(uri=uri, payload=update_data)
-    return json.dumps(response)
+async def acreate_shipment_tracking(client, params: dict) -> ToolResult:
+    """
+    Create a shipment tracking entry.
+    """
+    validated = CreateShipmentParameters(**params)
+    uri = "/v1/shipping/trackers-batch"
+    response = await client.post(uri=uri, payload=trackers_batch_payload(validated))
+    return ToolResult(response)
 
-    
+
+async def aget_shipment_tracking(client, params: dict) -> ToolResult:
+    """
+    Retrieve shipment tracking information.
+    """
+    validated = GetShipmentTrackingParameters(**params)
+    transaction_id = validated.transaction_id
+
+    if validated.order_id and not transaction_id:
+        try:
+            order_details = await client.get(uri=f"/v2/checkout/orders/{validated.order_id}")
+        except Exception as error:
+            raise ValueError(f"Error extracting transaction_id from order details: {str(error)}")
+        transaction_id = capture_transaction_id(order_details)
+
+    if not transaction_id:
+        raise ValueError("Either transaction_id or order_id must be provided.")
+
+    uri = f"/v1/shipping/trackers?transaction_id={transaction_id}"
+    response = await client.get(uri=uri)
+    return ToolResult(response)
+
+
+async def aupdate_shipment_tracking(client, params: dict) -> ToolResult:
+    """
+    Update shipment tracking information
+    """
+    validated = UpdateShipmentTrackingParameters(**params)
+    uri, update_data = update_shipment_request(validated)
+    response = await client.put(uri=uri, payload=update_data)
+    return ToolResult(response)
@@ -1,12 +1,227 @@
-import json
-from datetime import datetime, timedelta
-from typing import Dict, Any
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
 from urllib.parse import urlencode
 from .parameters import ListTransactionsParameters
+from ..errors import CircuitOpenError, DeadlineExceededError
+from ..result import ToolResult
 
+# Upper bound on reporting API calls in flight for one transaction ID search.
+MAX_SEARCH_WORKERS = 4
+# The reporting API rejects ranges longer than 31 days.
+MAX_WINDOW_DAYS = 31
 
 
-def list_transactions(client, params: dict) -> Dict[str, Any]:
+def search_windows(search_months: int) -> List[Tuple[datetime, datetime]]:
+    """31-day (start, end) windows walking back from now, newest first."""
+    windows = []
+    end_date = datetime.utcnow()
+    for _ in range(search_months):
+        start_date = end_date - timedelta(days=31)
+        windows.append((start_date, end_date))
+        end_date = start_date
+    return windows
+
+
+def split_date_range(start_date: datetime, end_date: datetime) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [start_date, end_date] into consecutive windows of at most MAX_WINDOW_DAYS,
+    oldest first. Windows are inclusive at second precision and do not overlap.
+    """
+    windows = []
+    window_start = start_date.replace(microsecond=0)
+    end_date = end_date.replace(microsecond=0)
+    while window_start <= end_date:
+        window_end = min(window_start + timedelta(days=MAX_WINDOW_DAYS) - timedelta(seconds=1), end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(seconds=1)
+    return windows
+
+
+def parse_date(value: str) -> datetime:
+    """Naive UTC datetime for an ISO 8601 date: offsets are converted, naive dates are taken as UTC."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def window_uri(validated: ListTransactionsParameters, start_date: datetime, end_date: datetime, page: int = 1) -> str:
+    query_params = validated.dict(exclude={"search_months"}, exclude_none=True)
+    query_params["end_date"] = end_date.isoformat() + "Z"
+    query_params["start_date"] = start_date.isoformat() + "Z"
+    query_params["page"] = page
+    return "/v1/reporting/transactions?" + urlencode(query_params)
+
+
+def has_next_page(response_data: Dict[str, Any], page: int) -> bool:
+    return page < (response_data.get("total_pages") or 1)
+
+
+def find_transaction(response_data: Dict[str, Any], transaction_id: str) -> Optional[Dict[str, Any]]:
+    for transaction in response_data.get("transaction_details") or []:
+        if transaction["transaction_info"]["transaction_id"] == transaction_id:
+            return {
+                "found": True,
+                "transaction_details": [transaction],
+                "total_items": 1
+            }
+    return None
+
+
+def transaction_not_found(transaction_id: str, search_months: int) -> Dict[str, Any]:
+    return {
+        "found": False,
+        "transaction_details": [],
+        "total_items": 0,
+        "message": f"The transaction ID {transaction_id} was not found in the last {search_months} months."
+    }
+
+
+def search_window(client, validated: ListTransactionsParameters, window: Tuple[datetime, datetime], stop: threading.Event) -> Optional[Dict[str, Any]]:
+    """Scan every page of one window for the transaction; gives up early once `stop` is set."""
+    page = 1
+    while not stop.is_set():
+        response_data = client.get(uri=window_uri(validated, *window, page=page))
+        found = find_transaction(response_data, validated.transaction_id)
+        if found or not has_next_page(response_data, page):
+            return found
+        page += 1
+    return None
+
+
+async def asearch_window(client, validated: ListTransactionsParameters, window: Tuple[datetime, datetime], semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+    page = 1
+    while True:
+        async with semaphore:
+            response_data = await client.get(uri=window_uri(validated, *window, page=page))
+        found = find_transaction(response_data, validated.transaction_id)
+        if found or not has_next_page(response_data, page):
+            return found
+        page += 1
+
+
+def search_transaction(client, validated: ListTransactionsParameters) -> Dict[str, Any]:
+    """
+    Search the last `search_months` windows concurrently and return as soon as
+    any window contains the transaction; pending windows are cancelled.
+    """
+    search_months = validated.search_months or 12
+    windows = search_windows(search_months)
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(windows)) or 1)
+    try:
+        futures = {
+            # Copy the context so each worker sees the caller's tool-call deadline.
+            pool.submit(contextvars.copy_context().run, search_window, client, validated, window, stop): month
+            for month, window in enumerate(windows)
+        }
+        for future in as_completed(futures):
+            try:
+                found = future.result()
+            except (DeadlineExceededError, CircuitOpenError):
+                raise
+            except Exception as error:
+                # Log and continue with the remaining months
+                logging.warning("Error searching transactions for month %d: %s", futures[future] + 1, error)
+                continue
+            if found:
+                return found
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # If transaction not found after searching all months
+    return transaction_not_found(validated.transaction_id, search_months)
+
+
+async def asearch_transaction(client, validated: ListTransactionsParameters) -> Dict[str, Any]:
+    search_months = validated.search_months or 12
+    semaphore = asyncio.Semaphore(MAX_SEARCH_WORKERS)
+    tasks = {
+        asyncio.ensure_future(asearch_window(client, validated, window, semaphore)): month
+        for month, window in enumerate(search_windows(search_months))
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if isinstance(task.exception(), (DeadlineExceededError, CircuitOpenError)):
+                    raise task.exception()
+                if task.exception() is not None:
+                    logging.warning("Error searching transactions for month %d: %s", tasks[task] + 1, task.exception())
+                elif task.result():
+                    return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    return transaction_not_found(validated.transaction_id, search_months)
+
+
+def listing_uri(validated: ListTransactionsParameters) -> str:
+    query_params = validated.dict(exclude={"search_months"})
+
+    if not query_params.get("end_date") and not query_params.get("start_date"):
+        query_params["end_date"] = datetime.utcnow().isoformat() + "Z"
+        query_params["start_date"] = (datetime.utcnow() - timedelta(days=31)).isoformat() + "Z"
+    elif not query_params.get("end_date"):
+        start_date = parse_date(query_params["start_date"])
+        query_params["end_date"] = (start_date + timedelta(days=31)).isoformat() + "Z"
+    elif not query_params.get("start_date"):
+        end_date = parse_date(query_params["end_date"])
+        query_params["start_date"] = (end_date - timedelta(days=31)).isoformat() + "Z"
+    else:
+        start_date = parse_date(query_params["start_date"])
+        end_date = parse_date(query_params["end_date"])
+        day_range = (end_date - start_date).days
+
+        if day_range > 31:
+            query_params["start_date"] = (end_date - timedelta(days=31)).isoformat() + "Z"
+
+    query_string = urlencode(query_params)
+    return f"/v1/reporting/transactions?" + query_string
+
+
+def iter_transactions(client, params: dict) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every transaction between `start_date` and `end_date`, one at a time.
+
+    Unlike `list_transactions`, the range may be longer than 31 days: it is split
+    into consecutive windows and each window is paged through in turn, so only
+    one page of results is held in memory at a time.
+    """
+    validated = ListTransactionsParameters(**params)
+    for window in split_date_range(parse_date(validated.start_date), parse_date(validated.end_date)):
+        page = 1
+        while True:
+            response_data = client.get(uri=window_uri(validated, *window, page=page))
+            yield from response_data.get("transaction_details") or []
+            if not has_next_page(response_data, page):
+                break
+            page += 1
+
+
+async def aiter_transactions(client, params: dict) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of `iter_transactions` for use with AsyncPayPalClient."""
+    validated = ListTransactionsParameters(**params)
+    for window in split_date_range(parse_date(validated.start_date), parse_date(validated.end_date)):
+        page = 1
+        while True:
+            response_data = await client.get(uri=window_uri(validated, *window, page=page))
+            for transaction in response_data.get("transaction_details") or []:
+                yield transaction
+            if not has_next_page(response_data, page):
+                break
+            page += 1
+
+
+def list_transactions(client, params: dict) -> ToolResult:
     """
     List transactions or search for a specific transaction by ID.
     """
@@ -14,70 +229,23 @@ def list_transactions(client, params: dict) -> Dict[str, Any]:
 
     # If searching for a specific transaction by ID
     if validated.transaction_id:
-        search_months = validated.search_months or 12
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=31)
-
-        for month in range(search_months):
-            query_params = validated.dict(exclude={"search_months"})
-            query_params["end_date"] = end_date.isoformat() + "Z"
-            query_params["start_date"] = start_date.isoformat() + "Z"
-
-            uri = f"/v1/reporting/transactions"
-            try:
-                response = client.get(uri=uri, payload=query_params)
-                response_data = json.loads(response)
-
-                if response_data.get("transaction_details"):
-                    for transaction in response_data["transaction_details"]:
-                        if transaction["transaction_info"]["transaction_id"] == validated.transaction_id:
-                            return {
-                                "found": True,
-                                "transaction_details": [transaction],
-                                "total_items": 1
-                            }
-
-                # Move back one month for the next search
-                end_date = start_date
-                start_date = start_date - timedelta(days=31)
-
-            except Exception as error:
-                # Log and continue to the next month
-                print(f"Error searching transactions for month {month + 1}: {str(error)}")
-
-        # If transaction not found after searching all months
-        return {
-            "found": False,
-            "transaction_details": [],
-            "total_items": 0,
-            "message": f"The transaction ID {validated.transaction_id} was not found in the last {search_months} months."
-        }
+        return ToolResult(search_transaction(client, validated))
 
     else:
         # Listing transactions without a specific ID
-        query_params = validated.dict(exclude={"search_months"})
-
-        if not query_params.get("end_date") and not query_params.get("start_date"):
-            query_params["end_date"] = datetime.utcnow().isoformat() + "Z"
-            query_params["start_date"] = (datetime.utcnow() - timedelta(days=31)).isoformat() + "Z"
-        elif not query_params.get("end_date"):
-            start_date = datetime.fromisoformat(query_params["start_date"].replace("Z", ""))
-            query_params["end_date"] = (start_date + timedelta(days=31)).isoformat() + "Z"
-        elif not query_params.get("start_date"):
-            end_date = datetime.fromisoformat(query_params["end_date"].replace("Z", ""))
-            query_params["start_date"] = (end_date - timedelta(days=31)).isoformat() + "Z"
-        else:
-            start_date = datetime.fromisoformat(query_params["start_date"].replace("Z", ""))
-            end_date = datetime.fromisoformat(query_params["end_date"].replace("Z", ""))
-            day_range = (end_date - start_date).days
-
-            if day_range > 31:
-                query_params["start_date"] = (end_date - timedelta(days=31)).isoformat() + "Z"
+        response = client.get(uri=listing_uri(validated))
+        return ToolResult(response)
 
-        query_string = urlencode(query_params)
-        uri = f"/v1/reporting/transactions?" + query_string
 
-        response = client.get(uri=uri)
-        return json.dumps(response)
+async def alist_transactions(client, params: dict) -> ToolResult:
+    """
+    List transactions or search for a specific transaction by ID.
+    """
+    validated = ListTransactionsParameters(**params)
 
+    if validated.transaction_id:
+        return ToolResult(await asearch_transaction(client, validated))
 
+    else:
+        response = await client.get(uri=listing_uri(validated))
+        return ToolResult(response)
@@ -0,0 +1,42 @@
+"""
+Connection pool settings for the HTTP transport used by PayPalClient.
+"""
+
+import httpx
+
+
+class TransportOptions:
+    """
+    Pooling and keep-alive settings for the PayPal HTTP client.
+
+    PayPalClient only ever talks to a single PayPal host, so `max_connections`
+    is effectively the per-host connection limit.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        # Requires the `h2` package (pip install "httpx[http2]").
+        self.http2 = http2
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+def create_http_client(options: TransportOptions) -> httpx.Client:
+    return httpx.Client(limits=options.limits(), http2=options.http2)
+
+
+def create_async_http_client(options: TransportOptions) -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=options.limits(), http2=options.http2)
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import paypal_agent_toolkit.shared.paypal_client as paypal_client
+from paypal_agent_toolkit.shared.api import PayPalAPI
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.errors import DeadlineExceededError
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+
+class PayPalStub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply({"access_token": "token", "expires_in": 3600})
+
+    def do_GET(self):
+        order_id = self.path.rsplit("/", 1)[-1]
+        self._reply({"id": order_id, "status": "COMPLETED"})
+
+    def log_message(self, *args):
+        pass
+
+
+class SlowPayPalStub(PayPalStub):
+    """Sends the order one byte every 50ms: no single read times out, the response as a whole takes seconds."""
+
+    def do_GET(self):
+        data = json.dumps({"id": "5O190127TN364715T", "status": "COMPLETED"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            for byte in data:
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass
+
+
+def start_stub(monkeypatch, handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(paypal_client, "SANDBOX_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    return server
+
+
+@pytest.fixture
+def paypal_stub(monkeypatch):
+    server = start_stub(monkeypatch, PayPalStub)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def slow_paypal_stub(monkeypatch):
+    server = start_stub(monkeypatch, SlowPayPalStub)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_arun_works_across_event_loops(paypal_stub):
+    api = PayPalAPI("client-id", "secret", Context(sandbox=True, token_cache=TokenCache()))
+
+    first = asyncio.run(api.arun("get_order_details", {"order_id": "5O190127TN364715T"}))
+    # Keep-alive connections of the first loop's client must not be reused on a new loop.
+    second = asyncio.run(api.arun("get_order_details", {"order_id": "8MC585209K746392H"}))
+
+    assert "5O190127TN364715T" in first
+    assert "8MC585209K746392H" in second
+
+
+def test_each_event_loop_gets_its_own_client(paypal_stub):
+    api = PayPalAPI("client-id", "secret", Context(sandbox=True, token_cache=TokenCache()))
+
+    async def client_twice():
+        return api._get_async_client(), api._get_async_client()
+
+    first, same = asyncio.run(client_twice())
+    second, _ = asyncio.run(client_twice())
+
+    assert first is same
+    assert first is not second
+
+
+def test_aexecute_deadline_bounds_a_slowly_streamed_response(slow_paypal_stub):
+    api = PayPalAPI("client-id", "secret", Context(sandbox=True, token_cache=TokenCache()))
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(api.aexecute("get_order_details", {"order_id": "5O190127TN364715T"}, timeout=0.5))
+
+    assert time.monotonic() - started < 1.5
@@ -0,0 +1,79 @@
+import json
+
+import httpx
+import pytest
+
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.invoices.bulk import InvoiceCheckpoint, bulk_create_invoices
+from paypal_agent_toolkit.shared.paypal_client import PayPalClient
+from paypal_agent_toolkit.shared.retry import RetryPolicy
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+INVOICES = [{"detail": {"currency_code": "USD", "invoice_date": f"2026-01-{day:02d}"}} for day in range(1, 7)]
+
+
+class InvoicingStub:
+    """Creates INV2-<n> invoices; raises KeyboardInterrupt on the send of `interrupt_on`."""
+
+    def __init__(self, interrupt_on=None):
+        self.interrupt_on = interrupt_on
+        self.creates = []
+        self.sends = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        if request.url.path.endswith("/send"):
+            invoice_id = request.url.path.split("/")[-2]
+            if invoice_id == self.interrupt_on:
+                self.interrupt_on = None
+                raise KeyboardInterrupt
+            self.sends.append(invoice_id)
+            return httpx.Response(202, json={})
+        date = json.loads(request.content)["detail"]["invoice_date"]
+        self.creates.append(date)
+        invoice_id = f"INV2-{date}"
+        return httpx.Response(201, json={"rel": "self", "href": f"https://api-m.sandbox.paypal.com/v2/invoicing/invoices/{invoice_id}", "method": "GET"})
+
+    def client(self) -> PayPalClient:
+        context = Context(sandbox=True, retry=RetryPolicy.disabled())
+        return PayPalClient("client-id", "secret", context, token_cache=TokenCache(), http_client=httpx.Client(transport=httpx.MockTransport(self)))
+
+
+def test_interrupted_run_resumes_from_the_checkpoint(tmp_path):
+    checkpoint = tmp_path / "invoices.jsonl"
+    first = InvoicingStub(interrupt_on="INV2-2026-01-03")
+
+    with pytest.raises(KeyboardInterrupt):
+        bulk_create_invoices(first.client(), INVOICES, max_concurrency=1, checkpoint=str(checkpoint))
+    assert "INV2-2026-01-03" not in first.sends
+    # The process died while appending the next line.
+    with open(checkpoint, "a", encoding="utf-8") as f:
+        f.write('{"key": "0f1e2d", "sta')
+
+    second = InvoicingStub()
+    report = bulk_create_invoices(second.client(), INVOICES, max_concurrency=1, checkpoint=str(checkpoint))
+
+    assert report.failed == []
+    # Nothing is created twice; the interrupted invoice is only sent.
+    assert sorted(first.creates + second.creates) == [invoice["detail"]["invoice_date"] for invoice in INVOICES]
+    assert sorted(first.sends + second.sends) == [f"INV2-2026-01-{day:02d}" for day in range(1, 7)]
+    assert "2026-01-03" not in second.creates
+    assert report.counts["skipped"] == len(first.sends)
+    assert all(outcome.invoice_id == f"INV2-2026-01-{outcome.index + 1:02d}" for outcome in report.outcomes)
+
+    # Entries written after the torn line are read back on the next resume.
+    store = InvoiceCheckpoint(str(checkpoint))
+    assert {store.get(outcome.key)["stage"] for outcome in report.outcomes} == {"sent"}
+    store.close()
+
+
+def test_completed_run_is_skipped_entirely(tmp_path):
+    checkpoint = str(tmp_path / "invoices.jsonl")
+    bulk_create_invoices(InvoicingStub().client(), INVOICES, checkpoint=checkpoint)
+
+    again = InvoicingStub()
+    report = bulk_create_invoices(again.client(), INVOICES, checkpoint=checkpoint)
+
+    assert report.counts == {"skipped": len(INVOICES)}
+    assert again.creates == [] and again.sends == []
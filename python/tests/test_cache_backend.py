@@ -0,0 +1,213 @@
+import fnmatch
+import os
+import socketserver
+import threading
+import time
+
+import pytest
+
+from paypal_agent_toolkit.shared.cache_backend import FileCacheBackend, RedisCacheBackend, RedisProtocolError
+
+
+class RespStub(socketserver.ThreadingTCPServer):
+    """A tiny server speaking enough RESP for the cache backend."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.password = password
+        self.data = {}
+        self.commands = []
+        self.connections = 0
+        self.drop_next = False
+
+    @property
+    def url(self):
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.server_address[1]}/0"
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        assert line.startswith(b"*")
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def bulk(self, value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        authenticated = server.password is None
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            command = args[0].decode().upper()
+            server.commands.append(command)
+            if server.drop_next:
+                server.drop_next = False
+                return
+            if command == "AUTH":
+                authenticated = args[-1].decode() == server.password
+                reply = b"+OK\r\n" if authenticated else b"-WRONGPASS invalid username-password pair\r\n"
+            elif not authenticated:
+                reply = b"-NOAUTH Authentication required.\r\n"
+            elif command == "GET":
+                reply = self.bulk(server.data.get(args[1]))
+            elif command == "SET":
+                server.data[args[1]] = args[2]
+                reply = b"+OK\r\n"
+            elif command == "DEL":
+                removed = sum(server.data.pop(key, None) is not None for key in args[1:])
+                reply = b":%d\r\n" % removed
+            elif command == "SCAN":
+                # One key per page, so clear() has to follow the cursor.
+                cursor, pattern = int(args[1]), args[3].decode()
+                keys = sorted(key for key in server.data if fnmatch.fnmatchcase(key.decode(), pattern))
+                page = keys[:1]
+                next_cursor = b"0" if len(keys) <= 1 else str(cursor + 1).encode()
+                reply = b"*2\r\n" + self.bulk(next_cursor) + b"*%d\r\n" % len(page) + b"".join(self.bulk(key) for key in page)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def redis_stub():
+    servers = []
+
+    def start(password=None):
+        server = RespStub(password)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_redis_round_trips_binary_values(redis_stub):
+    server = redis_stub()
+    cache = RedisCacheBackend(server.url)
+
+    value = b"\x00\r\n$3\r\nnot a frame"
+    cache.set("token", value, ttl=60)
+
+    assert cache.get("token") == value
+    assert cache.get("missing") is None
+    assert server.data == {b"paypal-agent-toolkit:token": value}
+    cache.close()
+
+
+def test_redis_authenticates_before_the_first_command(redis_stub):
+    server = redis_stub(password="s3cret")
+    cache = RedisCacheBackend(server.url)
+
+    cache.set("token", b"value", ttl=60)
+
+    assert server.commands == ["AUTH", "SET"]
+    assert cache.get("token") == b"value"
+    cache.close()
+
+
+def test_redis_auth_error_leaves_no_connection_behind(redis_stub):
+    server = redis_stub(password="s3cret")
+    cache = RedisCacheBackend(server.url.replace("s3cret", "wrong"))
+
+    with pytest.raises(RedisProtocolError):
+        cache.execute("GET", "token")
+    assert cache._sock is None
+    # Through the cache interface the failure is only a miss.
+    assert cache.get("token") is None
+    assert "GET" not in server.commands
+
+
+def test_redis_reconnects_after_a_dropped_connection(redis_stub):
+    server = redis_stub()
+    cache = RedisCacheBackend(server.url)
+    cache.set("token", b"value", ttl=60)
+
+    server.drop_next = True
+
+    assert cache.get("token") == b"value"
+    assert server.connections == 2
+    cache.close()
+
+
+def test_redis_clear_scans_only_the_namespace(redis_stub):
+    server = redis_stub()
+    cache = RedisCacheBackend(server.url)
+    for key in ("a", "b", "c"):
+        cache.set(key, b"value", ttl=60)
+    server.data[b"other-app:key"] = b"kept"
+
+    cache.clear()
+
+    assert server.data == {b"other-app:key": b"kept"}
+    assert server.commands.count("SCAN") >= 3
+    cache.close()
+
+
+def test_file_backend_round_trips_and_keeps_no_temporary_files(tmp_path):
+    cache = FileCacheBackend(str(tmp_path / "cache"))
+
+    cache.set("token", b"value", ttl=60)
+    cache.set("token", b"newer", ttl=60)
+
+    assert cache.get("token") == b"newer"
+    names = os.listdir(cache.directory)
+    assert len(names) == 1 and not names[0].startswith(".tmp-")
+    assert os.stat(os.path.join(cache.directory, names[0])).st_mode & 0o077 == 0
+
+
+def test_file_backend_write_replaces_the_entry_atomically(tmp_path, monkeypatch):
+    cache = FileCacheBackend(str(tmp_path / "cache"))
+    cache.set("token", b"old", ttl=60)
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    cache.set("token", b"new", ttl=60)
+
+    # The failed write left the previous entry intact and cleaned up its temporary file.
+    assert cache.get("token") == b"old"
+    assert len(os.listdir(cache.directory)) == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions only")
+@pytest.mark.parametrize("mode", [0o770, 0o707])
+def test_file_backend_rejects_a_shared_directory(tmp_path, mode):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    directory.chmod(mode)
+
+    with pytest.raises(PermissionError):
+        FileCacheBackend(str(directory))
+
+
+def test_file_backend_expires_entries(tmp_path, monkeypatch):
+    cache = FileCacheBackend(str(tmp_path / "cache"))
+    cache.set("short", b"value", ttl=1)
+    cache.set("long", b"value", ttl=60)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 5)
+
+    assert cache.get("short") is None
+    assert cache.stats() == {"entries": 1}
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    cache.purge_expired()
+    assert cache.stats() == {"entries": 0}
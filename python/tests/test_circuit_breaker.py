@@ -0,0 +1,153 @@
+import httpx
+import pytest
+
+from paypal_agent_toolkit.shared.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.errors import CircuitOpenError
+from paypal_agent_toolkit.shared.paypal_client import PayPalClient
+from paypal_agent_toolkit.shared.retry import RetryPolicy
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+REPORTING = "/v1/reporting/transactions"
+ORDERS = "/v2/checkout/orders/5O190127TN364715T"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail(breaker: CircuitBreaker, uri: str, times: int):
+    for _ in range(times):
+        breaker.before_request(uri)
+        breaker.record(uri, failed=True)
+
+
+def test_circuit_opens_after_consecutive_failures_in_one_family():
+    breaker = CircuitBreaker(failure_threshold=3, clock=Clock())
+
+    fail(breaker, REPORTING, 2)
+    assert breaker.state(REPORTING) == CLOSED
+    fail(breaker, REPORTING, 1)
+    assert breaker.state(REPORTING) == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(REPORTING)
+    breaker.before_request(ORDERS)
+    assert breaker.stats()["reporting"]["rejected"] == 1
+
+
+def test_a_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=3, clock=Clock())
+
+    fail(breaker, REPORTING, 2)
+    breaker.record(REPORTING, failed=False)
+    fail(breaker, REPORTING, 2)
+
+    assert breaker.state(REPORTING) == CLOSED
+
+
+def test_half_open_lets_a_single_probe_through():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, clock=clock)
+    fail(breaker, REPORTING, 1)
+
+    clock.now += 29.0
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.before_request(REPORTING)
+    assert raised.value.retry_after == pytest.approx(1.0)
+
+    clock.now += 1.0
+    breaker.before_request(REPORTING)
+    assert breaker.state(REPORTING) == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(REPORTING)
+
+
+def test_successful_probe_closes_the_circuit():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, clock=clock)
+    fail(breaker, REPORTING, 1)
+    clock.now += 30.0
+
+    breaker.before_request(REPORTING)
+    breaker.record(REPORTING, failed=False)
+
+    assert breaker.state(REPORTING) == CLOSED
+    breaker.before_request(REPORTING)
+    breaker.before_request(REPORTING)
+
+
+def test_failed_probe_reopens_the_circuit_for_another_timeout():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, clock=clock)
+    fail(breaker, REPORTING, 1)
+    clock.now += 30.0
+
+    fail(breaker, REPORTING, 1)
+
+    assert breaker.state(REPORTING) == OPEN
+    assert breaker.stats()["reporting"]["times_opened"] == 2
+    clock.now += 29.0
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(REPORTING)
+    clock.now += 1.0
+    breaker.before_request(REPORTING)
+
+
+def test_a_lost_probe_gives_up_its_slot_after_the_reset_timeout():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0, clock=clock)
+    fail(breaker, REPORTING, 1)
+    clock.now += 30.0
+    breaker.before_request(REPORTING)
+
+    clock.now += 30.0
+    breaker.before_request(REPORTING)
+    assert breaker.state(REPORTING) == HALF_OPEN
+
+
+def test_a_request_counts_once_however_many_attempts_it_made():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        attempts.append(request)
+        return httpx.Response(503, json={"name": "SERVICE_UNAVAILABLE"})
+
+    breaker = CircuitBreaker(failure_threshold=2, clock=Clock())
+    context = Context(sandbox=True, circuit_breaker=breaker, retry=RetryPolicy(max_attempts=3, backoff_base=0.001))
+    client = PayPalClient("client-id", "secret", context, token_cache=TokenCache(), http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get(ORDERS)
+
+    assert len(attempts) == 3
+    assert breaker.stats()["checkout"]["failures"] == 1
+    assert breaker.state(ORDERS) == CLOSED
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get(ORDERS)
+    with pytest.raises(CircuitOpenError):
+        client.get(ORDERS)
+    assert len(attempts) == 6
+
+
+def test_4xx_responses_count_as_successes():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        return httpx.Response(404, json={"name": "RESOURCE_NOT_FOUND"})
+
+    breaker = CircuitBreaker(failure_threshold=1, clock=Clock())
+    client = PayPalClient("client-id", "secret", Context(sandbox=True, circuit_breaker=breaker), token_cache=TokenCache(), http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get(ORDERS)
+
+    assert breaker.state(ORDERS) == CLOSED
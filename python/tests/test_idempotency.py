@@ -0,0 +1,67 @@
+import httpx
+
+from paypal_agent_toolkit.shared.api import PayPalAPI
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.paypal_client import PayPalClient
+from paypal_agent_toolkit.shared.retry import RetryPolicy
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+ORDER = {"currency_code": "USD", "items": [{"name": "Shirt", "quantity": 1, "item_cost": 10, "tax_percent": 0, "item_total": 10}]}
+
+
+def make_api(fail_first_attempt: bool = False, **context) -> tuple:
+    request_ids = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        request_ids.append(request.headers.get("PayPal-Request-Id"))
+        if fail_first_attempt and len(request_ids) % 2 == 1:
+            return httpx.Response(503, json={"name": "SERVICE_UNAVAILABLE"})
+        return httpx.Response(201, json={"id": f"ORDER{len(request_ids)}", "status": "CREATED", "links": []})
+
+    ctx = Context(sandbox=True, retry=RetryPolicy(backoff_base=0.001), **context)
+    api = PayPalAPI("client-id", "secret", ctx)
+    api._paypal_client = PayPalClient("client-id", "secret", ctx, token_cache=TokenCache(), http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    return api, request_ids
+
+
+def test_separate_identical_calls_get_distinct_request_ids():
+    api, request_ids = make_api()
+
+    api.execute("create_order", ORDER)
+    api.execute("create_order", ORDER)
+
+    assert len(request_ids) == 2
+    assert request_ids[0] != request_ids[1]
+
+
+def test_retries_of_one_call_reuse_its_request_id():
+    api, request_ids = make_api(fail_first_attempt=True)
+
+    api.execute("create_order", ORDER)
+    api.execute("create_order", ORDER)
+
+    assert len(request_ids) == 4
+    assert request_ids[0] == request_ids[1]
+    assert request_ids[2] == request_ids[3]
+    assert request_ids[0] != request_ids[2]
+
+
+def test_explicit_request_id_makes_identical_calls_one_operation():
+    api, request_ids = make_api(request_id="checkout-42")
+
+    api.execute("create_order", ORDER)
+    api.execute("create_order", ORDER)
+
+    assert request_ids[0] == request_ids[1]
+
+
+def test_replay_ttl_answers_a_repeat_locally():
+    api, request_ids = make_api(replay_ttl=600)
+
+    first = api.execute("create_order", ORDER)
+    second = api.execute("create_order", ORDER)
+
+    assert len(request_ids) == 1
+    assert first.data == second.data
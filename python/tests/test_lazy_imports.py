@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PYTHON_DIR = Path(__file__).resolve().parent.parent
+PRODUCT_PACKAGES = ("disputes", "insights", "invoices", "orders", "results", "subscriptions", "tracking", "transactions")
+
+
+def is_product_module(name: str) -> bool:
+    parts = name.split(".")
+    return parts[:2] == ["paypal_agent_toolkit", "shared"] and len(parts) > 2 and parts[2] in PRODUCT_PACKAGES
+
+
+def loaded_product_modules(code: str) -> list:
+    """The product handler modules in sys.modules after running `code` in a fresh interpreter."""
+    script = f"{code}\nimport sys\nprint(' '.join(sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", script], cwd=PYTHON_DIR, capture_output=True, text=True, check=True)
+    return sorted(filter(is_product_module, proc.stdout.split()))
+
+
+@pytest.mark.parametrize("module", ["paypal_agent_toolkit.shared.tools", "paypal_agent_toolkit.shared.api"])
+def test_importing_the_registry_imports_no_product_module(module):
+    assert loaded_product_modules(f"import {module}") == []
+
+
+def test_reading_a_spec_imports_only_its_product():
+    modules = loaded_product_modules(
+        "from paypal_agent_toolkit.shared.tools import get_tool\n"
+        "get_tool('create_order')['execute']"
+    )
+
+    assert modules and all(module.startswith("paypal_agent_toolkit.shared.orders") for module in modules)
+
+
+def test_listing_the_enabled_tools_stays_lazy():
+    modules = loaded_product_modules(
+        "from paypal_agent_toolkit.shared.tools import tools\n"
+        "[spec['method'] for spec in tools]"
+    )
+
+    assert modules == []
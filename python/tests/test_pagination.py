@@ -0,0 +1,94 @@
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.invoices.tool_handlers import alist_invoices, list_invoices
+from paypal_agent_toolkit.shared.paypal_client import AsyncPayPalClient, PayPalClient
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+PAGES = 4
+PAGE_SIZE = 2
+
+
+def invoicing_stub(request: httpx.Request, requested_pages: list = None) -> httpx.Response:
+    if request.url.path == "/v1/oauth2/token":
+        return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+    query = parse_qs(request.url.query.decode("ascii"))
+    page = int(query["page"][0])
+    page_size = int(query["page_size"][0])
+    links = []
+    if page < PAGES:
+        links.append({
+            "rel": "next",
+            "href": f"https://api-m.sandbox.paypal.com/v2/invoicing/invoices?page={page + 1}&page_size={page_size}&total_required=true",
+        })
+    items = [{"id": f"INV2-{page}-{n}"} for n in range(page_size)]
+    if requested_pages is not None:
+        requested_pages.append(page)
+    return httpx.Response(200, json={"items": items, "total_pages": PAGES, "links": links})
+
+
+def make_client(requested_pages: list = None) -> PayPalClient:
+    return PayPalClient(
+        "client-id",
+        "secret",
+        Context(sandbox=True),
+        token_cache=TokenCache(),
+        http_client=httpx.Client(transport=httpx.MockTransport(lambda request: invoicing_stub(request, requested_pages))),
+    )
+
+
+def test_continuation_resumes_at_the_next_page():
+    client = make_client()
+    params = {"page_size": PAGE_SIZE, "max_pages": 2}
+
+    first = list_invoices(client, params).data
+    assert first["has_more"] is True
+    continuation = {key: first[key] for key in ("page", "next_page_token") if key in first}
+    assert continuation == {"page": 3}
+
+    second = list_invoices(client, {**params, **continuation}).data
+    assert [item["id"] for item in second["items"]] == ["INV2-3-0", "INV2-3-1", "INV2-4-0", "INV2-4-1"]
+    assert second["has_more"] is False
+
+
+def test_max_items_merges_pages_along_the_next_links():
+    requested_pages = []
+    client = make_client(requested_pages)
+
+    result = list_invoices(client, {"page_size": PAGE_SIZE, "max_items": 100}).data
+
+    assert [item["id"] for item in result["items"]] == [f"INV2-{page}-{n}" for page in range(1, PAGES + 1) for n in range(PAGE_SIZE)]
+    assert result["pages_fetched"] == PAGES
+    assert result["has_more"] is False
+    assert requested_pages == [1, 2, 3, 4]
+
+
+def test_no_page_is_fetched_past_max_items():
+    requested_pages = []
+    client = make_client(requested_pages)
+
+    result = list_invoices(client, {"page_size": PAGE_SIZE, "max_items": 3}).data
+
+    assert [item["id"] for item in result["items"]] == ["INV2-1-0", "INV2-1-1", "INV2-2-0"]
+    assert result["has_more"] is True
+    assert requested_pages == [1, 2]
+
+
+def test_async_listing_follows_the_next_links():
+    requested_pages = []
+    client = AsyncPayPalClient(
+        "client-id",
+        "secret",
+        Context(sandbox=True),
+        token_cache=TokenCache(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: invoicing_stub(request, requested_pages))),
+    )
+
+    result = asyncio.run(alist_invoices(client, {"page_size": PAGE_SIZE, "max_pages": 3})).data
+
+    assert len(result["items"]) == 3 * PAGE_SIZE
+    assert result["page"] == 4
+    assert requested_pages == [1, 2, 3]
@@ -0,0 +1,124 @@
+import pytest
+
+from paypal_agent_toolkit.shared.errors import DeadlineExceededError, RateLimitExceededError
+from paypal_agent_toolkit.shared.rate_limit import RateLimiter, TokenBucket
+
+ORDERS = "/v2/checkout/orders"
+REPORTING = "/v1/reporting/transactions"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_a_burst_then_refills_at_its_rate():
+    bucket = TokenBucket(rate=2.0, burst=3)
+    now = 100.0
+
+    for _ in range(3):
+        assert bucket.delay(now) == 0
+        bucket.reserve(now)
+    assert bucket.delay(now) == pytest.approx(0.5)
+
+    assert bucket.delay(now + 0.5) == 0
+    assert bucket.delay(now + 10) == 0
+    bucket.reserve(now + 10)
+    bucket.reserve(now + 10)
+    bucket.reserve(now + 10)
+    # Refill is capped at the burst.
+    assert bucket.delay(now + 10) == pytest.approx(0.5)
+
+
+def test_queued_reservations_wait_in_line():
+    clock = Clock()
+    limiter = RateLimiter(rate=1.0, burst=1, clock=clock)
+
+    assert [limiter.reserve(ORDERS) for _ in range(4)] == pytest.approx([0, 1, 2, 3])
+    assert limiter.stats()["queued"] == 3
+    assert limiter.stats()["wait_time"] == pytest.approx(6)
+
+
+def test_families_have_separate_buckets():
+    clock = Clock()
+    limiter = RateLimiter(family_rates={"reporting": 1.0}, clock=clock)
+
+    assert limiter.reserve(REPORTING) == 0
+    assert limiter.reserve(REPORTING) == pytest.approx(1)
+    # Orders have no configured rate and are not held back by reporting.
+    assert [limiter.reserve(ORDERS) for _ in range(10)] == [0] * 10
+
+
+def test_global_rate_applies_across_families():
+    clock = Clock()
+    limiter = RateLimiter(rate=1.0, burst=1, clock=clock)
+
+    assert limiter.reserve(REPORTING) == 0
+    assert limiter.reserve(ORDERS) == pytest.approx(1)
+
+
+def test_429_pauses_and_halves_the_family_until_successes_restore_it():
+    clock = Clock()
+    limiter = RateLimiter(family_rates={"reporting": 4.0}, clock=clock)
+
+    limiter.on_throttled(REPORTING, retry_after=2.0)
+
+    assert limiter.stats()["family_rates"] == {"reporting": 2.0}
+    assert limiter.reserve(REPORTING) == pytest.approx(2.5)
+    assert limiter.reserve(ORDERS) == 0
+
+    for _ in range(10):
+        limiter.on_success(REPORTING)
+    assert limiter.stats()["family_rates"]["reporting"] == pytest.approx(4.0)
+    limiter.on_success(REPORTING)
+    assert limiter.stats()["family_rates"]["reporting"] == pytest.approx(4.0)
+
+
+def test_repeated_429s_do_not_shrink_the_rate_below_its_floor():
+    clock = Clock()
+    limiter = RateLimiter(family_rates={"reporting": 10.0}, clock=clock)
+
+    for _ in range(10):
+        limiter.on_throttled(REPORTING, retry_after=0.0)
+
+    assert limiter.stats()["family_rates"]["reporting"] == pytest.approx(1.0)
+    assert limiter.stats()["throttled"] == 10
+
+
+def test_429_pauses_a_family_without_a_configured_rate():
+    clock = Clock()
+    limiter = RateLimiter(clock=clock)
+
+    limiter.on_throttled(ORDERS, retry_after=None)
+
+    assert limiter.reserve(ORDERS) == pytest.approx(1.0)
+    clock.now += 1.0
+    assert limiter.reserve(ORDERS) == 0
+
+
+def test_wait_past_max_wait_is_rejected_without_reserving():
+    clock = Clock()
+    limiter = RateLimiter(rate=1.0, burst=1, max_wait=2.0, clock=clock)
+    for _ in range(3):
+        limiter.reserve(ORDERS)
+
+    with pytest.raises(RateLimitExceededError):
+        limiter.reserve(ORDERS)
+
+    clock.now += 1.0
+    assert limiter.reserve(ORDERS) == pytest.approx(2.0)
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_wait_past_the_deadline_raises_deadline_exceeded():
+    clock = Clock()
+    limiter = RateLimiter(rate=1.0, burst=1, clock=clock)
+    limiter.reserve(ORDERS)
+
+    with pytest.raises(DeadlineExceededError):
+        limiter.reserve(ORDERS, time_left=0.5)
+
+    assert limiter.reserve(ORDERS, time_left=1.5) == pytest.approx(1.0)
@@ -0,0 +1,86 @@
+import httpx
+
+from paypal_agent_toolkit.shared.api import PayPalAPI
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.paypal_client import PayPalClient
+from paypal_agent_toolkit.shared.response_cache import MISSING, ResponseCache
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+ORDER_ID = "5O190127TN364715T"
+ORDER_URI = f"/v2/checkout/orders/{ORDER_ID}"
+SCOPE = ("client-id", "sandbox", None)
+
+
+def make_client(handler, cache: ResponseCache) -> PayPalClient:
+    context = Context(sandbox=True, response_cache=cache)
+    return PayPalClient("client-id", "secret", context, token_cache=TokenCache(), http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def token_or(handler):
+    def serve(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        return handler(request)
+    return serve
+
+
+def test_pay_order_invalidates_the_cached_order():
+    order = {"id": ORDER_ID, "status": "APPROVED", "links": []}
+    gets = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            order["status"] = "COMPLETED"
+            return httpx.Response(201, json=order)
+        gets.append(request.url.path)
+        return httpx.Response(200, json=order)
+
+    cache = ResponseCache()
+    api = PayPalAPI("client-id", "secret", Context(sandbox=True))
+    api._paypal_client = make_client(token_or(handler), cache)
+
+    assert api.execute("get_order_details", {"order_id": ORDER_ID}).data["status"] == "APPROVED"
+    assert api.execute("get_order_details", {"order_id": ORDER_ID}).data["status"] == "APPROVED"
+    api.execute("pay_order", {"order_id": ORDER_ID})
+
+    assert api.execute("get_order_details", {"order_id": ORDER_ID}).data["status"] == "COMPLETED"
+    assert len(gets) == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_get_racing_a_mutation_does_not_cache_the_old_body():
+    cache = ResponseCache()
+    client = None
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # The order is captured while this GET is on the wire.
+        client.invalidate_cached("POST", f"{ORDER_URI}/capture")
+        return httpx.Response(200, json={"id": ORDER_ID, "status": "APPROVED"})
+
+    client = make_client(token_or(handler), cache)
+
+    assert client.get(ORDER_URI)["status"] == "APPROVED"
+    assert cache.get(client._cache_scope, ORDER_URI) is MISSING
+
+
+def test_put_is_skipped_after_an_invalidation():
+    cache = ResponseCache()
+    generation = cache.generation(SCOPE, ORDER_URI)
+    cache.invalidate(SCOPE, f"{ORDER_URI}/capture")
+
+    cache.put(SCOPE, ORDER_URI, {"status": "APPROVED"}, generation)
+
+    assert cache.get(SCOPE, ORDER_URI) is MISSING
+    cache.put(SCOPE, ORDER_URI, {"status": "COMPLETED"}, cache.generation(SCOPE, ORDER_URI))
+    assert cache.get(SCOPE, ORDER_URI) == {"status": "COMPLETED"}
+
+
+def test_only_removed_entries_count_as_invalidations():
+    cache = ResponseCache()
+    cache.invalidate(SCOPE, f"{ORDER_URI}/capture")
+    assert cache.stats()["invalidations"] == 0
+
+    cache.put(SCOPE, ORDER_URI, {"status": "APPROVED"})
+    cache.invalidate(SCOPE, f"{ORDER_URI}/capture")
+    cache.invalidate(SCOPE, f"{ORDER_URI}/capture")
+    assert cache.stats()["invalidations"] == 1
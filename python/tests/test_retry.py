@@ -0,0 +1,116 @@
+import random
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.paypal_client import PayPalClient
+from paypal_agent_toolkit.shared.retry import IDEMPOTENCY_HEADER, RetryPolicy, retry_after_seconds
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+URL = "https://api-m.sandbox.paypal.com/v2/checkout/orders/5O190127TN364715T"
+
+
+def status_error(status: int, method: str = "GET", headers: dict = None) -> httpx.HTTPStatusError:
+    request = httpx.Request(method, URL)
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(str(status), request=request, response=response)
+
+
+class FakePayPal:
+    """Answers each API request with the next status code of `statuses`, then 200."""
+
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.requests = []
+        self.tokens = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            self.tokens += 1
+            return httpx.Response(200, json={"access_token": f"token-{self.tokens}", "expires_in": 3600})
+        self.requests.append(request)
+        status = self.statuses.pop(0) if self.statuses else 200
+        return httpx.Response(status, json={"id": "5O190127TN364715T"})
+
+    def client(self, **policy) -> PayPalClient:
+        retry = RetryPolicy(backoff_base=0.001, rng=random.Random(7), **policy)
+        return PayPalClient("client-id", "secret", Context(sandbox=True, retry=retry), token_cache=TokenCache(), http_client=httpx.Client(transport=httpx.MockTransport(self)))
+
+
+def test_backoff_stays_within_the_exponential_cap():
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=4.0, rng=random.Random(42))
+
+    for attempt, cap in [(1, 0.5), (2, 1.0), (3, 2.0), (4, 4.0), (5, 4.0), (6, 4.0)]:
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= cap for delay in delays)
+        assert max(delays) > cap * 0.9
+
+
+def test_backoff_is_reproducible_with_a_seeded_rng():
+    first = RetryPolicy(rng=random.Random(1))
+    second = RetryPolicy(rng=random.Random(1))
+
+    assert [first.backoff(n) for n in range(1, 6)] == [second.backoff(n) for n in range(1, 6)]
+
+
+def test_retry_after_in_delta_seconds():
+    policy = RetryPolicy()
+    error = status_error(503, headers={"Retry-After": "7"})
+
+    assert retry_after_seconds(error.response) == 7.0
+    assert policy.next_delay("GET", {}, error, attempt=1, elapsed=0.0) == 7.0
+
+
+def test_retry_after_as_an_http_date():
+    policy = RetryPolicy()
+    error = status_error(429, headers={"Retry-After": formatdate(time.time() + 20, usegmt=True)})
+
+    delay = policy.next_delay("GET", {}, error, attempt=1, elapsed=0.0)
+
+    assert 18 <= delay <= 20
+
+
+def test_retry_after_beyond_the_limit_or_the_budget_gives_up():
+    policy = RetryPolicy(max_retry_after=60.0, total_timeout=30.0)
+
+    assert policy.next_delay("GET", {}, status_error(503, headers={"Retry-After": "120"}), attempt=1, elapsed=0.0) is None
+    assert policy.next_delay("GET", {}, status_error(503, headers={"Retry-After": "20"}), attempt=1, elapsed=15.0) is None
+
+
+def test_401_is_retried_once_immediately_with_a_new_token():
+    paypal = FakePayPal(401, 401)
+    client = paypal.client(max_attempts=5)
+
+    with pytest.raises(httpx.HTTPStatusError) as raised:
+        client.get("/v2/checkout/orders/5O190127TN364715T")
+
+    assert raised.value.response.status_code == 401
+    assert [request.headers["Authorization"] for request in paypal.requests] == ["Bearer token-1", "Bearer token-2"]
+    assert RetryPolicy().next_delay("GET", {}, status_error(401), attempt=1, elapsed=0.0) == 0.0
+
+
+def test_get_is_retried_on_5xx():
+    paypal = FakePayPal(503, 502)
+
+    assert paypal.client().get("/v2/checkout/orders/5O190127TN364715T") == {"id": "5O190127TN364715T"}
+    assert len(paypal.requests) == 3
+
+
+def test_post_without_a_request_id_is_not_retried():
+    paypal = FakePayPal(503)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        paypal.client().post("/v2/checkout/orders", {"intent": "CAPTURE"})
+
+    assert len(paypal.requests) == 1
+
+
+def test_post_with_a_request_id_is_retried_under_the_same_id():
+    paypal = FakePayPal(503)
+
+    paypal.client().post("/v2/checkout/orders", {"intent": "CAPTURE"}, headers={IDEMPOTENCY_HEADER: "order-1"})
+
+    assert [request.headers[IDEMPOTENCY_HEADER] for request in paypal.requests] == ["order-1", "order-1"]
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.paypal_client import AsyncPayPalClient, PayPalClient
+from paypal_agent_toolkit.shared.single_flight import SingleFlight
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+ORDER_URI = "/v2/checkout/orders/5O190127TN364715T"
+
+
+class SlowPayPal:
+    def __init__(self):
+        self.orders = 0
+
+    def _reply(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        self.orders += 1
+        return httpx.Response(200, json={"id": "5O190127TN364715T", "purchase_units": [{"amount": {"value": "10.00"}}]})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/v1/oauth2/token":
+            time.sleep(0.1)
+        return self._reply(request)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/v1/oauth2/token":
+            await asyncio.sleep(0.1)
+        return self._reply(request)
+
+
+def run_threads(count: int, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_concurrent_async_gets_share_one_request():
+    paypal = SlowPayPal()
+
+    async def main():
+        client = AsyncPayPalClient("client-id", "secret", Context(sandbox=True), token_cache=TokenCache(), http_client=httpx.AsyncClient(transport=httpx.MockTransport(paypal.handle_async)))
+        return client, await asyncio.gather(*(client.get(ORDER_URI) for _ in range(5)))
+
+    client, responses = asyncio.run(main())
+
+    assert paypal.orders == 1
+    assert all(response == responses[0] for response in responses)
+    assert len({id(response) for response in responses}) == 5
+    assert client.single_flight.stats() == {"executed": 1, "coalesced": 4}
+
+
+def test_concurrent_sync_gets_share_one_request():
+    paypal = SlowPayPal()
+    client = PayPalClient("client-id", "secret", Context(sandbox=True), token_cache=TokenCache(), http_client=httpx.Client(transport=httpx.MockTransport(paypal)))
+    client.get_access_token()
+
+    responses, errors = run_threads(5, lambda: client.get(ORDER_URI))
+
+    assert errors == [None] * 5
+    assert paypal.orders == 1
+    assert len({id(response) for response in responses}) == 5
+
+
+def test_waiters_get_deep_copies():
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    shared = {"purchase_units": [{"amount": {"value": "10.00"}}]}
+
+    def fetch():
+        started.set()
+        release.wait()
+        return shared
+
+    leader = threading.Thread(target=lambda: group.do("order", fetch))
+    leader.start()
+    started.wait()
+    waiter_results = []
+    waiter = threading.Thread(target=lambda: waiter_results.append(group.do("order", fetch)))
+    waiter.start()
+    while group.stats()["coalesced"] == 0:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    waiter.join()
+
+    waiter_results[0]["purchase_units"][0]["amount"]["value"] = "0.00"
+    assert shared["purchase_units"][0]["amount"]["value"] == "10.00"
+
+
+def test_errors_reach_every_waiter():
+    group = SingleFlight()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        time.sleep(0.1)
+        raise httpx.ConnectError("down")
+
+    _, errors = run_threads(4, lambda: group.do("order", fail))
+
+    assert len(calls) == 1
+    assert all(isinstance(error, httpx.ConnectError) for error in errors)
+
+
+def test_async_errors_reach_every_waiter():
+    group = SingleFlight()
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise httpx.ConnectError("down")
+
+    async def main():
+        return await asyncio.gather(*(group.ado("order", fail) for _ in range(4)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert all(isinstance(error, httpx.ConnectError) for error in errors)
+
+
+def test_a_finished_call_is_not_reused():
+    group = SingleFlight()
+
+    assert group.do("order", lambda: 1) == 1
+    assert group.do("order", lambda: 2) == 2
+    with pytest.raises(KeyError):
+        group.do("order", lambda: {}["missing"])
+    assert group.stats() == {"executed": 3, "coalesced": 0}
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.paypal_client import PayPalClient
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+
+KEY = ("client-id", "sandbox", "secret-hash")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Fetcher:
+    def __init__(self, expires_in=3600, delay=0.0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = 0
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"token-{self.calls}", self.expires_in
+
+    async def fetch_async(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"token-{self.calls}", self.expires_in
+
+
+def test_concurrent_threads_share_one_fetch():
+    cache, fetch = TokenCache(), Fetcher(delay=0.05)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(KEY, fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetch.calls == 1
+    assert results == ["token-1"] * 8
+
+
+def test_concurrent_tasks_share_one_fetch():
+    cache, fetch = TokenCache(), Fetcher(delay=0.05)
+
+    async def main():
+        return await asyncio.gather(*(cache.aget(KEY, fetch.fetch_async) for _ in range(8)))
+
+    assert asyncio.run(main()) == ["token-1"] * 8
+    assert fetch.calls == 1
+
+
+def test_token_is_refreshed_once_inside_the_refresh_margin():
+    clock = Clock()
+    cache, fetch = TokenCache(refresh_margin=300, clock=clock), Fetcher(expires_in=3600)
+    assert cache.get(KEY, fetch) == "token-1"
+
+    clock.now += 3600 - 301
+    assert cache.get(KEY, fetch) == "token-1"
+    clock.now += 2
+    assert cache.get(KEY, fetch) == "token-2"
+    assert cache.get(KEY, fetch) == "token-2"
+    assert fetch.calls == 2
+
+
+def test_short_lived_token_is_refreshed_halfway():
+    clock = Clock()
+    cache, fetch = TokenCache(refresh_margin=300, clock=clock), Fetcher(expires_in=100)
+    cache.get(KEY, fetch)
+
+    clock.now += 49
+    assert cache.get(KEY, fetch) == "token-1"
+    clock.now += 2
+    assert cache.get(KEY, fetch) == "token-2"
+
+
+def test_failed_early_refresh_keeps_the_unexpired_token():
+    clock = Clock()
+    cache, fetch = TokenCache(refresh_margin=300, clock=clock), Fetcher(expires_in=3600)
+    cache.get(KEY, fetch)
+    fetch.error = httpx.ConnectError("down")
+
+    clock.now += 3400
+    assert cache.get(KEY, fetch) == "token-1"
+    clock.now += 300
+    with pytest.raises(httpx.ConnectError):
+        cache.get(KEY, fetch)
+
+
+def test_failed_early_async_refresh_keeps_the_unexpired_token():
+    clock = Clock()
+    cache, fetch = TokenCache(refresh_margin=300, clock=clock), Fetcher(expires_in=3600)
+
+    async def main():
+        await cache.aget(KEY, fetch.fetch_async)
+        fetch.error = httpx.ConnectError("down")
+        clock.now += 3400
+        assert await cache.aget(KEY, fetch.fetch_async) == "token-1"
+        clock.now += 300
+        with pytest.raises(httpx.ConnectError):
+            await cache.aget(KEY, fetch.fetch_async)
+
+    asyncio.run(main())
+
+
+def test_invalidate_keeps_a_token_that_already_replaced_the_rejected_one():
+    cache, fetch = TokenCache(), Fetcher()
+    cache.get(KEY, fetch)
+    cache.invalidate(KEY, "token-1")
+    assert cache.get(KEY, fetch) == "token-2"
+
+    # A late 401 for the old token must not drop its replacement.
+    cache.invalidate(KEY, "token-1")
+
+    assert cache.get(KEY, fetch) == "token-2"
+    assert fetch.calls == 2
+
+
+def test_401_drops_only_the_token_it_was_sent_with():
+    tokens = iter(["token-1", "token-2"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            return httpx.Response(200, json={"access_token": next(tokens), "expires_in": 3600})
+        if request.headers["Authorization"] == "Bearer token-1":
+            return httpx.Response(401, json={"name": "AUTHENTICATION_FAILURE"})
+        return httpx.Response(200, json={"id": "ORDER"})
+
+    cache = TokenCache()
+    client = PayPalClient("client-id", "secret", Context(sandbox=True), token_cache=cache, http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+    # The 401 is retried once with a fresh token.
+    assert client.get("/v2/checkout/orders/ORDER") == {"id": "ORDER"}
+    assert client.get_access_token() == "token-2"
+
+    stale = httpx.Request("GET", "https://api-m.sandbox.paypal.com/v2/checkout/orders/ORDER", headers={"Authorization": "Bearer token-1"})
+    late = httpx.HTTPStatusError("401", request=stale, response=httpx.Response(401, request=stale))
+    client.invalidate_access_token(late)
+
+    assert client.get_access_token() == "token-2"
@@ -0,0 +1,113 @@
+import json
+
+import httpx
+
+from paypal_agent_toolkit.shared.configuration import Context
+from paypal_agent_toolkit.shared.idempotency import idempotency_scope
+from paypal_agent_toolkit.shared.paypal_client import PayPalClient
+from paypal_agent_toolkit.shared.retry import IDEMPOTENCY_HEADER, RetryPolicy
+from paypal_agent_toolkit.shared.token_cache import TokenCache
+from paypal_agent_toolkit.shared.tracking.batch import MAX_TRACKERS_PER_BATCH, _chunks, _validate, create_shipment_trackers, map_batch_response
+from paypal_agent_toolkit.shared.tracking.parameters import CreateShipmentParameters
+
+
+def shipment(n: int) -> dict:
+    return {"transaction_id": f"TXN{n:012d}", "tracking_number": f"1Z{n:08d}", "carrier": "UPS"}
+
+
+def shipments(count: int) -> list:
+    return [shipment(n) for n in range(count)]
+
+
+def test_chunks_hold_at_most_twenty_trackers_and_skip_invalid_inputs():
+    inputs = shipments(45)
+    inputs[7] = {"tracking_number": "missing transaction"}
+
+    chunks = list(_chunks(_validate(inputs), chunk_size=50))
+
+    assert [len(chunk) for _, chunk in chunks] == [MAX_TRACKERS_PER_BATCH, MAX_TRACKERS_PER_BATCH, 4]
+    assert chunks[0][0] == [index for index in range(21) if index != 7]
+    assert chunks[2][0] == [41, 42, 43, 44]
+    assert [len(chunk) for _, chunk in _chunks(_validate(shipments(3)), chunk_size=0)] == [1, 1, 1]
+
+
+def test_map_batch_response_places_errors_by_tracker_position():
+    chunk = [CreateShipmentParameters(**shipment(n)) for n in range(3)]
+    response = {
+        "tracker_identifiers": [{"transaction_id": "TXN000000000000", "tracking_number": "1Z00000000"}],
+        "errors": [{
+            "name": "INVALID_REQUEST",
+            "message": "Request is not well-formed.",
+            "details": [{"field": "/trackers/2/tracking_number", "issue": "INVALID_TRACKING_NUMBER", "description": "Tracking number is invalid."}],
+        }],
+    }
+
+    outcomes = map_batch_response([40, 41, 42], chunk, response)
+
+    assert [outcome.index for outcome in outcomes] == [40, 41, 42]
+    assert outcomes[0].ok
+    assert outcomes[1].error == "tracker was not created"
+    assert outcomes[2].error == "Request is not well-formed.; Tracking number is invalid."
+
+
+def test_errors_without_a_position_apply_to_every_missing_tracker():
+    chunk = [CreateShipmentParameters(**shipment(n)) for n in range(2)]
+    response = {"errors": [{"name": "UNPROCESSABLE_ENTITY", "message": "Duplicate tracker."}]}
+
+    outcomes = map_batch_response([0, 1], chunk, response)
+
+    assert [outcome.error for outcome in outcomes] == ["Duplicate tracker."] * 2
+
+
+class TrackersBatchStub:
+    """Creates every tracker except those whose tracking number ends in 7; fails each chunk's first attempt."""
+
+    def __init__(self):
+        self.request_ids = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/oauth2/token":
+            return httpx.Response(200, json={"access_token": "token", "expires_in": 3600})
+        request_id = request.headers.get(IDEMPOTENCY_HEADER)
+        first_attempt = request_id not in self.request_ids
+        self.request_ids.append(request_id)
+        if first_attempt:
+            return httpx.Response(503, json={"name": "SERVICE_UNAVAILABLE"})
+        trackers = json.loads(request.content)["trackers"]
+        created, errors = [], []
+        for position, tracker in enumerate(trackers):
+            if tracker["tracking_number"].endswith("7"):
+                errors.append({"message": "Invalid tracking number.", "details": [{"field": f"/trackers/{position}/tracking_number"}]})
+            else:
+                created.append({"transaction_id": tracker["transaction_id"], "tracking_number": tracker["tracking_number"]})
+        return httpx.Response(200, json={"tracker_identifiers": created, "errors": errors})
+
+    def client(self) -> PayPalClient:
+        context = Context(sandbox=True, retry=RetryPolicy(backoff_base=0.001))
+        return PayPalClient("client-id", "secret", context, token_cache=TokenCache(), http_client=httpx.Client(transport=httpx.MockTransport(self)))
+
+
+def test_each_chunk_has_its_own_request_id_kept_across_retries():
+    paypal = TrackersBatchStub()
+
+    with idempotency_scope("tool-call"):
+        outcomes = create_shipment_trackers(paypal.client(), shipments(45))
+
+    distinct = list(dict.fromkeys(paypal.request_ids))
+    assert len(distinct) == 3
+    assert sorted(paypal.request_ids) == sorted(distinct * 2)
+
+    failed = [outcome.index for outcome in outcomes if not outcome.ok]
+    assert failed == [7, 17, 27, 37]
+    assert all(outcome.error == "Invalid tracking number." for outcome in outcomes if not outcome.ok)
+    assert [outcome.index for outcome in outcomes] == list(range(45))
+
+
+def test_replaying_the_same_call_reuses_the_chunk_request_ids():
+    first, second = TrackersBatchStub(), TrackersBatchStub()
+
+    with idempotency_scope("tool-call"):
+        create_shipment_trackers(first.client(), shipments(25))
+        create_shipment_trackers(second.client(), shipments(25))
+
+    assert set(first.request_ids) == set(second.request_ids)